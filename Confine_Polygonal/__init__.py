@@ -15,12 +15,79 @@ import random
 import math
 
 #Own
-from Grain import Grain, Grain_Image
-import Contact_gg
-import Contact_gimage
+from Grain import Grain, Clump
+import Contact_registry
+import Neighborhood
+import DEM_engine
+import Sleep
 import Owntools
 import Owntools.Plot
 
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class Tracker_Confinement:
+  """
+  The trackers of the confinement, called at the end of each iteration of the DEM engine.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, dict_sample, dict_sollicitations, dict_tracker, controller):
+    """
+    Defining the tracker.
+
+        Input :
+            itself (a tracker)
+            an algorithm dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a sollicitations dictionnary (a dict)
+            a tracker dictionnary (a dict)
+            the controller of the top group (a controller)
+        Output :
+            Nothing, but the tracker is generated (a tracker)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.dict_sample = dict_sample
+    self.dict_sollicitations = dict_sollicitations
+    self.dict_tracker = dict_tracker
+    self.controller = controller
+
+#-------------------------------------------------------------------------------
+
+  def track(self, engine):
+    """
+    Update the trackers, print and plot.
+
+        Input :
+            itself (a tracker)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the tracker dictionnary is updated
+    """
+    #compute compacity, force applied on current grains and kinetic energy of current grains
+    Surface_g = 0
+    Force_applied = 0
+    Ecin = 0
+    for grain in self.dict_sample['L_g']:
+        Surface_g = Surface_g + grain.surface
+        if grain.group == 'Current':
+            Force_applied = Force_applied + np.linalg.norm([grain.fx, grain.fy])
+            Ecin = Ecin + 0.5 * grain.mass * np.dot(grain.v, grain.v)
+
+    #tracker
+    self.dict_tracker['compacity_L'].append(Surface_g/((self.dict_sample['y_box_max']-self.dict_sample['y_box_min'])*(self.dict_sample['x_box_max']-self.dict_sample['x_box_min'])))
+    self.dict_tracker['vertical_force_L'].append(self.controller.Fv)
+    self.dict_tracker['dy_top_L'].append(self.controller.dy_top)
+    self.dict_tracker['Ecin_L'].append(Ecin)
+    self.dict_tracker['Force_L'].append(Force_applied)
+
+    if engine.i_DEM % self.dict_algorithm['i_print_plot'] == 0:
+        print('i_DEM',engine.i_DEM,': Confinement',int(100*self.controller.Fv/self.dict_sollicitations['Vertical_Confinement_Force']),'%')
+        if self.dict_algorithm['Debug_DEM'] :
+            Owntools.Plot.Plot_Config_Confinement(self.dict_sample,engine.i_DEM)
+
 #-------------------------------------------------------------------------------
 #Function
 #-------------------------------------------------------------------------------
@@ -40,182 +107,55 @@ def DEM_confine_load(dict_algorithm, dict_material, dict_sample, dict_sollicitat
             Nothing, but sample dictionnary is updated
     """
     dict_algorithm['i_DEM'] = 0
-    i_DEM_0 = dict_algorithm['i_DEM']
-    DEM_loop_statut = True
     #Initialisation
-    dict_sample['L_contact'] = []
-    dict_sample['L_contact_ij'] = []
-    dict_sample['L_contact_gimage'] = []
-    dict_sample['L_contact_ij_gimage'] = []
+    dict_sample['contact_registry'] = Contact_registry.ContactRegistry()
     dict_sample['id_contact'] = 0
-    dict_sample['L_g_image'] = []
-    dict_sample['L_i_image'] = []
+    dict_sample['dict_lees_edwards'] = None
     #trackers
     dict_tracker['vertical_force_L'] = []
     dict_tracker['compacity_L'] = []
     dict_tracker['dy_top_L'] = []
     dict_tracker['Ecin_L'] = []
     dict_tracker['Force_L'] = []
-
-    while DEM_loop_statut :
-
-        dict_algorithm['i_DEM'] = dict_algorithm['i_DEM'] + 1
-
-        #create image
-        for grain in dict_sample['L_g']:
-            #left wall
-            if (grain.center[0] - dict_sample['x_box_min']) < dict_algorithm['d_to_image'] :
-                if grain.id in dict_sample['L_i_image'] : #image exists
-                    image = dict_sample['L_g_image'][dict_sample['L_i_image'].index(grain.id)]
-                    if image.position == 'right' :
-                        image.position = 'left'
-                else : #image does not exist
-                    dict_sample['L_g_image'].append(Grain_Image(grain, 'left'))
-                    dict_sample['L_i_image'].append(grain.id)
-            #right wall
-            elif (dict_sample['x_box_max'] - grain.center[0]) < dict_algorithm['d_to_image'] :
-                if grain.id in dict_sample['L_i_image'] : #image exists
-                    image = dict_sample['L_g_image'][dict_sample['L_i_image'].index(grain.id)]
-                    if image.position == 'left' :
-                        image.position = 'right'
-                else : #image does not exist
-                    dict_sample['L_g_image'].append(Grain_Image(grain, 'right'))
-                    dict_sample['L_i_image'].append(grain.id)
-            #center
-            else :
-                if grain.id in dict_sample['L_i_image'] : #image exists
-                    i_toremove = dict_sample['L_i_image'].index(grain.id)
-                    dict_sample['L_g_image'].pop(i_toremove)
-                    dict_sample['L_i_image'].pop(i_toremove)
-                    L_i_toremove = []
-                    for ij_gimage in dict_sample['L_contact_ij_gimage'] :
-                        if grain.id == ij_gimage[1] :
-                            L_i_toremove.append(dict_sample['L_contact_ij_gimage'].index(ij_gimage))
-                    L_i_toremove.reverse()
-                    for i_toremove in L_i_toremove:
-                        dict_sample['L_contact_gimage'].pop(i_toremove)
-                        dict_sample['L_contact_ij_gimage'].pop(i_toremove)
-        #translate image
-        for image in dict_sample['L_g_image']:
-            if image.position == 'left' :
-                image.translation(np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0]))
-            elif image.position == 'right' :
-                image.translation(np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0]))
-
-        #Contact detection
-        if (dict_algorithm['i_DEM']-i_DEM_0-1) % dict_algorithm['i_update_neighborhoods']  == 0:
-            Contact_gg.Update_Neighborhoods(dict_algorithm, dict_sample)
-            Contact_gimage.Update_Neighborhoods(dict_algorithm, dict_sample)
-        Contact_gg.Grains_contact_Neighborhoods(dict_sample,dict_material)
-        Contact_gimage.Grains_contact_Neighborhoods(dict_sample,dict_material)
-
-        #Sollicitation computation
-        for grain in dict_sample['L_g']:
-             grain.init_F_control(dict_sollicitations['gravity'])
-        for contact in dict_sample['L_contact']+dict_sample['L_contact_gimage']:
-            #do not consider the contact inside top and bottom groups
-            if not (contact.g1.group == 'Top' and contact.g2.group =='Top') and not (contact.g1.group == 'Bottom' and contact.g2.group =='Bottom') :
-                contact.normal()
-                contact.tangential(dict_algorithm['dt_DEM'])
-
-        #Move grains (only Current)
-        for grain in dict_sample['L_g']:
-            if grain.group == 'Current' :
-                grain.euler_semi_implicite(dict_algorithm['dt_DEM'])
-
-        #periodic condition
-        for grain in dict_sample['L_g']:
-            #left wall
-            if grain.center[0] < dict_sample['x_box_min'] :
-                grain.center = grain.center.copy() + np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0])
-                for i in range(len(grain.l_border)):
-                    grain.l_border[i] = grain.l_border[i].copy() + np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0])
-                    grain.l_border_x[i] = grain.l_border_x[i].copy() + dict_sample['x_box_max'] - dict_sample['x_box_min']
-                #contact gimage needed to be convert into gg
-                Owntools.convert_gimage_into_gg(grain, dict_sample, dict_material)
-                #contact gg needed to be convert into gimage
-                Owntools.convert_gg_into_gimage(grain, dict_sample, dict_material)
-            #right wall
-            elif grain.center[0] > dict_sample['x_box_max'] :
-                grain.center = grain.center.copy() + np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0])
-                for i in range(len(grain.l_border)):
-                    grain.l_border[i] = grain.l_border[i].copy() + np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0])
-                    grain.l_border_x[i] = grain.l_border_x[i].copy() + dict_sample['x_box_min'] - dict_sample['x_box_max']
-                #contact gimage needed to be convert into gg
-                Owntools.convert_gimage_into_gg(grain, dict_sample, dict_material)
-                #contact gg needed to be convert into gimage
-                Owntools.convert_gg_into_gimage(grain, dict_sample, dict_material)
-
-        #Control the top group to have the pressure target
-        dy_top, Fv = Control_Top_PID(dict_algorithm, dict_sollicitations['Vertical_Confinement_Force'], dict_sample['L_g'])
-        #Apply confinement force
-        for grain in dict_sample['L_g'] :
-            if grain.group == 'Top':
-                grain.move_as_a_group(np.array([0, dy_top]), dict_algorithm['dt_DEM'])
-        dict_sample['y_box_max'] = dict_sample['y_box_max'] + dy_top
-
-        #compute compacity, force applied on current grains and kinetic energy of current grains
-        Surface_g = 0
-        Force_applied = 0
-        Ecin = 0
-        for grain in dict_sample['L_g']:
-            Surface_g = Surface_g + grain.surface
-            if grain.group == 'Current':
-                Force_applied = Force_applied + np.linalg.norm([grain.fx, grain.fy])
-                Ecin = Ecin + 0.5 * grain.mass * np.dot(grain.v, grain.v)
-
-        #tracker
-        dict_tracker['compacity_L'].append(Surface_g/((dict_sample['y_box_max']-dict_sample['y_box_min'])*(dict_sample['x_box_max']-dict_sample['x_box_min'])))
-        dict_tracker['vertical_force_L'].append(Fv)
-        dict_tracker['dy_top_L'].append(dy_top)
-        dict_tracker['Ecin_L'].append(Ecin)
-        dict_tracker['Force_L'].append(Force_applied)
-
-        if dict_algorithm['i_DEM'] % dict_algorithm['i_print_plot'] == 0:
-            print('i_DEM',dict_algorithm['i_DEM'],': Confinement',int(100*Fv/dict_sollicitations['Vertical_Confinement_Force']),'%')
-            if dict_algorithm['Debug_DEM'] :
-                Owntools.Plot.Plot_Config_Confinement(dict_sample,dict_algorithm['i_DEM'])
-
-        #Check stop conditions for DEM
-        if dict_sample['L_g'] == []: #no more grains
-            DEM_loop_statut = False
-        if dict_algorithm['i_DEM'] >= dict_sollicitations['i_DEM_stop'] : #too many iterations
-            DEM_loop_statut = False
+    #groups in the store
+    grain_store = dict_sample['grain_store']
+    L_i_current = grain_store.L_i_group('Current')
+    L_g_current = [grain for grain in dict_sample['L_g'] if grain.group == 'Current']
+    clump_top = Clump(grain_store, 'Top', False)
+    clump_bottom = Clump(grain_store, 'Bottom', True)
+    #the grains of the static clump never cross the periodic boundaries
+    L_g_mobile = [grain for grain in dict_sample['L_g'] if not clump_bottom.mask[grain.i_store]]
+    verlet_list = Neighborhood.Verlet_List(dict_algorithm['factor_neighborhood'], dict_algorithm['skin_neighborhood'], dict_sample['x_box_min'], dict_sample['x_box_max'], [clump_top, clump_bottom], True, dict_sample['dict_lees_edwards'])
+    if dict_algorithm['sleep'] :
+        sleep_manager = Sleep.Sleep_Manager(dict_algorithm)
+    else :
+        sleep_manager = None
+
+    #DEM engine
+    contact_law = DEM_engine.Contact_Law_Store(dict_algorithm, dict_material, dict_sample, dict_sollicitations, verlet_list)
+    #only Current and awake grains are moved
+    integrator = DEM_engine.Integrator_Store(grain_store, L_g_current, sleep_manager)
+    #periodic condition, the contacts are kept (minimum image convention)
+    periodic = DEM_engine.Periodic_Minimum_Image(dict_sample, L_g_mobile)
+    #Control the top group to have the pressure target
+    controller = DEM_engine.Control_Top_Clump(dict_algorithm, dict_sample, dict_sollicitations['Vertical_Confinement_Force'], clump_top, 0, dict_sample['y_box_max']-dict_sample['y_box_min'])
+    L_controller = [controller]
+    if dict_algorithm['adaptive_dt'] :
+        L_controller.append(DEM_engine.Adaptive_Time_Step(dict_algorithm, grain_store, L_i_current + list(clump_top.L_i_grain)))
+    tracker = Tracker_Confinement(dict_algorithm, dict_sample, dict_sollicitations, dict_tracker, controller)
+    L_stop = [DEM_engine.Stop_No_Grain(dict_sample['L_g']), DEM_engine.Stop_Max_Iteration(dict_sollicitations['i_DEM_stop'])]
+    engine = DEM_engine.DEM_Engine(dict_algorithm['i_DEM'], dict_algorithm['dt_DEM'], contact_law, integrator, [periodic], L_controller, [tracker], L_stop)
+    engine.run()
+    dict_algorithm['i_DEM'] = engine.i_DEM
+    dict_algorithm['dt_DEM'] = engine.dt_DEM
+
+    simulation_report.write('Neighborhoods built '+str(verlet_list.n_build)+' times in '+str(dict_algorithm['i_DEM'])+' DEM steps\n')
+    if dict_algorithm['sleep'] :
+        sleep_manager.report(len(L_g_current), simulation_report)
+        sleep_manager.wake_up_all(L_g_current)
 
     #plot trackers
     Owntools.Plot.Plot_own(list(range(0,len(dict_tracker['vertical_force_L']))),dict_tracker['vertical_force_L'], 'Vertical force', 'Debug/Confinement/vertical_force.png')
     Owntools.Plot.Plot_own(list(range(0,len(dict_tracker['dy_top_L']))),dict_tracker['dy_top_L'], 'dy', 'Debug/Confinement/dy.png')
     Owntools.Plot.Plot_own(list(range(0,len(dict_tracker['Ecin_L']))),dict_tracker['Ecin_L'], 'Kinetic energy', 'Debug/Confinement/ecin.png')
     Owntools.Plot.Plot_own(list(range(0,len(dict_tracker['Force_L']))),dict_tracker['Force_L'], 'Force applied', 'Debug/Confinement/force.png')
-
-#-------------------------------------------------------------------------------
-
-def Control_Top_PID(dict_algorithm, Force_target, L_g):
-    """
-    Control the upper wall to apply force.
-
-    A PID corrector is applied.
-        Input :
-            an algorithm dictionnary (a dict)
-            a confinement value (a float)
-            a list of grain (a list)
-        Output :
-            the displacement of the top group (a float)
-            a force applied on the top group before control (a float)
-    """
-    #compute vertical force applied on top group
-    F = 0
-    for grain in L_g :
-        if grain.group == 'Top':
-            F = F + grain.fy
-    #compare with the target value
-    error = F - Force_target #to have dy_top < 0 is F < Force_target
-    #corrector
-    ki = 0
-    kd = 0
-    dy_top = error * dict_algorithm['kp']
-    #compare with maximum value
-    if abs(dy_top) > dict_algorithm['dy_top_max'] :
-        dy_top = np.sign(dy_top)*dict_algorithm['dy_top_max']
-
-    return dy_top, F
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains functions used in the simulation to compute the reactions of all the contacts at once.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import math
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def Compute_reactions(L_contact, dt_DEM, narrow_phase):
+    """
+    Compute the normal and the tangential reactions of a list of contacts.
+
+    The geometry is computed contact by contact (see Contact.geometry()), except for the contacts between two sleeping grains (see Sleep.Sleep_Manager). Then, the contacts are packed into arrays and the reactions are computed in one vectorized pass. The forces and the moments are added in the grain store.
+    The normal reaction is a Hertz spring with a viscous damping, the tangential reaction is a Mindlin spring bounded by the Coulomb criteria, with a viscous damping. There is no damping for a contact with the Top group.
+    The stable time step of the contacts is estimated as min(sqrt(m_eq/k)), k being the largest tangent stiffness (normal or tangential) of a contact.
+    The lever arms are computed with the real grains, they do not depend on the offset of a periodic contact. With the Lees-Edwards conditions, the velocity of the grain 2 is shifted by the velocity offset of the contact.
+
+        Input :
+            a list of contacts (a list)
+            a time step (a float)
+            a narrow phase engine, 'vertices', 'SAT' or 'SDF' (a string)
+        Output :
+            the stable time step of the contacts, infinite if there is no active spring (a float)
+    """
+    n_contact = len(L_contact)
+    if n_contact == 0 :
+        return math.inf
+    store = L_contact[0].g1.store
+
+    #-----------------------------------------------------------------------------
+    # Pack the contacts
+    #-----------------------------------------------------------------------------
+
+    L_i_g1 = []
+    L_i_g2 = []
+    L_damp = []
+    L_p1 = []
+    L_p2 = []
+    L_center_2 = []
+    L_offset_v = []
+    L_pc_normal = []
+    L_overlap = []
+    L_ft = []
+    L_statut = []
+    L_tangential_old = []
+    L_overlap_tangential = []
+    L_mu = []
+    L_coeff_restitution = []
+    for contact in L_contact:
+        g1 = contact.g1
+        g2 = contact.g2
+        #a pair of sleeping grains has not moved, the geometry of the previous step is kept
+        if not (g1.asleep and g2.asleep) :
+            contact.geometry(narrow_phase)
+        L_i_g1.append(g1.i_store)
+        L_i_g2.append(g2.i_store)
+        #no damping for top
+        L_damp.append(not (g1.group == 'Top' or g2.group == 'Top'))
+        L_p1.append(g1.l_border[contact.ij_min[0]])
+        L_p2.append(g2.l_border[contact.ij_min[1]])
+        L_center_2.append(g2.center)
+        L_offset_v.append(contact.offset_v)
+        L_pc_normal.append(contact.pc_normal)
+        L_overlap.append(contact.overlap_normal)
+        L_ft.append(contact.ft)
+        L_statut.append(contact.tangential_old_statut)
+        if contact.tangential_old_statut :
+            L_tangential_old.append(contact.tangential_old)
+        else :
+            L_tangential_old.append(np.zeros(2))
+        L_overlap_tangential.append(contact.overlap_tangential)
+        L_mu.append(contact.mu)
+        L_coeff_restitution.append(contact.coeff_restitution)
+
+    i1 = np.array(L_i_g1, dtype = int)
+    i2 = np.array(L_i_g2, dtype = int)
+    damp = np.array(L_damp)
+    p1 = np.array(L_p1)
+    p2 = np.array(L_p2)
+    center_1 = store.center[i1]
+    center_2 = np.array(L_center_2)
+    pc_normal = np.array(L_pc_normal)
+    pc_tangential = np.column_stack((-pc_normal[:,1], pc_normal[:,0]))
+    overlap = np.array(L_overlap, dtype = float)
+    ft = np.array(L_ft, dtype = float)
+    statut = np.array(L_statut)
+    tangential_old = np.array(L_tangential_old)
+    overlap_tangential = np.array(L_overlap_tangential, dtype = float)
+    mu = np.array(L_mu, dtype = float)
+    coeff_restitution = np.array(L_coeff_restitution, dtype = float)
+    v1 = store.v[i1]
+    v2 = store.v[i2] + np.array(L_offset_v)
+    w1 = store.w[i1]
+    w2 = store.w[i2]
+    mass_eq = store.mass[i1]*store.mass[i2]/(store.mass[i1]+store.mass[i2])
+    gamma = -np.log(coeff_restitution)/np.sqrt(math.pi**2+np.log(coeff_restitution)**2)
+
+    #-----------------------------------------------------------------------------
+    # Normal reaction
+    #-----------------------------------------------------------------------------
+
+    normal_on = overlap > 0
+    n_on = np.flatnonzero(normal_on)
+    F_2_1_n = np.zeros(n_contact)
+    F_2_1_damp_n = np.zeros(n_contact)
+    Ep_n = np.zeros(n_contact)
+
+    #Spring term
+    Y_eq = 1/((1-store.nu[i1]*store.nu[i1])/store.y[i1]+(1-store.nu[i2]*store.nu[i2])/store.y[i2])
+    R_eq = 1/(1/store.radius[i1]+1/store.radius[i2])
+    k = 4/3*Y_eq*np.sqrt(R_eq)
+    F_2_1_n[n_on] = -k[n_on] * overlap[n_on]**(3/2) #unlinear spring
+    Ep_n[n_on] = 2/5 * k[n_on] * overlap[n_on]**(5/2) #-dEp/dx = F_2_1_n
+
+    #Damping term
+    eta = 2 * gamma[n_on] * np.sqrt(mass_eq[n_on]*k[n_on])
+    F_2_1_damp_n[n_on] = np.sum((v2[n_on] - v1[n_on])*pc_normal[n_on], axis = 1)*eta
+
+    #-----------------------------------------------------------------------------
+    # Tangential reaction
+    #-----------------------------------------------------------------------------
+
+    tangential_on = normal_on & (mu > 0)
+    t_on = np.flatnonzero(tangential_on)
+    ft_damp = np.zeros(n_contact)
+
+    #if a reaction has been already computed
+    #need to project the tangential reaction on the new tangential plane
+    t_project = np.flatnonzero(tangential_on & statut)
+    ft[t_project] = ft[t_project]*np.sum(tangential_old[t_project]*pc_tangential[t_project], axis = 1)
+
+    G_eq = 1/((1-store.nu[i1[t_on]])/store.g[i1[t_on]]+(1-store.nu[i2[t_on]])/store.g[i2[t_on]])
+    d1 = np.linalg.norm(center_1[t_on]-p1[t_on], axis = 1)
+    d2 = np.linalg.norm(center_2[t_on]-p2[t_on], axis = 1)
+    R_eq_t = 1/(1/d1+1/d2)
+    kt0 = 8 * G_eq *np.sqrt(R_eq_t*np.abs(overlap[t_on]))
+    kt = kt0*np.sqrt(np.maximum(1-2/3*kt0*np.abs(overlap_tangential[t_on])/mu[t_on]/np.abs(F_2_1_n[t_on]),0)) #not linear spring
+
+    r1 = d1 - overlap[t_on]/2
+    r2 = d2 - overlap[t_on]/2
+    Delta_Us = (np.sum((v1[t_on]-v2[t_on])*pc_tangential[t_on], axis = 1) + r1*w1[t_on] + r2*w2[t_on])*dt_DEM
+    overlap_tangential[t_on] = overlap_tangential[t_on] + Delta_Us
+    ft[t_on] = ft[t_on] - kt*Delta_Us
+    #Coulomb criteria
+    coulomb = (np.abs(ft[t_on]) > np.abs(mu[t_on]*F_2_1_n[t_on])) | (kt == 0)
+    ft[t_on] = np.where(coulomb, mu[t_on] * np.abs(F_2_1_n[t_on]) * np.sign(ft[t_on]), ft[t_on])
+
+    #Damping term
+    eta_t = 2 * gamma[t_on] * np.sqrt(mass_eq[t_on]*kt)
+    ft_damp[t_on] = -Delta_Us/dt_DEM*eta_t/2
+
+    #stable time step, from the tangent stiffness dF/d(overlap) of the springs
+    k_tangent = np.zeros(n_contact)
+    k_tangent[n_on] = 3/2 * k[n_on] * np.sqrt(overlap[n_on])
+    k_tangent[t_on] = np.maximum(k_tangent[t_on], kt)
+    if np.any(k_tangent > 0) :
+        dt_contact = np.min(np.sqrt(mass_eq[k_tangent > 0]/k_tangent[k_tangent > 0]))
+    else :
+        dt_contact = math.inf
+
+    #no contact finally
+    t_off = np.flatnonzero(~tangential_on)
+    overlap_tangential[t_off] = 0
+    ft[t_off] = 0
+
+    #-----------------------------------------------------------------------------
+    # Scatter the forces and the moments into the grain store
+    #-----------------------------------------------------------------------------
+
+    F_n_1 = F_2_1_n + np.where(damp, F_2_1_damp_n, 0)
+    F_t_1 = ft + np.where(damp, ft_damp, 0)
+    F_1 = F_n_1[:,None]*pc_normal + F_t_1[:,None]*pc_tangential
+    M_1 = (p1[:,0]-center_1[:,0])*F_1[:,1] - (p1[:,1]-center_1[:,1])*F_1[:,0]
+    np.add.at(store.fx, i1, F_1[:,0])
+    np.add.at(store.fy, i1, F_1[:,1])
+    np.add.at(store.mz, i1, M_1)
+
+    F_2 = -F_1
+    M_2 = (p2[:,0]-center_2[:,0])*F_2[:,1] - (p2[:,1]-center_2[:,1])*F_2[:,0]
+    np.add.at(store.fx, i2, F_2[:,0])
+    np.add.at(store.fy, i2, F_2[:,1])
+    np.add.at(store.mz, i2, M_2)
+
+    #-----------------------------------------------------------------------------
+    # Save the state of the contacts for the next step
+    #-----------------------------------------------------------------------------
+
+    #position of the contacts in the tangential arrays
+    t_index = np.zeros(n_contact, dtype = int)
+    t_index[t_on] = np.arange(len(t_on))
+    for i_contact in range(n_contact):
+        contact = L_contact[i_contact]
+        contact.F_2_1_n = F_2_1_n[i_contact]
+        contact.F_2_1_damp = F_2_1_damp_n[i_contact]
+        contact.Ep_n = Ep_n[i_contact]
+        if normal_on[i_contact]:
+            contact.k = k[i_contact]
+        if tangential_on[i_contact]:
+            contact.kt = kt[t_index[i_contact]]
+            contact.tangential_old_statut = True
+            contact.tangential_old = contact.pc_tangential
+        contact.overlap_tangential = overlap_tangential[i_contact]
+        contact.ft = ft[i_contact]
+        contact.ft_damp = ft_damp[i_contact]
+
+    return dt_contact
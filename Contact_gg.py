@@ -15,6 +15,8 @@ import math
 
 #Own
 import Grain
+import Narrow_phase
+import Neighborhood
 
 #-------------------------------------------------------------------------------
 #Class
@@ -23,6 +25,9 @@ import Grain
 class Contact:
   """
   A contact grain - grain used to simulate the grains interactions.
+
+  The periodic conditions are considered with the minimum image convention : the grain 2 is seen at its nearest periodic copy, translated by an offset.
+  With the Lees-Edwards conditions, the copy also moves with a velocity offset.
   """
 
 #-------------------------------------------------------------------------------
@@ -47,87 +52,66 @@ class Contact:
     self.coeff_restitution = dict_material['coeff_restitution']
     self.tangential_old_statut = False
     self.overlap_tangential = 0
+    self.dict_narrow_phase = None
+    self.ij_min = None
+    self.offset = np.zeros(2)
+    self.offset_v = np.zeros(2)
 
 #-------------------------------------------------------------------------------
 
-  def convert_gimage_in_gg(self, other):
-    """
-    Convert a contact grain-image in a contact grain-grain.
-
-        Input :
-            itself (a contact)
-            a contact grain-image (a contact_gimage)
-        Output :
-            Nothing, but data from the contact gimage are transmitted to the contact gg
-    """
-    self.ft = other.ft
-    self.tangential_old_statut = other.tangential_old_statut
-    if other.tangential_old_statut :
-        self.tangential_old = other.tangential_old.copy()
-    self.overlap_tangential = other.overlap_tangential
-    self.pc_normal = other.pc_normal.copy()
-    self.overlap_normal = other.overlap_normal
-    self.k = other.k
-    self.F_2_1_n = other.F_2_1_n
-    self.pc_tangential = other.pc_tangential.copy()
-
-#-------------------------------------------------------------------------------
-
-  def normal(self):
+  def geometry(self, narrow_phase):
     """
-    Compute the normal reaction of a contact grain-grain.
+    Compute the geometry of a contact grain-grain.
 
-    Here a pontual spring is considered.
+    The nearest vertices, the contact plane and the overlap are determined.
+    The nearest vertices come from the contact detection of the same step if available (see Grains_Polyhedral_narrow_phase()), else they are searched from the nearest vertices of the previous step.
+    With the 'SAT' or the 'SDF' engine, the contact plane and the overlap are given by the narrow phase (see Narrow_phase).
+    The grain 2 is translated by the offset of the contact.
 
         Input :
             itself (a contact)
+            a narrow phase engine, 'vertices', 'SAT' or 'SDF' (a string)
         Output :
             Nothing, but attributes are updated
     """
-    #compute angle between grains
-    g1_to_g2 = self.g2.center - self.g1.center
-    if g1_to_g2[1] >= 0 :
-        angle_g1_to_g2 = math.acos(g1_to_g2[0]/np.linalg.norm(g1_to_g2))
-        angle_g2_to_g1 = angle_g1_to_g2 + math.pi
-    else :
-        angle_g1_to_g2 = math.pi + math.acos(-g1_to_g2[0]/np.linalg.norm(g1_to_g2))
-        angle_g2_to_g1 = angle_g1_to_g2 - math.pi
-
-    #extract
-    L_i_vertices_1 = extract_vertices(self.g1, angle_g1_to_g2)
-    L_i_vertices_2 = extract_vertices(self.g2, angle_g2_to_g1)
-
-    #looking for the nearest nodes
-    d_virtual = max(self.g1.r_max,self.g2.r_max)
-    ij_min = [0,0]
-    d_ij_min = 100*d_virtual #Large
-    for i in L_i_vertices_1:
-        for j in L_i_vertices_2:
-            d_ij = np.linalg.norm(self.g2.l_border[:-1][j]-self.g1.l_border[:-1][i]+d_virtual*(self.g2.center-self.g1.center)/np.linalg.norm(self.g2.center-self.g1.center))
-            if d_ij < d_ij_min :
-                d_ij_min = d_ij
-                ij_min = [i,j]
+    if self.dict_narrow_phase is None :
+        self.dict_narrow_phase = Grains_Polyhedral_narrow_phase(self.g1, self.g2, self.offset, narrow_phase, self.ij_min)
+    dict_narrow_phase = self.dict_narrow_phase
+    ij_min = dict_narrow_phase['ij_min']
+    #the narrow phase is done again on the next step
+    self.dict_narrow_phase = None
     self.ij_min = ij_min
 
+    if narrow_phase == 'SAT' or narrow_phase == 'SDF' :
+        self.pc_normal = dict_narrow_phase['pc_normal'] #n12
+        self.pc_tangential = np.array([-self.pc_normal[1],self.pc_normal[0]])
+        self.overlap_normal = dict_narrow_phase['d_ij_min']
+        return
+
     #-----------------------------------------------------------------------------
     #Computing CP
     #-----------------------------------------------------------------------------
 
-    M = (self.g1.l_border[:-1][ij_min[0]]+self.g2.l_border[:-1][ij_min[1]])/2
+    #the grain 2 is at its nearest periodic copy
+    l_border_1 = self.g1.l_border[:-1]
+    l_border_2 = self.g2.l_border[:-1] + self.offset
+    center_2 = self.g2.center + self.offset
+
+    M = (l_border_1[ij_min[0]]+l_border_2[ij_min[1]])/2
     # 5 candidates for CP
-    N = np.array([self.g1.l_border[:-1][ij_min[0]][0] - self.g2.l_border[:-1][ij_min[1]][0],
-                  self.g1.l_border[:-1][ij_min[0]][1] - self.g2.l_border[:-1][ij_min[1]][1]])
+    N = np.array([l_border_1[ij_min[0]][0] - l_border_2[ij_min[1]][0],
+                  l_border_1[ij_min[0]][1] - l_border_2[ij_min[1]][1]])
     N = N/np.linalg.norm(N)
     PB = np.array([-N[1] ,N[0]])
     PB = PB/np.linalg.norm(PB)
 
     #candidats from grain 1
-    if ij_min[0] <len(self.g1.l_border[:-1]) - 1:
-        M1 = self.g1.l_border[:-1][ij_min[0]+1]-self.g1.l_border[:-1][ij_min[0]]
+    if ij_min[0] <len(l_border_1) - 1:
+        M1 = l_border_1[ij_min[0]+1]-l_border_1[ij_min[0]]
     else :
-        M1 = self.g1.l_border[:-1][0]-self.g1.l_border[:-1][ij_min[0]]
+        M1 = l_border_1[0]-l_border_1[ij_min[0]]
     M1 = M1/np.linalg.norm(M1)
-    M3 = self.g1.l_border[:-1][ij_min[0]-1]-self.g1.l_border[:-1][ij_min[0]]
+    M3 = l_border_1[ij_min[0]-1]-l_border_1[ij_min[0]]
     M3 = M3/np.linalg.norm(M3)
     #reorganize the candidats
     if np.dot(M1,PB) < 0:
@@ -136,12 +120,12 @@ class Contact:
         M3 = Mtempo.copy()
 
     #candidats from grain 2
-    if ij_min[1] <len(self.g2.l_border[:-1]) - 1:
-        M2 = self.g2.l_border[:-1][ij_min[1]+1]-self.g2.l_border[:-1][ij_min[1]]
+    if ij_min[1] <len(l_border_2) - 1:
+        M2 = l_border_2[ij_min[1]+1]-l_border_2[ij_min[1]]
     else :
-        M2 = self.g2.l_border[:-1][0]-self.g2.l_border[:-1][ij_min[1]]
+        M2 = l_border_2[0]-l_border_2[ij_min[1]]
     M2 = M2/np.linalg.norm(M2)
-    M4 = self.g2.l_border[:-1][ij_min[1]-1]-self.g2.l_border[:-1][ij_min[1]]
+    M4 = l_border_2[ij_min[1]-1]-l_border_2[ij_min[1]]
     M4 = M4/np.linalg.norm(M4)
     #reorganize the candidats
     if np.dot(M2,PB) < 0:
@@ -170,7 +154,7 @@ class Contact:
     #-----------------------------------------------------------------------------
 
     PC_normal = np.array([PC[1],-PC[0]])
-    if np.dot(PC_normal,(self.g2.center-self.g1.center)/np.linalg.norm(self.g2.center-self.g1.center))<0 :
+    if np.dot(PC_normal,(center_2-self.g1.center)/np.linalg.norm(center_2-self.g1.center))<0 :
         PC_normal = np.array([-PC[1],PC[0]])
     self.pc_normal = PC_normal #n12
     self.pc_tangential = np.array([-PC_normal[1],PC_normal[0]])
@@ -179,180 +163,119 @@ class Contact:
     # Compute the overlap
     #-----------------------------------------------------------------------------
 
-    d_b = np.dot(M-self.g2.l_border[:-1][ij_min[1]],PC_normal)
-    d_a = np.dot(M-self.g1.l_border[:-1][ij_min[0]],PC_normal)
+    d_b = np.dot(M-l_border_2[ij_min[1]],PC_normal)
+    d_a = np.dot(M-l_border_1[ij_min[0]],PC_normal)
     overlap = d_b - d_a
     self.overlap_normal = overlap
 
-    if overlap > 0:
-    #-----------------------------------------------------------------------------
-    # Compute the reaction
-    #-----------------------------------------------------------------------------
-
-        #Spring term
-        Y_eq = 1/((1-self.g1.nu*self.g1.nu)/self.g1.y+(1-self.g2.nu*self.g2.nu)/self.g2.y)
-        R_eq = 1/(1/self.g1.radius+1/self.g2.radius)
-        k = 4/3*Y_eq*math.sqrt(R_eq)
-        self.k = k
-        F_2_1_n = -k * overlap**(3/2)  #unlinear spring
-        F_2_1 = F_2_1_n * PC_normal
-        self.F_2_1_n = F_2_1_n
-        self.Ep_n = 2/5 * k * overlap**(5/2) #-dEp/dx = F_2_1_n
-        self.g1.add_F( F_2_1, self.g1.l_border[:-1][ij_min[0]])
-        self.g2.add_F(-F_2_1, self.g2.l_border[:-1][ij_min[1]])
-
-        #Damping term
-        gamma = -math.log(self.coeff_restitution)/math.sqrt(math.pi**2+math.log(self.coeff_restitution)**2)
-        mass_eq = self.g1.mass*self.g2.mass/(self.g1.mass+self.g2.mass)
-        eta = 2 * gamma * math.sqrt(mass_eq*k)
-        F_2_1_damp_n = np.dot(self.g2.v - self.g1.v,PC_normal)*eta
-        F_2_1_damp = F_2_1_damp_n *PC_normal
-        self.F_2_1_damp = F_2_1_damp_n
-        if not (self.g1.group == 'Top' or self.g2.group == 'Top') : #no damping for top
-            self.g1.add_F( F_2_1_damp, self.g1.l_border[:-1][ij_min[0]])
-        if not (self.g1.group == 'Top' or self.g2.group == 'Top') : #no damping for top
-            self.g2.add_F(-F_2_1_damp, self.g2.l_border[:-1][ij_min[1]])
-
-    #no contact finally
-    else :
-        self.F_2_1_n = 0
-        self.F_2_1_damp = 0
-        self.Ep_n = 0
-
-#-------------------------------------------------------------------------------
-
-  def tangential(self,dt_DEM):
-    """
-    Compute the tangential reaction of a contact grain-grain.
-
-    Here a pontual spring is considered
-
-        Input :
-            itself (a contact)
-            a time step (a float)
-        Output :
-            Nothing, but attributes are updated
-    """
-    if self.overlap_normal > 0 and self.mu > 0:
-
-        if self.tangential_old_statut:
-          #if a reaction has been already computed
-          #need to project the tangential reaction on the new tangential plane
-          self.ft = self.ft*np.dot(self.tangential_old,self.pc_tangential)
-        else:
-          self.tangential_old_statut = True
-
-        G_eq = 1/((1-self.g1.nu)/self.g1.g+(1-self.g2.nu)/self.g2.g)
-        R_eq = 1/(1/np.linalg.norm(self.g1.center-self.g1.l_border[self.ij_min[0]])+1/np.linalg.norm(self.g2.center-self.g2.l_border[self.ij_min[1]]))
-        kt0 = 8 * G_eq *math.sqrt(R_eq*abs(self.overlap_normal))
-        kt = kt0*math.sqrt(max(1-2/3*kt0*abs(self.overlap_tangential)/self.mu/abs(self.F_2_1_n),0)) #not linear spring
-
-        r1 = np.linalg.norm(self.g1.l_border[:-1][self.ij_min[0]] - self.g1.center) - self.overlap_normal/2
-        r2 = np.linalg.norm(self.g2.l_border[:-1][self.ij_min[1]] - self.g2.center) - self.overlap_normal/2
-        Delta_Us = (np.dot(self.g1.v-self.g2.v,self.pc_tangential) + r1*self.g1.w + r2*self.g2.w)*dt_DEM
-        self.overlap_tangential = self.overlap_tangential + Delta_Us
-        self.ft = self.ft - kt*Delta_Us
-        self.tangential_old = self.pc_tangential
-        if abs(self.ft) > abs(self.mu*self.F_2_1_n) or kt == 0: #Coulomb criteria
-            self.ft = self.mu * abs(self.F_2_1_n) * np.sign(self.ft)
-        self.g1.add_F( self.ft*self.pc_tangential, self.g1.l_border[:-1][self.ij_min[0]])
-        self.g2.add_F(-self.ft*self.pc_tangential, self.g2.l_border[:-1][self.ij_min[1]])
-
-        #Damping term
-        gamma = -math.log(self.coeff_restitution)/math.sqrt(math.pi**2+math.log(self.coeff_restitution)**2)
-        mass_eq = self.g1.mass*self.g2.mass/(self.g1.mass+self.g2.mass)
-        eta = 2 * gamma * math.sqrt(mass_eq*kt)
-        F_2_1_damp_t = -Delta_Us/dt_DEM*eta/2
-        F_2_1_damp = F_2_1_damp_t *self.pc_tangential
-        self.ft_damp = F_2_1_damp_t
-        if not (self.g1.group == 'Top' or self.g2.group == 'Top') : #no damping for top
-            self.g1.add_F( F_2_1_damp, self.g1.l_border[:-1][self.ij_min[0]])
-        if not (self.g1.group == 'Top' or self.g2.group == 'Top') : #no damping for top
-            self.g2.add_F(-F_2_1_damp, self.g2.l_border[:-1][self.ij_min[1]])
-
-    #no contact finally
-    else :
-        tangential_old_statut = False
-        self.overlap_tangential = 0
-        self.ft = 0
-        self.ft_damp = 0
-
 #-------------------------------------------------------------------------------
 #Function
 #-------------------------------------------------------------------------------
 
-def Grains_Polyhedral_contact_f(g1,g2):
+def Grains_Polyhedral_narrow_phase(g1,g2,offset,narrow_phase,ij_start):
   """
-  Detect the contact grain-grain.
+  Look for the nearest vertices between two grains.
+
+  The vertices are searched in an angular window around the line between the centers (see extract_vertices()).
+  If the nearest vertices of the previous step are given, the search starts from them (see hill_climbing_vertices()). The full search in the windows is done only if the hill-climbing ends outside the windows.
+  The result is used to detect the contact and is reused by geometry() on the same step.
+  With the 'SAT' engine, the separating axis theorem is used instead (see Narrow_phase.Polygons_SAT()).
+  With the 'SDF' engine, the signed distance grids of the grains are used instead (see Narrow_phase.Polygons_SDF()).
+  The grain 2 is translated by an offset (see Neighborhood.Minimum_image_offset()).
 
     Input :
         two grains (two grains)
+        the offset of the grain 2 (a 1 x 2 numpy array)
+        a narrow phase engine, 'vertices', 'SAT' or 'SDF' (a string)
+        the nearest vertices of the previous step, None for a new contact (a list)
     Output :
-        a Boolean, True if there is contaxct between the twwo grains (a Boolean)
+        a narrow phase dictionnary with the angles, the vertex windows, the nearest vertices and their distance (positive if overlap) (a dict)
   """
-  if np.linalg.norm(g1.center-g2.center) < 1.5*(g1.r_max+g2.r_max):
-      #compute angle between grains
-      g1_to_g2 = g2.center - g1.center
-      if g1_to_g2[1] >= 0 :
-          angle_g1_to_g2 = math.acos(g1_to_g2[0]/np.linalg.norm(g1_to_g2))
-          angle_g2_to_g1 = angle_g1_to_g2 + math.pi
-      else :
-          angle_g1_to_g2 = math.pi + math.acos(-g1_to_g2[0]/np.linalg.norm(g1_to_g2))
-          angle_g2_to_g1 = angle_g1_to_g2 - math.pi
-
-      #extract
-      L_i_vertices_1 = extract_vertices(g1, angle_g1_to_g2)
-      L_i_vertices_2 = extract_vertices(g2, angle_g2_to_g1)
-
-      #looking for the nearest nodes
-      d_virtual = max(g1.r_max,g2.r_max)
-      ij_min = [0,0]
-      d_ij_min = 100*d_virtual #Large
-      for i in L_i_vertices_1:
-        for j in L_i_vertices_2:
-            d_ij = np.linalg.norm(g2.l_border[:-1][j]-g1.l_border[:-1][i]+d_virtual*(g2.center-g1.center)/np.linalg.norm(g2.center-g1.center))
-            if d_ij < d_ij_min :
-                d_ij_min = d_ij
-                ij_min = [i,j]
-
-      d_ij_min = np.dot(g2.l_border[:-1][ij_min[1]]-g1.l_border[:-1][ij_min[0]],-(g2.center-g1.center)/np.linalg.norm(g2.center-g1.center))
-      return d_ij_min > 0
+  if narrow_phase == 'SAT' :
+      return Narrow_phase.Polygons_SAT(g1,g2,offset)
+  elif narrow_phase == 'SDF' :
+      return Narrow_phase.Polygons_SDF(g1,g2,offset)
+
+  #the grain 2 is at its nearest periodic copy
+  center_2 = g2.center + offset
+
+  #compute angle between grains
+  g1_to_g2 = center_2 - g1.center
+  if g1_to_g2[1] >= 0 :
+      angle_g1_to_g2 = math.acos(g1_to_g2[0]/np.linalg.norm(g1_to_g2))
+      angle_g2_to_g1 = angle_g1_to_g2 + math.pi
+  else :
+      angle_g1_to_g2 = math.pi + math.acos(-g1_to_g2[0]/np.linalg.norm(g1_to_g2))
+      angle_g2_to_g1 = angle_g1_to_g2 - math.pi
+
+  #extract
+  L_i_vertices_1 = extract_vertices(g1, angle_g1_to_g2)
+  L_i_vertices_2 = extract_vertices(g2, angle_g2_to_g1)
+
+  #looking for the nearest nodes
+  d_virtual = max(g1.r_max,g2.r_max)
+  #the vertices in the world frame are computed once
+  l_border_1 = g1.l_border[:-1]
+  l_border_2 = g2.l_border[:-1] + offset
+
+  #warm start from the nearest vertices of the previous step
+  ij_min = None
+  if ij_start is not None and ij_start[0] < len(l_border_1) and ij_start[1] < len(l_border_2) :
+      ij_min = hill_climbing_vertices(l_border_1, l_border_2, ij_start, d_virtual*(center_2-g1.center)/np.linalg.norm(center_2-g1.center))
+      #the hill-climbing fails if it ends outside the windows
+      if ij_min[0] not in L_i_vertices_1 or ij_min[1] not in L_i_vertices_2 :
+          ij_min = None
+
+  #full search in the windows
+  if ij_min is None :
+    ij_min = [0,0]
+    d_ij_min = 100*d_virtual #Large
+    for i in L_i_vertices_1:
+      for j in L_i_vertices_2:
+          d_ij = np.linalg.norm(l_border_2[j]-l_border_1[i]+d_virtual*(center_2-g1.center)/np.linalg.norm(center_2-g1.center))
+          if d_ij < d_ij_min :
+              d_ij_min = d_ij
+              ij_min = [i,j]
 
-  else:
-    return False
+  d_ij_min = np.dot(l_border_2[ij_min[1]]-l_border_1[ij_min[0]],-(center_2-g1.center)/np.linalg.norm(center_2-g1.center))
+  return {'angle_g1_to_g2' : angle_g1_to_g2, 'angle_g2_to_g1' : angle_g2_to_g1,
+          'L_i_vertices_1' : L_i_vertices_1, 'L_i_vertices_2' : L_i_vertices_2,
+          'ij_min' : ij_min, 'd_ij_min' : d_ij_min}
 
 #-------------------------------------------------------------------------------
 
-def Update_Neighborhoods(dict_algorithm, dict_sample):
-    """
-    Determine a neighborhood for each grain.
+def Grains_Polyhedral_contact_f(g1,g2,offset,narrow_phase,ij_start):
+  """
+  Detect the contact grain-grain.
 
-    This function is called every x time step. The contact is determined by Grains_contact_Neighborhoods().
-    Notice that if there is a potential contact between grain_i and grain_j, grain_i is not in the neighborhood of grain_j.
-    Whereas grain_j is in the neighborhood of grain_i. With i_grain < j_grain.
+    Input :
+        two grains (two grains)
+        the offset of the grain 2 (a 1 x 2 numpy array)
+        a narrow phase engine, 'vertices', 'SAT' or 'SDF' (a string)
+        the nearest vertices of the previous step, None for a new contact (a list)
+    Output :
+        a Boolean, True if there is contact between the two grains (a Boolean)
+        a narrow phase dictionnary, None if the grains are too far (a dict)
+  """
+  if np.linalg.norm(g1.center-g2.center-offset) < 1.5*(g1.r_max+g2.r_max):
+      dict_narrow_phase = Grains_Polyhedral_narrow_phase(g1,g2,offset,narrow_phase,ij_start)
+      return dict_narrow_phase['d_ij_min'] > 0, dict_narrow_phase
 
-        Input :
-            an algorithm dictionnary (a dict)
-            a sample dictionnary (a dict)
-        Output :
-            Nothing, but the neighborhood of the grains is updated
-    """
-    for i_grain in range(len(dict_sample['L_g'])-1) :
-        neighborhood = []
-        for j_grain in range(i_grain+1,len(dict_sample['L_g'])):
-            if np.linalg.norm(dict_sample['L_g'][i_grain].center-dict_sample['L_g'][j_grain].center) < dict_algorithm['factor_neighborhood']*(dict_sample['L_g'][i_grain].r_max+dict_sample['L_g'][j_grain].r_max):
-                neighborhood.append(dict_sample['L_g'][j_grain])
-        dict_sample['L_g'][i_grain].neighborhood = neighborhood
+  else:
+    return False, None
 
 #-------------------------------------------------------------------------------
 
-def Grains_contact_Neighborhoods(dict_sample, dict_material):
+def Grains_contact_Neighborhoods(dict_algorithm, dict_sample, dict_material):
     """
     Detect contact between a grain and grains from its neighborhood.
 
-    The neighborhood is updated with Update_neighborhoods().
+    The neighborhood is updated with Neighborhood.Update_Neighborhoods().
+    The periodic conditions are considered with the minimum image convention (see Neighborhood.Minimum_image_offset()). A grain crossing the periodic boundary keeps its contacts, only their offsets change.
+    With the Lees-Edwards conditions, the nearest image is also searched along the y axis and its velocity is shifted (see Neighborhood.Lees_Edwards_offset()).
 
         Input :
+            an algorithm dictionnary (a dict)
             a sample dictionnary (a dict)
             a material dictionnary (a dict)
         Output :
@@ -362,17 +285,64 @@ def Grains_contact_Neighborhoods(dict_sample, dict_material):
         grain_i = dict_sample['L_g'][i_grain]
         for neighbour in dict_sample['L_g'][i_grain].neighborhood:
             grain_j = neighbour
-            if Grains_Polyhedral_contact_f(grain_i,grain_j) and (not (grain_i.group == 'Top' and grain_j.group =='Top') and not (grain_i.group == 'Bottom' and grain_j.group =='Bottom')): #do not consider top-top or bottom-bottom contacts
-                if (grain_i.id, grain_j.id) not in dict_sample['L_contact_ij']:  #contact not detected previously
+            #a pair of sleeping grains has not moved, the contact is kept as it is
+            if grain_i.asleep and grain_j.asleep :
+                continue
+            #nearest vertices of the previous step
+            if (grain_i.id, grain_j.id, 'gg') in dict_sample['contact_registry'] :
+                ij_start = dict_sample['contact_registry'].get((grain_i.id, grain_j.id, 'gg')).ij_min
+            else :
+                ij_start = None
+            if dict_sample['dict_lees_edwards'] is None :
+                offset = Neighborhood.Minimum_image_offset(grain_i.center, grain_j.center, dict_sample['x_box_min'], dict_sample['x_box_max'])
+                offset_v = np.zeros(2)
+            else :
+                L_offset, L_offset_v = Neighborhood.Lees_Edwards_offset(grain_i.center, np.array([grain_j.center]), dict_sample['x_box_min'], dict_sample['x_box_max'], dict_sample['dict_lees_edwards'])
+                offset = L_offset[0]
+                offset_v = L_offset_v[0]
+            contact_f, dict_narrow_phase = Grains_Polyhedral_contact_f(grain_i,grain_j,offset,dict_algorithm['narrow_phase'],ij_start)
+            if contact_f and (not (grain_i.group == 'Top' and grain_j.group =='Top') and not (grain_i.group == 'Bottom' and grain_j.group =='Bottom')): #do not consider top-top or bottom-bottom contacts
+                if (grain_i.id, grain_j.id, 'gg') not in dict_sample['contact_registry']:  #contact not detected previously
                    #creation of contact
-                   dict_sample['L_contact_ij'].append((grain_i.id, grain_j.id))
-                   dict_sample['L_contact'].append(Contact(dict_sample['id_contact'], grain_i, grain_j, dict_material))
+                   dict_sample['contact_registry'].add((grain_i.id, grain_j.id, 'gg'), Contact(dict_sample['id_contact'], grain_i, grain_j, dict_material))
                    dict_sample['id_contact'] = dict_sample['id_contact'] + 1
+                dict_sample['contact_registry'].get((grain_i.id, grain_j.id, 'gg')).dict_narrow_phase = dict_narrow_phase
+                dict_sample['contact_registry'].get((grain_i.id, grain_j.id, 'gg')).offset = offset
+                dict_sample['contact_registry'].get((grain_i.id, grain_j.id, 'gg')).offset_v = offset_v
 
             else :
-                if (grain_i.id, grain_j.id) in dict_sample['L_contact_ij'] : #contact detected previously is not anymore
-                       dict_sample['L_contact'].pop(dict_sample['L_contact_ij'].index((grain_i.id, grain_j.id)))
-                       dict_sample['L_contact_ij'].remove((grain_i.id, grain_j.id))
+                if (grain_i.id, grain_j.id, 'gg') in dict_sample['contact_registry'] : #contact detected previously is not anymore
+                       dict_sample['contact_registry'].remove((grain_i.id, grain_j.id, 'gg'))
+
+#-------------------------------------------------------------------------------
+
+def hill_climbing_vertices(l_border_1, l_border_2, ij_start, offset) :
+    """
+    Look for the nearest vertices between two grains from a starting pair of vertices.
+
+    The distance between the vertices i and j is the norm of l_border_2[j]-l_border_1[i]+offset, as in Grains_Polyhedral_narrow_phase().
+    At each iteration, the pairs made of the vertices before and after are compared at once. The pair moves to the nearest one until no pair is nearer.
+
+        Input :
+            the vertices of the first grain (a n x 2 numpy array)
+            the vertices of the second grain (a n x 2 numpy array)
+            a starting pair of vertices (a list)
+            an offset vector (a 1 x 2 numpy array)
+        Output :
+            the nearest pair of vertices found (a list)
+    """
+    i = ij_start[0]
+    j = ij_start[1]
+    while True :
+        L_i = [(i-1) % len(l_border_1), i, (i+1) % len(l_border_1)]
+        L_j = [(j-1) % len(l_border_2), j, (j+1) % len(l_border_2)]
+        L_d = np.linalg.norm(l_border_2[L_j][np.newaxis,:,:]-l_border_1[L_i][:,np.newaxis,:]+offset, axis = 2)
+        k = np.argmin(L_d)
+        #local minimum
+        if L_d[k//3, k%3] >= L_d[1,1] :
+            return [i,j]
+        i = L_i[k//3]
+        j = L_j[k%3]
 
 #-------------------------------------------------------------------------------
 
@@ -393,30 +363,19 @@ def extract_vertices(g, angle_g_to_other_g) :
     angle_plus  = angle_g_to_other_g + dtheta/2
     if 2*math.pi <= angle_plus :
         angle_plus = angle_plus - 2*math.pi
-    i_minus = find_value_in_list(g.l_theta_r.copy(), angle_minus)
-    i_plus = i_minus + find_value_in_list(g.l_theta_r[i_minus:].copy() + g.l_theta_r[:i_minus].copy(), angle_plus)
+    i_minus = g.i_nearest_theta_r(angle_minus)
+    i_plus = g.i_nearest_theta_r(angle_plus)
+    #the window is counted from i_minus
+    n_vertices = len(g.l_theta_r_body)
+    if i_plus < i_minus :
+        i_plus = i_plus + n_vertices
 
     L_i_vertices = []
     for i in range(i_minus, i_plus+1):
-        if i < len(g.l_theta_r):
+        if i < n_vertices:
             L_i_vertices.append(i)
         else :
-            L_i_vertices.append(i-len(g.l_theta_r))
+            L_i_vertices.append(i-n_vertices)
     return L_i_vertices
 
 #-------------------------------------------------------------------------------
-
-def find_value_in_list(List_to_search, value_to_find) :
-    """
-    Extract the index of the nearest value from a target in a list.
-
-        Input :
-            a list of float (a list)
-            a target (a float)
-        Output :
-            an index (an int)
-    """
-    L_search = list(abs(np.array(List_to_search)-value_to_find))
-    return L_search.index(min(L_search))
-
-#-------------------------------------------------------------------------------
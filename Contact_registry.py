@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the registry of the contacts used in the simulation.
+"""
+
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class ContactRegistry:
+  """
+  The contacts of the sample, indexed by a key (id_i, id_j, kind).
+
+  The kind is 'gg' for a grain-grain contact, 'gimage' for a grain-image contact (id_j is the id of the real grain of the image) and 'gw' for a grain-wall contact (id_j is the id of the wall).
+  Insertion, lookup and deletion are done in a dictionnary. The contacts of a kind are iterated in the order of insertion.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self):
+    """
+    Defining the registry, empty.
+
+        Input :
+            itself (a contact registry)
+        Output :
+            Nothing, but the contact registry is generated (a contact registry)
+    """
+    self.dict_contact = {'gg' : {}, 'gimage' : {}, 'gw' : {}}
+    self.dict_key_grain = {}
+
+#-------------------------------------------------------------------------------
+
+  def __contains__(self, key):
+    """
+    Check if a contact is in the registry.
+
+        Input :
+            itself (a contact registry)
+            a key (id_i, id_j, kind) (a tuple)
+        Output :
+            a Boolean (a Boolean)
+    """
+    return (key[0], key[1]) in self.dict_contact[key[2]]
+
+#-------------------------------------------------------------------------------
+
+  def __len__(self):
+    """
+    Count the contacts in the registry.
+
+        Input :
+            itself (a contact registry)
+        Output :
+            the number of contacts (an int)
+    """
+    return sum(len(dict_kind) for dict_kind in self.dict_contact.values())
+
+#-------------------------------------------------------------------------------
+
+  def add(self, key, contact):
+    """
+    Add a contact in the registry.
+
+        Input :
+            itself (a contact registry)
+            a key (id_i, id_j, kind) (a tuple)
+            a contact (a contact)
+        Output :
+            Nothing, but the contact registry is updated
+    """
+    self.dict_contact[key[2]][(key[0], key[1])] = contact
+    for id in self.L_id_grain(key):
+        self.dict_key_grain.setdefault(id, {})[key] = None
+
+#-------------------------------------------------------------------------------
+
+  def L_id_grain(self, key):
+    """
+    Get the ids of the grains of a contact, the id of a wall is not a grain.
+
+        Input :
+            itself (a contact registry)
+            a key (id_i, id_j, kind) (a tuple)
+        Output :
+            a list of ids of grains (a list)
+    """
+    if key[2] == 'gw' :
+        return [key[0]]
+    return [key[0], key[1]]
+
+#-------------------------------------------------------------------------------
+
+  def get(self, key):
+    """
+    Get a contact from the registry.
+
+        Input :
+            itself (a contact registry)
+            a key (id_i, id_j, kind) (a tuple)
+        Output :
+            the contact (a contact)
+    """
+    return self.dict_contact[key[2]][(key[0], key[1])]
+
+#-------------------------------------------------------------------------------
+
+  def remove(self, key):
+    """
+    Remove a contact from the registry.
+
+        Input :
+            itself (a contact registry)
+            a key (id_i, id_j, kind) (a tuple)
+        Output :
+            the contact removed (a contact)
+    """
+    for id in self.L_id_grain(key):
+        self.dict_key_grain[id].pop(key, None)
+    return self.dict_contact[key[2]].pop((key[0], key[1]))
+
+#-------------------------------------------------------------------------------
+
+  def clear(self, kind):
+    """
+    Remove all the contacts of a kind from the registry.
+
+        Input :
+            itself (a contact registry)
+            a kind of contact (a string)
+        Output :
+            Nothing, but the contact registry is updated
+    """
+    for key in self.L_key(kind):
+        self.remove(key)
+
+#-------------------------------------------------------------------------------
+
+  def L_contact(self, kind):
+    """
+    Get the contacts of a kind, in the order of insertion.
+
+        Input :
+            itself (a contact registry)
+            a kind of contact (a string)
+        Output :
+            a list of contacts (a list)
+    """
+    return list(self.dict_contact[kind].values())
+
+#-------------------------------------------------------------------------------
+
+  def L_key(self, kind):
+    """
+    Get the keys of the contacts of a kind, in the order of insertion.
+
+        Input :
+            itself (a contact registry)
+            a kind of contact (a string)
+        Output :
+            a list of keys (id_i, id_j, kind) (a list)
+    """
+    return [(ij[0], ij[1], kind) for ij in self.dict_contact[kind]]
+
+#-------------------------------------------------------------------------------
+
+  def L_key_grain(self, id, kind):
+    """
+    Get the keys of the contacts of a kind involving a grain, in the order of insertion.
+
+        Input :
+            itself (a contact registry)
+            an id of grain (an int)
+            a kind of contact (a string)
+        Output :
+            a list of keys (id_i, id_j, kind) (a list)
+    """
+    return [key for key in self.dict_key_grain.get(id, {}) if key[2] == kind]
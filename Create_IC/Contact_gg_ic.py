@@ -47,6 +47,7 @@ class Contact_Tempo:
     self.coeff_restitution = dict_material['coeff_restitution']
     self.tangential_old_statut = False
     self.overlap_tangential = 0
+    self.overlap_normal = None
 
 #-------------------------------------------------------------------------------
 
@@ -73,11 +74,11 @@ class Contact_Tempo:
 
 #-------------------------------------------------------------------------------
 
-  def normal(self):
+  def geometry(self):
     """
-    Compute the normal reaction of a contact grain-grain.
+    Compute the geometry of the contact.
 
-    Here a pontual spring is considered.
+    The contact plane and the overlap are determined.
 
         Input :
             itself (a contact_tempo)
@@ -93,6 +94,26 @@ class Contact_Tempo:
     overlap = self.g1.radius + self.g2.radius - np.linalg.norm(self.g1.center - self.g2.center)
     self.overlap_normal = overlap
 
+#-------------------------------------------------------------------------------
+
+  def normal(self):
+    """
+    Compute the normal reaction of a contact grain-grain.
+
+    Here a pontual spring is considered.
+    The geometry of a contact between two sleeping grains is kept from the previous step (see geometry()).
+
+        Input :
+            itself (a contact_tempo)
+        Output :
+            Nothing, but attributes are updated
+    """
+    #a pair of sleeping grains has not moved, the geometry of the previous step is kept
+    if self.overlap_normal is None or not (self.g1.asleep and self.g2.asleep) :
+        self.geometry()
+    PC_normal = self.pc_normal
+    overlap = self.overlap_normal
+
     if overlap > 0:
     #-----------------------------------------------------------------------------
     # Compute the reaction
@@ -200,34 +221,11 @@ def Grains_contact_f(g1,g2):
 
 #-------------------------------------------------------------------------------
 
-def Update_Neighborhoods(dict_ic):
-    """
-    Determine a neighborhood for each grain.
-
-    This function is called every x time step. The contact is determined by Grains_contact_Neighborhoods().
-    Notice that if there is a potential contact between grain_i and grain_j, grain_i is not in the neighborhood of grain_j.
-    Whereas grain_j is in the neighborhood of grain_i. With i_grain < j_grain.
-
-        Input :
-            an initial condition dictionnary (a dict)
-        Output :
-            Nothing, but the neighborhood of the temporary grains is updated
-    """
-    for i_grain in range(len(dict_ic['L_g_tempo'])-1) :
-        neighborhood = []
-        for j_grain in range(i_grain+1,len(dict_ic['L_g_tempo'])):
-            if np.linalg.norm(dict_ic['L_g_tempo'][i_grain].center-dict_ic['L_g_tempo'][j_grain].center) < dict_ic['factor_neighborhood_IC']*(dict_ic['L_g_tempo'][i_grain].radius+dict_ic['L_g_tempo'][j_grain].radius):
-                neighborhood.append(dict_ic['L_g_tempo'][j_grain])
-        dict_ic['L_g_tempo'][i_grain].neighborhood = neighborhood
-
-
-#-------------------------------------------------------------------------------
-
 def Grains_contact_Neighborhoods(dict_ic,dict_material):
     """
     Detect contact between a grain and grains from its neighborhood.
 
-    The neighborhood is updated with Update_Neighborhoods().
+    The neighborhood is updated with Neighborhood.Update_Neighborhoods().
 
         Input :
             an initial condition dictionnary (a dict)
@@ -239,14 +237,15 @@ def Grains_contact_Neighborhoods(dict_ic,dict_material):
         grain_i = dict_ic['L_g_tempo'][i_grain]
         for neighbor in dict_ic['L_g_tempo'][i_grain].neighborhood:
             grain_j = neighbor
+            #a pair of sleeping grains has not moved, the contact is kept as it is
+            if grain_i.asleep and grain_j.asleep :
+                continue
             if Grains_contact_f(grain_i,grain_j):
-                if (grain_i.id, grain_j.id) not in dict_ic['L_contact_ij']:  #contact not detected previously
+                if (grain_i.id, grain_j.id, 'gg') not in dict_ic['contact_registry']:  #contact not detected previously
                    #creation of contact
-                   dict_ic['L_contact_ij'].append((grain_i.id, grain_j.id))
-                   dict_ic['L_contact'].append(Contact_Tempo(dict_ic['id_contact'], grain_i, grain_j, dict_material))
+                   dict_ic['contact_registry'].add((grain_i.id, grain_j.id, 'gg'), Contact_Tempo(dict_ic['id_contact'], grain_i, grain_j, dict_material))
                    dict_ic['id_contact'] = dict_ic['id_contact'] + 1
 
             else :
-                if (grain_i.id, grain_j.id) in dict_ic['L_contact_ij'] : #contact detected previously is not anymore
-                       dict_ic['L_contact'].pop(dict_ic['L_contact_ij'].index((grain_i.id, grain_j.id)))
-                       dict_ic['L_contact_ij'].remove((grain_i.id, grain_j.id))
+                if (grain_i.id, grain_j.id, 'gg') in dict_ic['contact_registry'] : #contact detected previously is not anymore
+                       dict_ic['contact_registry'].remove((grain_i.id, grain_j.id, 'gg'))
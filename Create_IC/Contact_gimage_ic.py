@@ -48,6 +48,7 @@ class Contact_Image:
     self.coeff_restitution = dict_material['coeff_restitution']
     self.tangential_old_statut = False
     self.overlap_tangential = 0
+    self.overlap_normal = None
 
 #-------------------------------------------------------------------------------
 
@@ -75,11 +76,11 @@ class Contact_Image:
 
 #-------------------------------------------------------------------------------
 
-  def normal(self):
+  def geometry(self):
     """
-    Compute the normal reaction of a contact grain-grain.
+    Compute the geometry of the contact.
 
-    Here a pontual spring is considered.
+    The contact plane and the overlap are determined.
 
         Input :
             itself (a contact_tempo)
@@ -95,6 +96,26 @@ class Contact_Image:
     overlap = self.g1.radius + self.g2.radius - np.linalg.norm(self.g1.center - self.g2.center)
     self.overlap_normal = overlap
 
+#-------------------------------------------------------------------------------
+
+  def normal(self):
+    """
+    Compute the normal reaction of a contact grain-grain.
+
+    Here a pontual spring is considered.
+    The geometry of a contact between two sleeping grains is kept from the previous step (see geometry()).
+
+        Input :
+            itself (a contact_tempo)
+        Output :
+            Nothing, but attributes are updated
+    """
+    #a pair of sleeping grains has not moved, the geometry of the previous step is kept
+    if self.overlap_normal is None or not (self.g1.asleep and self.g2.real.asleep) :
+        self.geometry()
+    PC_normal = self.pc_normal
+    overlap = self.overlap_normal
+
     if overlap > 0:
     #-----------------------------------------------------------------------------
     # Compute the reaction
@@ -198,33 +219,11 @@ def Grains_contact_f(g1,g2):
 
 #-------------------------------------------------------------------------------
 
-def Update_Neighborhoods(dict_ic):
-    """
-    Determine a neighborhood for each grain.
-
-    This function is called every x time step. The contact is determined by Grains_contact_Neighborhoods().
-    Notice that if there is a potential contact between grain_i and grain_j, grain_i is not in the neighborhood of grain_j.
-    Whereas grain_j is in the neighborhood of grain_i. With i_grain < j_grain.
-
-        Input :
-            an initial condition dictionnary (a dict)
-        Output :
-            Nothing, but the neighborhood of the temporary grains is updated
-    """
-    for grain in dict_ic['L_g_tempo'] :
-        neighborhood = []
-        for image in dict_ic['L_g_image']:
-            if np.linalg.norm(grain.center-image.center) < dict_ic['factor_neighborhood_IC']*(grain.radius+image.radius):
-                neighborhood.append(image)
-        grain.neighborhood_image = neighborhood
-
-#-------------------------------------------------------------------------------
-
 def Grains_contact_Neighborhoods(dict_ic,dict_material):
     """
     Detect contact between a grain and grains from its neighborhood.
 
-    The neighborhood is updated with Update_Neighborhoods().
+    The neighborhood is updated with Neighborhood.Update_Neighborhoods().
 
         Input :
             an initial condition dictionnary (a dict)
@@ -237,14 +236,15 @@ def Grains_contact_Neighborhoods(dict_ic,dict_material):
         for neighbor in grain.neighborhood_image:
             j_grain = neighbor.id
             image = neighbor
+            #a pair of sleeping grains has not moved, the contact is kept as it is
+            if grain.asleep and image.real.asleep :
+                continue
             if Grains_contact_f(grain,image):
-                if (grain.id, image.id) not in dict_ic['L_contact_ij_gimage']:  #contact not detected previously
+                if (grain.id, image.id, 'gimage') not in dict_ic['contact_registry']:  #contact not detected previously
                    #creation of contact
-                   dict_ic['L_contact_ij_gimage'].append((grain.id, image.id))
-                   dict_ic['L_contact_gimage'].append(Contact_Image(dict_ic['id_contact'], grain, image, dict_material))
+                   dict_ic['contact_registry'].add((grain.id, image.id, 'gimage'), Contact_Image(dict_ic['id_contact'], grain, image, dict_material))
                    dict_ic['id_contact'] = dict_ic['id_contact'] + 1
 
             else :
-                if (i_grain,j_grain) in dict_ic['L_contact_ij_gimage'] : #contact detected previously is not anymore
-                       dict_ic['L_contact_gimage'].pop(dict_ic['L_contact_ij_gimage'].index((grain.id, image.id)))
-                       dict_ic['L_contact_ij_gimage'].remove((grain.id, image.id))
+                if (grain.id, image.id, 'gimage') in dict_ic['contact_registry'] : #contact detected previously is not anymore
+                       dict_ic['contact_registry'].remove((grain.id, image.id, 'gimage'))
@@ -156,16 +156,17 @@ class Contact_gw_Tempo:
 #Function
 #-------------------------------------------------------------------------------
 
-def Update_wall_Neighborhoods(L_g_tempo,factor_neighborhood_IC,x_min,x_max,y_min,y_max):
+def Update_wall_Neighborhoods(L_g_tempo,factor_neighborhood_IC,skin,x_min,x_max,y_min,y_max):
     """
     Determine a neighborhood for wall.
 
-    This function is called every x time step. The grain - wall contact is determined by Grains_Polyhedral_Wall_contact_Neighborhood().
-    A factor determines the size of the neighborhood window.
+    This function is called when the neighborhoods of the grains are rebuilt or when the upper wall has moved more than the half of the skin distance. The grain - wall contact is determined by Grains_Polyhedral_Wall_contact_Neighborhood().
+    A factor and a skin distance determine the size of the neighborhood window.
 
         Input :
             a list of temporary grains (a list)
             a factor to determine the neighborhood window (a float)
+            a skin distance added to the neighborhood window (a float)
             the coordinates of the left, right, lower, upper walls (four floats)
         Output :
             a list of temporary grains in the neighborhood of the walls (a list)
@@ -179,10 +180,10 @@ def Update_wall_Neighborhoods(L_g_tempo,factor_neighborhood_IC,x_min,x_max,y_min
         p_y_max = grain.center[1] + grain.radius
 
         #grain-wall y_min
-        if abs(p_y_min-y_min) < factor_neighborhood_IC*grain.radius :
+        if abs(p_y_min-y_min) < factor_neighborhood_IC*grain.radius + skin :
             wall_neighborhood.append(grain)
         #grain-wall y_max
-        if abs(p_y_max-y_max) < factor_neighborhood_IC*grain.radius :
+        if abs(p_y_max-y_max) < factor_neighborhood_IC*grain.radius + skin :
             wall_neighborhood.append(grain)
 
     return wall_neighborhood
@@ -205,8 +206,7 @@ def Grains_Polyhedral_Wall_contact_Neighborhood(wall_neighborhood,x_box_min,x_bo
   """
   #-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-
   #load data needed
-  L_ij_contact_gw = dict_ic['L_contact_gw_ij']
-  L_contact_gw = dict_ic['L_contact_gw']
+  contact_registry = dict_ic['contact_registry']
   id_contact = dict_ic['id_contact']
   #-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-.-
 
@@ -218,33 +218,25 @@ def Grains_Polyhedral_Wall_contact_Neighborhood(wall_neighborhood,x_box_min,x_bo
       p_y_max = grain.center[1] + grain.radius
 
       #grain-wall y_min
-      if p_y_min < y_box_min and (grain.id,-3) not in L_ij_contact_gw:
+      if p_y_min < y_box_min and (grain.id,-3,'gw') not in contact_registry:
           overlap = y_box_min - p_y_min
-          L_contact_gw.append(Contact_gw_Tempo(id_contact, grain, dict_material, 'gwy_min', y_box_min, overlap))
-          L_ij_contact_gw.append((grain.id,-3))
+          contact_registry.add((grain.id,-3,'gw'), Contact_gw_Tempo(id_contact, grain, dict_material, 'gwy_min', y_box_min, overlap))
           id_contact = id_contact + 1
-      elif p_y_min < y_box_min and (grain.id,-3) in L_ij_contact_gw:
+      elif p_y_min < y_box_min and (grain.id,-3,'gw') in contact_registry:
           overlap = y_box_min - p_y_min
-          L_contact_gw[L_ij_contact_gw.index((grain.id,-3))].update_overlap(overlap)
-      elif p_y_min > y_box_min and (grain.id,-3) in L_ij_contact_gw:
-          i_contact = L_ij_contact_gw.index((grain.id,-3))
-          L_contact_gw.pop(i_contact)
-          L_ij_contact_gw.pop(i_contact)
+          contact_registry.get((grain.id,-3,'gw')).update_overlap(overlap)
+      elif p_y_min > y_box_min and (grain.id,-3,'gw') in contact_registry:
+          contact_registry.remove((grain.id,-3,'gw'))
       #grain-wall y_max
-      if p_y_max > y_box_max and (grain.id,-4) not in L_ij_contact_gw:
+      if p_y_max > y_box_max and (grain.id,-4,'gw') not in contact_registry:
           overlap = p_y_max - y_box_max
-          L_contact_gw.append(Contact_gw_Tempo(id_contact, grain, dict_material, 'gwy_max', y_box_max, overlap))
-          L_ij_contact_gw.append((grain.id,-4))
+          contact_registry.add((grain.id,-4,'gw'), Contact_gw_Tempo(id_contact, grain, dict_material, 'gwy_max', y_box_max, overlap))
           id_contact = id_contact + 1
-      elif p_y_max > y_box_max and (grain.id,-4) in L_ij_contact_gw:
+      elif p_y_max > y_box_max and (grain.id,-4,'gw') in contact_registry:
           overlap = p_y_max - y_box_max
-          L_contact_gw[L_ij_contact_gw.index((grain.id,-4))].update_overlap(overlap)
-      elif p_y_max < y_box_max and (grain.id,-4) in L_ij_contact_gw:
-          i_contact = L_ij_contact_gw.index((grain.id,-4))
-          L_contact_gw.pop(i_contact)
-          L_ij_contact_gw.pop(i_contact)
+          contact_registry.get((grain.id,-4,'gw')).update_overlap(overlap)
+      elif p_y_max < y_box_max and (grain.id,-4,'gw') in contact_registry:
+          contact_registry.remove((grain.id,-4,'gw'))
 
       #Update dict
-      dict_ic['L_contact_gw_ij'] = L_ij_contact_gw
-      dict_ic['L_contact_gw'] = L_contact_gw
       dict_ic['id_contact'] = id_contact
@@ -55,6 +55,7 @@ class Grain_Tempo:
     self.group = 'Current'
     self.image = None
     self.radius = Radius
+    self.r_max = Radius
     self.theta = 0
     self.rho_surf = dict_material['rho_surf']
     self.surface = math.pi*Radius**2
@@ -73,6 +74,9 @@ class Grain_Tempo:
     self.v = np.array([0,0])
     self.w = 0
     self.track_u = False
+    #the grain is awake (see Sleep.Sleep_Manager)
+    self.asleep = False
+    self.n_quiet = 0
 
 #-------------------------------------------------------------------------------
 
@@ -215,6 +219,7 @@ class Grain_Image(Grain_Tempo):
     self.position = position
     self.group = real_grain.group
     self.radius = real_grain.radius
+    self.r_max = real_grain.radius
     self.theta = real_grain.theta
     self.rho_surf = real_grain.rho_surf
     self.surface = real_grain.surface
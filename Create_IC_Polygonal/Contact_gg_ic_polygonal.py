@@ -47,6 +47,7 @@ class Contact_Tempo_Polygonal:
     self.coeff_restitution = dict_material['coeff_restitution']
     self.tangential_old_statut = False
     self.overlap_tangential = 0
+    self.ij_min = None
 
 #-------------------------------------------------------------------------------
 
@@ -73,11 +74,11 @@ class Contact_Tempo_Polygonal:
 
 #-------------------------------------------------------------------------------
 
-  def normal(self):
+  def geometry(self):
     """
-    Compute the normal reaction of a contact grain-grain.
+    Compute the geometry of the contact.
 
-    Here a pontual spring is considered.
+    The nearest vertices, the contact plane and the overlap are determined.
 
         Input :
             itself (a contact_tempo)
@@ -184,6 +185,27 @@ class Contact_Tempo_Polygonal:
     overlap = d_b - d_a
     self.overlap_normal = overlap
 
+#-------------------------------------------------------------------------------
+
+  def normal(self):
+    """
+    Compute the normal reaction of a contact grain-grain.
+
+    Here a pontual spring is considered.
+    The geometry of a contact between two sleeping grains is kept from the previous step (see geometry()).
+
+        Input :
+            itself (a contact_tempo)
+        Output :
+            Nothing, but attributes are updated
+    """
+    #a pair of sleeping grains has not moved, the geometry of the previous step is kept
+    if self.ij_min is None or not (self.g1.asleep and self.g2.asleep) :
+        self.geometry()
+    ij_min = self.ij_min
+    PC_normal = self.pc_normal
+    overlap = self.overlap_normal
+
     if overlap > 0:
     #-----------------------------------------------------------------------------
     # Compute the reaction
@@ -324,33 +346,11 @@ def Grains_Polyhedral_contact_f(g1,g2):
 
 #-------------------------------------------------------------------------------
 
-def Update_Neighborhoods(dict_ic):
-    """
-    Determine a neighborhood for each grain.
-
-    This function is called every x time step. The contact is determined by Grains_contact_Neighborhoods().
-    Notice that if there is a potential contact between grain_i and grain_j, grain_i is not in the neighborhood of grain_j.
-    Whereas grain_j is in the neighborhood of grain_i. With i_grain < j_grain.
-
-        Input :
-            an initial condition dictionnary (a dict)
-        Output :
-            Nothing, but the neighborhood of the temporary grains is updated
-    """
-    for i_grain in range(len(dict_ic['L_g_tempo'])-1) :
-        neighborhood = []
-        for j_grain in range(i_grain+1,len(dict_ic['L_g_tempo'])):
-            if np.linalg.norm(dict_ic['L_g_tempo'][i_grain].center-dict_ic['L_g_tempo'][j_grain].center) < dict_ic['factor_neighborhood_IC']*(dict_ic['L_g_tempo'][i_grain].r_max+dict_ic['L_g_tempo'][j_grain].r_max):
-                neighborhood.append(dict_ic['L_g_tempo'][j_grain])
-        dict_ic['L_g_tempo'][i_grain].neighborhood = neighborhood
-
-#-------------------------------------------------------------------------------
-
 def Grains_contact_Neighborhoods(dict_ic,dict_material):
     """
     Detect contact between a grain and grains from its neighborhood.
 
-    The neighborhood is updated with Update_neighborhoods().
+    The neighborhood is updated with Neighborhood.Update_Neighborhoods().
 
         Input :
             an initial condition dictionnary (a dict)
@@ -362,17 +362,18 @@ def Grains_contact_Neighborhoods(dict_ic,dict_material):
         grain_i = dict_ic['L_g_tempo'][i_grain]
         for neighbour in dict_ic['L_g_tempo'][i_grain].neighborhood:
             grain_j = neighbour
+            #a pair of sleeping grains has not moved, the contact is kept as it is
+            if grain_i.asleep and grain_j.asleep :
+                continue
             if Grains_Polyhedral_contact_f(grain_i,grain_j):
-                if (grain_i.id, grain_j.id) not in dict_ic['L_contact_ij']:  #contact not detected previously
+                if (grain_i.id, grain_j.id, 'gg') not in dict_ic['contact_registry']:  #contact not detected previously
                    #creation of contact
-                   dict_ic['L_contact_ij'].append((grain_i.id, grain_j.id))
-                   dict_ic['L_contact'].append(Contact_Tempo_Polygonal(dict_ic['id_contact'], grain_i, grain_j, dict_material))
+                   dict_ic['contact_registry'].add((grain_i.id, grain_j.id, 'gg'), Contact_Tempo_Polygonal(dict_ic['id_contact'], grain_i, grain_j, dict_material))
                    dict_ic['id_contact'] = dict_ic['id_contact'] + 1
 
             else :
-                if (grain_i.id, grain_j.id) in dict_ic['L_contact_ij'] : #contact detected previously is not anymore
-                       dict_ic['L_contact'].pop(dict_ic['L_contact_ij'].index((grain_i.id, grain_j.id)))
-                       dict_ic['L_contact_ij'].remove((grain_i.id, grain_j.id))
+                if (grain_i.id, grain_j.id, 'gg') in dict_ic['contact_registry'] : #contact detected previously is not anymore
+                       dict_ic['contact_registry'].remove((grain_i.id, grain_j.id, 'gg'))
 
 #-------------------------------------------------------------------------------
 
@@ -393,30 +394,19 @@ def extract_vertices(g, angle_g_to_other_g) :
     angle_plus  = angle_g_to_other_g + dtheta/2
     if 2*math.pi <= angle_plus :
         angle_plus = angle_plus - 2*math.pi
-    i_minus = find_value_in_list(g.l_theta_r.copy(), angle_minus)
-    i_plus = i_minus + find_value_in_list(g.l_theta_r[i_minus:].copy() + g.l_theta_r[:i_minus].copy(), angle_plus)
+    i_minus = g.i_nearest_theta_r(angle_minus)
+    i_plus = g.i_nearest_theta_r(angle_plus)
+    #the window is counted from i_minus
+    n_vertices = len(g.l_theta_r_body)
+    if i_plus < i_minus :
+        i_plus = i_plus + n_vertices
 
     L_i_vertices = []
     for i in range(i_minus, i_plus+1):
-        if i < len(g.l_theta_r):
+        if i < n_vertices:
             L_i_vertices.append(i)
         else :
-            L_i_vertices.append(i-len(g.l_theta_r))
+            L_i_vertices.append(i-n_vertices)
     return L_i_vertices
 
 #-------------------------------------------------------------------------------
-
-def find_value_in_list(List_to_search, value_to_find) :
-    """
-    Extract the index of the nearest value from a target in a list.
-
-        Input :
-            a list of float (a list)
-            a target (a float)
-        Output :
-            an index (an int)
-    """
-    L_search = list(abs(np.array(List_to_search)-value_to_find))
-    return L_search.index(min(L_search))
-
-#-------------------------------------------------------------------------------
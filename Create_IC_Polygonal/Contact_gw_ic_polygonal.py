@@ -156,16 +156,17 @@ class Contact_gw_Tempo_Polygonal:
 #Function
 #-------------------------------------------------------------------------------
 
-def Update_wall_Neighborhoods(L_g_tempo,factor_neighborhood_IC,x_min,x_max,y_min,y_max):
+def Update_wall_Neighborhoods(L_g_tempo,factor_neighborhood_IC,skin,x_min,x_max,y_min,y_max):
     """
     Determine a neighborhood for wall.
 
-    This function is called every x time step. The grain - wall contact is determined by Grains_Polyhedral_Wall_contact_Neighborhood().
-    A factor determines the size of the neighborhood window.
+    This function is called when the neighborhoods of the grains are rebuilt or when the upper wall has moved more than the half of the skin distance. The grain - wall contact is determined by Grains_Polyhedral_Wall_contact_Neighborhood().
+    A factor and a skin distance determine the size of the neighborhood window.
 
         Input :
             a list of temporary grains (a list)
             a factor to determine the neighborhood window (a float)
+            a skin distance added to the neighborhood window (a float)
             the coordinates of the left, right, lower, upper walls (four floats)
         Output :
             a list of temporary grains in the neighborhood of the walls (a list)
@@ -179,10 +180,10 @@ def Update_wall_Neighborhoods(L_g_tempo,factor_neighborhood_IC,x_min,x_max,y_min
         p_y_max = max(grain.l_border_y)
 
         #grain-wall y_min
-        if abs(p_y_min-y_min) < factor_neighborhood_IC*grain.r_max :
+        if abs(p_y_min-y_min) < factor_neighborhood_IC*grain.r_max + skin :
             wall_neighborhood.append(grain)
         #grain-wall y_max
-        if abs(p_y_max-y_max) < factor_neighborhood_IC*grain.r_max :
+        if abs(p_y_max-y_max) < factor_neighborhood_IC*grain.r_max + skin :
             wall_neighborhood.append(grain)
 
     return wall_neighborhood
@@ -211,28 +212,22 @@ def Grains_Polyhedral_Wall_contact_Neighborhood(wall_neighborhood,x_box_min,x_bo
       p_y_max = max(grain.l_border_y)
 
       #grain-wall y_min
-      if p_y_min < y_box_min and (grain.id,-3) not in dict_ic['L_contact_gw_ij']:
+      if p_y_min < y_box_min and (grain.id,-3,'gw') not in dict_ic['contact_registry']:
           overlap = y_box_min - p_y_min
-          dict_ic['L_contact_gw'].append(Contact_gw_Tempo_Polygonal(dict_ic['id_contact'], grain, dict_material, 'gwy_min', y_box_min, overlap))
-          dict_ic['L_contact_gw_ij'].append((grain.id,-3))
+          dict_ic['contact_registry'].add((grain.id,-3,'gw'), Contact_gw_Tempo_Polygonal(dict_ic['id_contact'], grain, dict_material, 'gwy_min', y_box_min, overlap))
           dict_ic['id_contact'] = dict_ic['id_contact'] + 1
-      elif p_y_min < y_box_min and (grain.id,-3) in dict_ic['L_contact_gw_ij']:
+      elif p_y_min < y_box_min and (grain.id,-3,'gw') in dict_ic['contact_registry']:
           overlap = y_box_min - p_y_min
-          dict_ic['L_contact_gw'][dict_ic['L_contact_gw_ij'].index((grain.id,-3))].update_overlap(overlap)
-      elif p_y_min > y_box_min and (grain.id,-3) in dict_ic['L_contact_gw_ij']:
-          i_contact = dict_ic['L_contact_gw_ij'].index((grain.id,-3))
-          dict_ic['L_contact_gw'].pop(i_contact)
-          dict_ic['L_contact_gw_ij'].pop(i_contact)
+          dict_ic['contact_registry'].get((grain.id,-3,'gw')).update_overlap(overlap)
+      elif p_y_min > y_box_min and (grain.id,-3,'gw') in dict_ic['contact_registry']:
+          dict_ic['contact_registry'].remove((grain.id,-3,'gw'))
       #grain-wall y_max
-      if p_y_max > y_box_max and (grain.id,-4) not in dict_ic['L_contact_gw_ij']:
+      if p_y_max > y_box_max and (grain.id,-4,'gw') not in dict_ic['contact_registry']:
           overlap = p_y_max - y_box_max
-          dict_ic['L_contact_gw'].append(Contact_gw_Tempo_Polygonal(dict_ic['id_contact'], grain, dict_material, 'gwy_max', y_box_max, overlap))
-          dict_ic['L_contact_gw_ij'].append((grain.id,-4))
+          dict_ic['contact_registry'].add((grain.id,-4,'gw'), Contact_gw_Tempo_Polygonal(dict_ic['id_contact'], grain, dict_material, 'gwy_max', y_box_max, overlap))
           dict_ic['id_contact'] = dict_ic['id_contact'] + 1
-      elif p_y_max > y_box_max and (grain.id,-4) in dict_ic['L_contact_gw_ij']:
+      elif p_y_max > y_box_max and (grain.id,-4,'gw') in dict_ic['contact_registry']:
           overlap = p_y_max - y_box_max
-          dict_ic['L_contact_gw'][dict_ic['L_contact_gw_ij'].index((grain.id,-4))].update_overlap(overlap)
-      elif p_y_max < y_box_max and (grain.id,-4) in dict_ic['L_contact_gw_ij']:
-          i_contact = dict_ic['L_contact_gw_ij'].index((grain.id,-4))
-          dict_ic['L_contact_gw'].pop(i_contact)
-          dict_ic['L_contact_gw_ij'].pop(i_contact)
+          dict_ic['contact_registry'].get((grain.id,-4,'gw')).update_overlap(overlap)
+      elif p_y_max < y_box_max and (grain.id,-4,'gw') in dict_ic['contact_registry']:
+          dict_ic['contact_registry'].remove((grain.id,-4,'gw'))
@@ -20,8 +20,47 @@ import numpy as np
 class Grain_Tempo_Polygonal:
   """
   A temporary grain used to generated an initial condition.
+
+  The vertices are stored once in the body frame, the vertices in the world frame are computed from the center and the rotation only when needed.
   """
 
+  @property
+  def l_border(self):
+    """
+    The vertices in the world frame (a (n_vertices+1) x 2 numpy array).
+    """
+    key = (self.center[0], self.center[1], self.theta)
+    if self.key_l_border != key :
+        Rot_Matrix = np.array([[math.cos(self.theta), -math.sin(self.theta)],
+                               [math.sin(self.theta),  math.cos(self.theta)]])
+        self.l_border_world = np.matmul(self.l_border_body, Rot_Matrix.T) + self.center
+        self.key_l_border = key
+    return self.l_border_world
+
+  @property
+  def l_border_x(self):
+    """
+    The x coordinates of the vertices (a list).
+    """
+    return list(self.l_border[:,0])
+
+  @property
+  def l_border_y(self):
+    """
+    The y coordinates of the vertices (a list).
+    """
+    return list(self.l_border[:,1])
+
+  @property
+  def l_theta_r(self):
+    """
+    The angles of the vertices in the world frame (a list).
+    """
+    if self.key_l_theta_r != self.theta :
+        self.l_theta_r_world = list(np.mod(self.l_theta_r_body + self.theta, 2*math.pi))
+        self.key_l_theta_r = self.theta
+    return self.l_theta_r_world
+
 #-------------------------------------------------------------------------------
 
   def __init__(self, grain_sphere, n_border):
@@ -34,22 +73,16 @@ class Grain_Tempo_Polygonal:
             a grain tempo polygonal (a tempo polygonal grain)
     """
     L_border = []
-    L_border_x = []
-    L_border_y = []
     L_r = []
     L_theta_r = []
-    #Build the border (for print)
+    #Build the border in the body frame
     for i in range(n_border):
         theta = 2*math.pi*i/n_border
-        p = np.array(grain_sphere.center) + np.array([grain_sphere.radius*math.cos(theta),grain_sphere.radius*math.sin(theta)])
+        p = np.array([grain_sphere.radius*math.cos(theta),grain_sphere.radius*math.sin(theta)])
         L_border.append(p)
-        L_border_x.append(p[0])
-        L_border_y.append(p[1])
         L_r.append(grain_sphere.radius)
         L_theta_r.append(theta)
     L_border.append(L_border[0])
-    L_border_x.append(L_border_x[0])
-    L_border_y.append(L_border_y[0])
     #save
     self.group = 'Current'
     self.image = None
@@ -63,11 +96,11 @@ class Grain_Tempo_Polygonal:
     self.inertia = self.mass*grain_sphere.radius**2
     self.id = grain_sphere.id
     self.center = np.array(grain_sphere.center)
-    self.l_border = L_border
-    self.l_border_x = L_border_x
-    self.l_border_y = L_border_y
+    self.l_border_body = np.array(L_border)
+    self.key_l_border = None
     self.l_r = L_r
-    self.l_theta_r = L_theta_r
+    self.l_theta_r_body = np.array(L_theta_r)
+    self.key_l_theta_r = None
     self.y = grain_sphere.y
     self.nu = grain_sphere.nu
     self.g = grain_sphere.g #shear modulus
@@ -76,6 +109,9 @@ class Grain_Tempo_Polygonal:
     self.v = np.array([0,0])
     self.w = 0
     self.track_u = False
+    #the grain is awake (see Sleep.Sleep_Manager)
+    self.asleep = False
+    self.n_quiet = 0
 
 #-------------------------------------------------------------------------------
 
@@ -132,10 +168,6 @@ class Grain_Tempo_Polygonal:
     self.v = self.v + a_i*dt_DEM
     if np.linalg.norm(self.v) > self.radius*factor/dt_DEM: #limitation of the speed
         self.v = self.v * self.radius*factor/dt_DEM/np.linalg.norm(self.v)
-    for i in range(len(self.l_border)):
-        self.l_border[i] = self.l_border[i] + self.v*dt_DEM
-        self.l_border_x[i] = self.l_border_x[i] + self.v[0]*dt_DEM
-        self.l_border_y[i] = self.l_border_y[i] + self.v[1]*dt_DEM
     self.center = self.center + self.v*dt_DEM
     if self.track_u :
         self.total_ux = self.total_ux + self.v[0]*dt_DEM
@@ -146,24 +178,6 @@ class Grain_Tempo_Polygonal:
     self.w = self.w + dw_i*dt_DEM
     self.theta = self.theta + self.w*dt_DEM
 
-    for i_theta_r in range(len(self.l_theta_r)) :
-        theta_r = self.l_theta_r[i_theta_r]
-        theta_r = theta_r + self.w*dt_DEM
-        while theta_r >= 2*math.pi:
-            theta_r = theta_r - 2*math.pi
-        while theta_r < 0 :
-            theta_r = theta_r + 2*math.pi
-        self.l_theta_r[i_theta_r] = theta_r
-
-    for i in range(len(self.l_border)):
-        p = self.l_border[i] - self.center
-        Rot_Matrix = np.array([[math.cos(self.w*dt_DEM), -math.sin(self.w*dt_DEM)],
-                               [math.sin(self.w*dt_DEM),  math.cos(self.w*dt_DEM)]])
-        p = np.dot(Rot_Matrix,p)
-        self.l_border[i] = p + self.center
-        self.l_border_x[i] = p[0] + self.center[0]
-        self.l_border_y[i] = p[1] + self.center[1]
-
 #-------------------------------------------------------------------------------
 
   def move_as_a_group(self, U, dt_DEM):
@@ -178,10 +192,6 @@ class Grain_Tempo_Polygonal:
     """
     #translation
     self.v = np.array([U[0]/dt_DEM, U[1]/dt_DEM])
-    for i in range(len(self.l_border)):
-        self.l_border[i] = self.l_border[i] + U
-        self.l_border_x[i] = self.l_border_x[i] + U[0]
-        self.l_border_y[i] = self.l_border_y[i] + U[1]
     self.center = self.center + U
     if self.track_u :
         self.total_ux = self.total_ux + U[0]
@@ -213,6 +223,33 @@ class Grain_Tempo_Polygonal:
       else :
           return False
 
+#-------------------------------------------------------------------------------
+
+  def i_nearest_theta_r(self, angle):
+    """
+    Find the vertex with the nearest angle (in the world frame) from a target.
+
+    The vertices are uniformly distributed in the body frame, then the target is located by index arithmetic. Only the vertices around are compared.
+    It is the same as looking for the minimum of abs(l_theta_r - angle).
+
+        Input :
+            itself (a grain_tempo)
+            an angle in the world frame, between 0 and 2 pi (a float)
+        Output :
+            an index of vertex (an int)
+    """
+    n_vertices = len(self.l_theta_r_body)
+    i_body = int(((angle - self.theta) % (2*math.pi))/(2*math.pi/n_vertices)) + 1
+    #the nearest angle is one of the neighbors (the mod 2 pi can swap the order near 0)
+    i_nearest = None
+    for i in range(i_body-2, i_body+2):
+        i = i % n_vertices
+        d = abs((self.l_theta_r_body[i] + self.theta) % (2*math.pi) - angle)
+        if i_nearest is None or d < d_nearest or (d == d_nearest and i < i_nearest):
+            i_nearest = i
+            d_nearest = d
+    return i_nearest
+
 #-------------------------------------------------------------------------------
 
 class Grain_Image_Polygonal(Grain_Tempo_Polygonal):
@@ -245,11 +282,12 @@ class Grain_Image_Polygonal(Grain_Tempo_Polygonal):
     self.inertia = real_grain.inertia
     self.id = real_grain.id
     self.center = np.array(real_grain.center.copy())
-    self.l_border = real_grain.l_border.copy()
-    self.l_border_x = real_grain.l_border_x.copy()
-    self.l_border_y = real_grain.l_border_y.copy()
-    self.l_r = real_grain.l_r.copy()
-    self.l_theta_r = real_grain.l_theta_r.copy()
+    #the body frame is shared with the real grain
+    self.l_border_body = real_grain.l_border_body
+    self.key_l_border = None
+    self.l_r = real_grain.l_r
+    self.l_theta_r_body = real_grain.l_theta_r_body
+    self.key_l_theta_r = None
     self.y = real_grain.y
     self.nu = real_grain.nu
     self.g = real_grain.g
@@ -270,16 +308,7 @@ class Grain_Image_Polygonal(Grain_Tempo_Polygonal):
             Nothing, but an image grain is generated (a grain_image)
     """
     self.center = self.real.center.copy() + U
-    self.l_border = []
-    self.l_border_x = []
-    self.l_border_y = []
-    for i in range(len(self.real.l_border)):
-        self.l_border.append(self.real.l_border[i].copy() + U)
-        self.l_border_x.append(self.real.l_border[i][0] + U[0])
-        self.l_border_y.append(self.real.l_border[i][1] + U[1])
     #update data
     self.v = self.real.v.copy()
     self.w = self.real.w
     self.theta = self.real.theta
-    self.l_r = self.real.l_r.copy()
-    self.l_theta_r = self.real.l_theta_r.copy()
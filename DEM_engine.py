@@ -0,0 +1,1621 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the DEM engine shared by the initial condition generation, the confinement and the shear.
+It also contains the components used with the grains of the grain store (confinement and shear) and the components used with the temporary grains (initial condition, disks or polygons).
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import math
+
+#Own
+import Contact_gg
+import Contact_batch
+
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class DEM_Engine:
+  """
+  The DEM loop.
+
+  An iteration is :
+      - the boundary conditions before the contact detection (see Boundary.before_detection())
+      - the contact detection (see contact_law.detection()) and the boundary conditions detection (see Boundary.detection())
+      - the computation of the reactions (see contact_law.reactions())
+      - the measure of the loading (see Controller.measure())
+      - the motion of the grains (see integrator.move())
+      - the boundary conditions after the motion (see Boundary.after_motion())
+      - the control of the loading (see Controller.control())
+      - the trackers (see tracker.track())
+  The loop stops when one of the stop criteria is verified (see stop.stop()).
+
+  All the components are pluggable, they get the engine as input to read the iteration, the time step and the results of the previous components.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, i_DEM, dt_DEM, contact_law, integrator, L_boundary, L_controller, L_tracker, L_stop):
+    """
+    Defining the DEM engine.
+
+        Input :
+            itself (a DEM engine)
+            the iteration at the start (an int)
+            the time step at the start (a float)
+            a contact law (a contact law)
+            an integrator (an integrator)
+            a list of boundary conditions (a list)
+            a list of loading controllers, in the order of application (a list)
+            a list of trackers (a list)
+            a list of stop criteria (a list)
+        Output :
+            Nothing, but the DEM engine is generated (a DEM engine)
+    """
+    self.i_DEM = i_DEM
+    self.dt_DEM = dt_DEM
+    self.contact_law = contact_law
+    self.integrator = integrator
+    self.L_boundary = L_boundary
+    self.L_controller = L_controller
+    self.L_tracker = L_tracker
+    self.L_stop = L_stop
+    self.neighborhoods_updated = False
+    self.dt_contact = math.inf
+
+#-------------------------------------------------------------------------------
+
+  def step(self):
+    """
+    Compute one iteration.
+
+        Input :
+            itself (a DEM engine)
+        Output :
+            Nothing, but the grains and the components are updated
+    """
+    self.i_DEM = self.i_DEM + 1
+
+    #Contact detection
+    for boundary in self.L_boundary:
+        boundary.before_detection(self)
+    self.neighborhoods_updated = self.contact_law.detection(self)
+    for boundary in self.L_boundary:
+        boundary.detection(self)
+
+    #Sollicitation computation
+    self.dt_contact = self.contact_law.reactions(self)
+    for controller in self.L_controller:
+        controller.measure(self)
+
+    #Move grains
+    self.integrator.move(self)
+    for boundary in self.L_boundary:
+        boundary.after_motion(self)
+
+    #Control the loading
+    for controller in self.L_controller:
+        controller.control(self)
+
+    #tracker
+    for tracker in self.L_tracker:
+        tracker.track(self)
+
+#-------------------------------------------------------------------------------
+
+  def run(self):
+    """
+    Compute iterations until a stop criterion is verified.
+
+        Input :
+            itself (a DEM engine)
+        Output :
+            Nothing, but the grains and the components are updated
+    """
+    DEM_loop_statut = True
+    while DEM_loop_statut :
+        self.step()
+        #Check stop conditions for DEM
+        for stop in self.L_stop:
+            if stop.stop(self):
+                DEM_loop_statut = False
+
+#-------------------------------------------------------------------------------
+
+class Boundary:
+  """
+  A boundary condition, nothing is done by default.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def before_detection(self, engine):
+    """
+    Apply the boundary condition before the contact detection.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing
+    """
+    pass
+
+#-------------------------------------------------------------------------------
+
+  def detection(self, engine):
+    """
+    Detect the contacts with the boundary.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing
+    """
+    pass
+
+#-------------------------------------------------------------------------------
+
+  def after_motion(self, engine):
+    """
+    Apply the boundary condition after the motion of the grains.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing
+    """
+    pass
+
+#-------------------------------------------------------------------------------
+
+class Controller:
+  """
+  A loading controller, nothing is done by default.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def measure(self, engine):
+    """
+    Measure the loading once the reactions are computed.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing
+    """
+    pass
+
+#-------------------------------------------------------------------------------
+
+  def control(self, engine):
+    """
+    Control the loading once the grains are moved.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing
+    """
+    pass
+
+#-------------------------------------------------------------------------------
+#Contact law and integrator (grain store)
+#-------------------------------------------------------------------------------
+
+class Contact_Law_Store:
+  """
+  The contact law between the grains of the grain store.
+
+  The contacts are detected in the neighborhoods (see Contact_gg.Grains_contact_Neighborhoods()) and the reactions are computed in one vectorized pass (see Contact_batch.Compute_reactions()).
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, dict_material, dict_sample, dict_sollicitations, verlet_list):
+    """
+    Defining the contact law.
+
+        Input :
+            itself (a contact law)
+            an algorithm dictionnary (a dict)
+            a material dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a sollicitations dictionnary (a dict)
+            a Verlet list (a verlet list)
+        Output :
+            Nothing, but the contact law is generated (a contact law)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.dict_material = dict_material
+    self.dict_sample = dict_sample
+    self.dict_sollicitations = dict_sollicitations
+    self.verlet_list = verlet_list
+    self.L_contact = []
+
+#-------------------------------------------------------------------------------
+
+  def detection(self, engine):
+    """
+    Detect the contacts.
+
+        Input :
+            itself (a contact law)
+            the DEM engine (a DEM engine)
+        Output :
+            a Boolean, True if the neighborhoods have been rebuilt (a Boolean)
+    """
+    neighborhoods_updated = self.verlet_list.update(self.dict_sample['L_g'], [])
+    Contact_gg.Grains_contact_Neighborhoods(self.dict_algorithm, self.dict_sample, self.dict_material)
+    return neighborhoods_updated
+
+#-------------------------------------------------------------------------------
+
+  def reactions(self, engine):
+    """
+    Compute the forces applied on the grains.
+
+        Input :
+            itself (a contact law)
+            the DEM engine (a DEM engine)
+        Output :
+            the stable time step of the contacts (a float)
+    """
+    self.dict_sample['grain_store'].init_F_control(self.dict_sollicitations['gravity'])
+    #there is no contact inside the top and bottom clumps
+    self.L_contact = self.dict_sample['contact_registry'].L_contact('gg')
+    return Contact_batch.Compute_reactions(self.L_contact, engine.dt_DEM, self.dict_algorithm['narrow_phase'])
+
+#-------------------------------------------------------------------------------
+
+class Integrator_Store:
+  """
+  A semi implicit euler scheme applied on grains of the grain store.
+
+  The sleeping grains are not moved (see Sleep.Sleep_Manager).
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, grain_store, L_g, sleep_manager):
+    """
+    Defining the integrator.
+
+        Input :
+            itself (an integrator)
+            a grain store (a grain store)
+            a list of the grains to move (a list)
+            a sleep manager, None if the grains do not sleep (a sleep_manager)
+        Output :
+            Nothing, but the integrator is generated (an integrator)
+    """
+    self.grain_store = grain_store
+    self.L_g = L_g
+    self.L_i_grain = [grain.i_store for grain in L_g]
+    self.sleep_manager = sleep_manager
+
+#-------------------------------------------------------------------------------
+
+  def move(self, engine):
+    """
+    Move the grains.
+
+        Input :
+            itself (an integrator)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the grains are moved
+    """
+    #Put to sleep or wake up the quiescent grains
+    if self.sleep_manager != None :
+        self.sleep_manager.update(self.L_g)
+        L_i_awake = [grain.i_store for grain in self.L_g if not grain.asleep]
+    else :
+        L_i_awake = self.L_i_grain
+    self.grain_store.euler_semi_implicite(L_i_awake, engine.dt_DEM)
+
+#-------------------------------------------------------------------------------
+#Boundary conditions (grain store)
+#-------------------------------------------------------------------------------
+
+class Periodic_Minimum_Image(Boundary):
+  """
+  The periodic condition along the x axis with the minimum image convention.
+
+  A grain crossing a limit of the box comes back from the other limit, the contacts are kept (see Neighborhood.Minimum_image_offset()).
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_sample, L_g):
+    """
+    Defining the periodic condition.
+
+        Input :
+            itself (a boundary)
+            a sample dictionnary (a dict)
+            a list of the grains crossing the limits (a list)
+        Output :
+            Nothing, but the boundary is generated (a boundary)
+    """
+    self.dict_sample = dict_sample
+    self.L_g = L_g
+
+#-------------------------------------------------------------------------------
+
+  def after_motion(self, engine):
+    """
+    Apply the periodic condition.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the grains are moved
+    """
+    for grain in self.L_g:
+        #left wall
+        if grain.center[0] < self.dict_sample['x_box_min'] :
+            grain.center = grain.center.copy() + np.array([self.dict_sample['x_box_max'] - self.dict_sample['x_box_min'], 0])
+        #right wall
+        elif grain.center[0] > self.dict_sample['x_box_max'] :
+            grain.center = grain.center.copy() + np.array([self.dict_sample['x_box_min'] - self.dict_sample['x_box_max'], 0])
+
+#-------------------------------------------------------------------------------
+
+class Lees_Edwards(Boundary):
+  """
+  The Lees-Edwards periodic conditions.
+
+  A grain crossing the upper (resp. lower) limit of the cell comes back from the lower (resp. upper) limit, shifted by -x_LE (resp. x_LE) and with a velocity shifted by -v_LE (resp. v_LE). Then, the x periodic condition is applied.
+  The grains crossing the y limits are saved in L_id_crossed_y, the list must be emptied by the user.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_sample, L_g):
+    """
+    Defining the Lees-Edwards conditions.
+
+        Input :
+            itself (a boundary)
+            a sample dictionnary (a dict)
+            a list of the grains crossing the limits (a list)
+        Output :
+            Nothing, but the boundary is generated (a boundary)
+    """
+    self.dict_sample = dict_sample
+    self.L_g = L_g
+    self.L_id_crossed_y = []
+
+#-------------------------------------------------------------------------------
+
+  def after_motion(self, engine):
+    """
+    Apply the Lees-Edwards conditions.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the grains are moved
+    """
+    dict_lees_edwards = self.dict_sample['dict_lees_edwards']
+    H = self.dict_sample['y_box_max'] - self.dict_sample['y_box_min']
+    for grain in self.L_g:
+        #upper limit
+        if grain.center[1] > self.dict_sample['y_box_max'] :
+            grain.center = grain.center.copy() + np.array([-dict_lees_edwards['x_LE'], -H])
+            grain.v = grain.v.copy() + np.array([-dict_lees_edwards['v_LE'], 0])
+            self.L_id_crossed_y.append(grain.id)
+        #lower limit
+        elif grain.center[1] < self.dict_sample['y_box_min'] :
+            grain.center = grain.center.copy() + np.array([dict_lees_edwards['x_LE'], H])
+            grain.v = grain.v.copy() + np.array([dict_lees_edwards['v_LE'], 0])
+            self.L_id_crossed_y.append(grain.id)
+        #left wall
+        if grain.center[0] < self.dict_sample['x_box_min'] :
+            grain.center = grain.center.copy() + np.array([self.dict_sample['x_box_max'] - self.dict_sample['x_box_min'], 0])
+        #right wall
+        elif grain.center[0] > self.dict_sample['x_box_max'] :
+            grain.center = grain.center.copy() + np.array([self.dict_sample['x_box_min'] - self.dict_sample['x_box_max'], 0])
+
+#-------------------------------------------------------------------------------
+#Loading controllers (grain store)
+#-------------------------------------------------------------------------------
+
+class Control_Top_Clump(Controller):
+  """
+  Control the top clump to apply the confinement force and to shear the sample.
+
+  The top clump is moved vertically by a PID corrector (see Control_PID()) and horizontally at the shear velocity.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, dict_sample, Force_target, clump_top, Shear_velocity, Sample_height):
+    """
+    Defining the controller.
+
+        Input :
+            itself (a controller)
+            an algorithm dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a confinement value (a float)
+            the top clump (a clump)
+            a shear velocity, 0 if there is no shear (a float)
+            the height of the sample used to compute the shear strain (a float)
+        Output :
+            Nothing, but the controller is generated (a controller)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.dict_sample = dict_sample
+    self.Force_target = Force_target
+    self.clump_top = clump_top
+    self.Shear_velocity = Shear_velocity
+    self.Sample_height = Sample_height
+    self.Fh = 0
+    self.Fv = 0
+    self.mu_sample = 0
+    self.dy_top = 0
+    self.Shear_strain = 0
+
+#-------------------------------------------------------------------------------
+
+  def measure(self, engine):
+    """
+    Compute the force applied on the top clump and the sample friction coefficient.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the controller is updated
+    """
+    self.Fh, self.Fv = self.clump_top.sum_force()
+    if self.Fv != 0 : #else keep same value
+        self.mu_sample = abs(self.Fh / self.Fv)
+
+#-------------------------------------------------------------------------------
+
+  def control(self, engine):
+    """
+    Move the top clump.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the top clump and the sample dictionnary are updated
+    """
+    self.dy_top = Control_PID(self.dict_algorithm, self.Force_target, self.Fv, engine.dt_DEM)
+    self.clump_top.move(np.array([self.Shear_velocity*engine.dt_DEM, self.dy_top]), engine.dt_DEM)
+    self.dict_sample['y_box_max'] = self.dict_sample['y_box_max'] + self.dy_top
+    self.Shear_strain = self.Shear_strain + self.Shear_velocity*engine.dt_DEM / self.Sample_height #Update shear strain
+
+#-------------------------------------------------------------------------------
+
+class Control_Height_Lees_Edwards(Controller):
+  """
+  Control the height of a Lees-Edwards cell to apply the confinement force and slide the images to shear the sample.
+
+  The force is computed with the Love formula (see Lees_Edwards_force()), the height is controlled by a PID corrector (see Control_PID()). The grains follow the height with an affine stretch.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, dict_sample, Force_target, L_g, Shear_velocity, contact_law):
+    """
+    Defining the controller.
+
+        Input :
+            itself (a controller)
+            an algorithm dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a confinement value (a float)
+            a list of the grains in the cell (a list)
+            a shear velocity (a float)
+            the contact law giving the contacts (a contact law)
+        Output :
+            Nothing, but the controller is generated (a controller)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.dict_sample = dict_sample
+    self.Force_target = Force_target
+    self.L_i_grain = [grain.i_store for grain in L_g]
+    self.Shear_velocity = Shear_velocity
+    self.contact_law = contact_law
+    self.Fh = 0
+    self.Fv = 0
+    self.mu_sample = 0
+    self.dy_top = 0
+    self.Shear_strain = 0
+
+#-------------------------------------------------------------------------------
+
+  def measure(self, engine):
+    """
+    Compute the forces applied on the cell and the sample friction coefficient.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the controller is updated
+    """
+    self.Fv, self.Fh = Lees_Edwards_force(self.contact_law.L_contact, self.dict_sample)
+    if self.Fv != 0 : #else keep same value
+        self.mu_sample = abs(self.Fh / self.Fv)
+
+#-------------------------------------------------------------------------------
+
+  def control(self, engine):
+    """
+    Change the height of the cell and slide the images.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the grains and the sample dictionnary are updated
+    """
+    self.dy_top = Control_PID(self.dict_algorithm, self.Force_target, self.Fv, engine.dt_DEM)
+    H = self.dict_sample['y_box_max'] - self.dict_sample['y_box_min']
+    self.dict_sample['grain_store'].stretch_y(self.L_i_grain, self.dict_sample['y_box_min'], (H+self.dy_top)/H)
+    self.dict_sample['y_box_max'] = self.dict_sample['y_box_max'] + self.dy_top
+    self.dict_sample['dict_lees_edwards']['y_box_max'] = self.dict_sample['y_box_max']
+    self.dict_sample['dict_lees_edwards']['x_LE'] = (self.dict_sample['dict_lees_edwards']['x_LE'] + self.Shear_velocity*engine.dt_DEM) % (self.dict_sample['x_box_max'] - self.dict_sample['x_box_min'])
+    self.Shear_strain = self.Shear_strain + self.Shear_velocity*engine.dt_DEM / H #Update shear strain
+
+#-------------------------------------------------------------------------------
+
+class Adaptive_Time_Step(Controller):
+  """
+  Estimate the time step of the next iteration (see GrainStore.adaptive_dt()).
+
+  It must be the last controller, the other ones use the time step of the iteration.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, grain_store, L_i_grain):
+    """
+    Defining the controller.
+
+        Input :
+            itself (a controller)
+            an algorithm dictionnary (a dict)
+            a grain store (a grain store)
+            a list of indices of the moving grains in the store (a list)
+        Output :
+            Nothing, but the controller is generated (a controller)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.grain_store = grain_store
+    self.L_i_grain = L_i_grain
+
+#-------------------------------------------------------------------------------
+
+  def control(self, engine):
+    """
+    Update the time step of the engine.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the time step of the engine is updated
+    """
+    engine.dt_DEM = self.grain_store.adaptive_dt(self.L_i_grain, engine.dt_contact, engine.dt_DEM, self.dict_algorithm)
+
+#-------------------------------------------------------------------------------
+#Contact law and integrator (temporary grains)
+#-------------------------------------------------------------------------------
+
+class Contact_Law_Tempo:
+  """
+  The contact law between temporary grains, images and walls used with the DEM engine (see DEM_Engine).
+
+  The contact modules (disks or polygons) are given at the creation.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_ic, dict_material, dict_sollicitations, verlet_list, module_gg, module_gimage, delete_no_overlap):
+    """
+    Defining the contact law.
+
+        Input :
+            itself (a contact law)
+            an initial condition dictionnary (a dict)
+            a material dictionnary (a dict)
+            a sollicitations dictionnary (a dict)
+            a Verlet list (a verlet list)
+            the module of the contacts grain - grain (a module)
+            the module of the contacts grain - image (a module)
+            a Boolean, True if the contacts gg and gimage with no overlap are deleted after the reactions (a Boolean)
+        Output :
+            Nothing, but the contact law is generated (a contact law)
+    """
+    self.dict_ic = dict_ic
+    self.dict_material = dict_material
+    self.dict_sollicitations = dict_sollicitations
+    self.verlet_list = verlet_list
+    self.module_gg = module_gg
+    self.module_gimage = module_gimage
+    self.delete_no_overlap = delete_no_overlap
+
+#-------------------------------------------------------------------------------
+
+  def detection(self, engine):
+    """
+    Detect the contacts grain - grain and grain - image.
+
+        Input :
+            itself (a contact law)
+            the DEM engine (a DEM engine)
+        Output :
+            a Boolean, True if the neighborhoods have been rebuilt (a Boolean)
+    """
+    neighborhoods_updated = self.verlet_list.update(self.dict_ic['L_g_tempo'], self.dict_ic['L_g_image'])
+    self.module_gg.Grains_contact_Neighborhoods(self.dict_ic,self.dict_material)
+    self.module_gimage.Grains_contact_Neighborhoods(self.dict_ic,self.dict_material)
+    return neighborhoods_updated
+
+#-------------------------------------------------------------------------------
+
+  def reactions(self, engine):
+    """
+    Compute the forces applied on the grains.
+
+        Input :
+            itself (a contact law)
+            the DEM engine (a DEM engine)
+        Output :
+            the stable time step of the contacts, infinite if there is no active spring (a float)
+    """
+    for grain in self.dict_ic['L_g_tempo']:
+         grain.init_F_control(self.dict_sollicitations['gravity'])
+    for contact in  self.dict_ic['contact_registry'].L_contact('gg')+self.dict_ic['contact_registry'].L_contact('gimage')+self.dict_ic['contact_registry'].L_contact('gw'):
+        contact.normal()
+        contact.tangential(engine.dt_DEM)
+
+    #stable time step, from the tangent stiffness dF/d(overlap) of the normal springs (there is no friction during the IC)
+    dt_contact = math.inf
+    for contact in  self.dict_ic['contact_registry'].L_contact('gg')+self.dict_ic['contact_registry'].L_contact('gimage'):
+        if contact.overlap_normal > 0 :
+            mass_eq = contact.g1.mass*contact.g2.mass/(contact.g1.mass+contact.g2.mass)
+            dt_contact = min(dt_contact, math.sqrt(mass_eq/(3/2*contact.k*math.sqrt(contact.overlap_normal))))
+    for contact in self.dict_ic['contact_registry'].L_contact('gw'):
+        if contact.overlap > 0 :
+            dt_contact = min(dt_contact, math.sqrt(contact.g.mass/(3/2*contact.k*math.sqrt(contact.overlap))))
+
+    #Delete contacts gg and gimage with no overlap
+    if self.delete_no_overlap :
+        for ij_contact in self.dict_ic['contact_registry'].L_key('gg') + self.dict_ic['contact_registry'].L_key('gimage'):
+            if self.dict_ic['contact_registry'].get(ij_contact).overlap_normal < 0:
+                self.dict_ic['contact_registry'].remove(ij_contact)
+    return dt_contact
+
+#-------------------------------------------------------------------------------
+
+class Integrator_Tempo:
+  """
+  A semi implicit euler scheme applied on temporary grains.
+
+  The sleeping grains are not moved (see Sleep.Sleep_Manager).
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_ic, L_g, sleep_manager):
+    """
+    Defining the integrator.
+
+        Input :
+            itself (an integrator)
+            an initial condition dictionnary (a dict)
+            a list of the grains to move, grains can be removed during the loop (a list)
+            a sleep manager, None if the grains do not sleep (a sleep_manager)
+        Output :
+            Nothing, but the integrator is generated (an integrator)
+    """
+    self.dict_ic = dict_ic
+    self.L_g = L_g
+    self.sleep_manager = sleep_manager
+
+#-------------------------------------------------------------------------------
+
+  def move(self, engine):
+    """
+    Move the grains.
+
+        Input :
+            itself (an integrator)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the grains are moved
+    """
+    #Put to sleep or wake up the quiescent grains
+    if self.sleep_manager != None :
+        self.sleep_manager.update(self.L_g)
+    #Move grains (only awake)
+    for grain in self.L_g:
+        if not grain.asleep :
+            grain.euler_semi_implicite(engine.dt_DEM,10*self.dict_ic['Ecin_ratio_IC'])
+
+#-------------------------------------------------------------------------------
+#Boundary conditions (temporary grains)
+#-------------------------------------------------------------------------------
+
+class Periodic_Images_Tempo(Boundary):
+  """
+  The periodic condition along the x axis with images of the temporary grains.
+
+  The images of the grains near the limits are created and translated before the contact detection. A grain crossing a limit comes back from the other limit and its contacts are converted (grain - grain into grain - image and conversely).
+  The grain and contact classes (disks or polygons) are given at the creation.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, dict_ic, dict_material, dict_sample, Grain_Image, Contact_Tempo, Contact_Image, translate_border):
+    """
+    Defining the periodic condition.
+
+        Input :
+            itself (a boundary)
+            an algorithm dictionnary (a dict)
+            an initial condition dictionnary (a dict)
+            a material dictionnary (a dict)
+            a sample dictionnary (a dict)
+            the class of the images (a class)
+            the class of the contacts grain - grain (a class)
+            the class of the contacts grain - image (a class)
+            a Boolean, True if the vertices of a grain are translated with its center (a Boolean)
+        Output :
+            Nothing, but the boundary is generated (a boundary)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.dict_ic = dict_ic
+    self.dict_material = dict_material
+    self.dict_sample = dict_sample
+    self.Grain_Image = Grain_Image
+    self.Contact_Tempo = Contact_Tempo
+    self.Contact_Image = Contact_Image
+    self.translate_border = translate_border
+
+#-------------------------------------------------------------------------------
+
+  def before_detection(self, engine):
+    """
+    Create and translate the images.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the images are updated
+    """
+    dict_ic = self.dict_ic
+    dict_sample = self.dict_sample
+    image_removed = False
+    #create image
+    for grain in dict_ic['L_g_tempo']:
+        #left wall
+        if (grain.center[0] - dict_sample['x_box_min']) < self.dict_algorithm['d_to_image'] :
+            if grain.id in dict_ic['dict_id_image'] : #image exists
+                image = dict_ic['dict_id_image'][grain.id]
+                if image.position == 'right' :
+                    image.position = 'left'
+            else : #image does not exist
+                dict_ic['L_g_image'].append(self.Grain_Image(grain, 'left'))
+                dict_ic['dict_id_image'][grain.id] = dict_ic['L_g_image'][-1]
+        #right wall
+        elif (dict_sample['x_box_max'] - grain.center[0]) < self.dict_algorithm['d_to_image'] :
+            if grain.id in dict_ic['dict_id_image'] : #image exists
+                image = dict_ic['dict_id_image'][grain.id]
+                if image.position == 'left' :
+                    image.position = 'right'
+            else : #image does not exist
+                dict_ic['L_g_image'].append(self.Grain_Image(grain, 'right'))
+                dict_ic['dict_id_image'][grain.id] = dict_ic['L_g_image'][-1]
+        #center
+        else :
+            if grain.id in dict_ic['dict_id_image'] : #image exists
+                dict_ic['dict_id_image'].pop(grain.id)
+                image_removed = True
+                for ij_gimage in dict_ic['contact_registry'].L_key_grain(grain.id, 'gimage') :
+                    if grain.id == ij_gimage[1] :
+                        dict_ic['contact_registry'].remove(ij_gimage)
+    #the list of images is rebuilt once from the map
+    if image_removed :
+        dict_ic['L_g_image'] = [image for image in dict_ic['L_g_image'] if image.id in dict_ic['dict_id_image']]
+    #translate image
+    for image in dict_ic['L_g_image']:
+        if image.position == 'left' :
+            image.translation(np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0]))
+        elif image.position == 'right' :
+            image.translation(np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0]))
+
+#-------------------------------------------------------------------------------
+
+  def after_motion(self, engine):
+    """
+    Apply the periodic condition.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the grains and the contacts are updated
+    """
+    dict_sample = self.dict_sample
+    for grain in self.dict_ic['L_g_tempo']:
+        #left wall
+        if grain.center[0] < dict_sample['x_box_min'] :
+            grain.center = grain.center.copy() + np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0])
+            if self.translate_border :
+                for i in range(len(grain.l_border)):
+                    grain.l_border[i] = grain.l_border[i].copy() + np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0])
+                    grain.l_border_x[i] = grain.l_border_x[i].copy() + dict_sample['x_box_max'] - dict_sample['x_box_min']
+            #contact gimage needed to be convert into gg
+            self.convert_gimage_into_gg(grain)
+            #contact gg needed to be convert into gimage
+            self.convert_gg_into_gimage(grain)
+        #right wall
+        elif grain.center[0] > dict_sample['x_box_max'] :
+            grain.center = grain.center.copy() + np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0])
+            if self.translate_border :
+                for i in range(len(grain.l_border)):
+                    grain.l_border[i] = grain.l_border[i].copy() + np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0])
+                    grain.l_border_x[i] = grain.l_border_x[i].copy() + dict_sample['x_box_min'] - dict_sample['x_box_max']
+            #contact gimage needed to be convert into gg
+            self.convert_gimage_into_gg(grain)
+            #contact gg needed to be convert into gimage
+            self.convert_gg_into_gimage(grain)
+
+#-------------------------------------------------------------------------------
+
+  def convert_gimage_into_gg(self, grain):
+    """
+    Convert the contacts grain - image of a grain in contacts grain - grain.
+
+        Input :
+            itself (a boundary)
+            a grain (a grain_tempo)
+        Output :
+            Nothing, but the initial condition dictionnary is updated
+    """
+    dict_ic = self.dict_ic
+    for ij_gimage in dict_ic['contact_registry'].L_key_grain(grain.id, 'gimage') :
+        if ij_gimage[0] > ij_gimage[1] :
+            ij_gg = (ij_gimage[1], ij_gimage[0], 'gg')
+        else :
+            ij_gg = (ij_gimage[0], ij_gimage[1], 'gg')
+        grain_i = dict_ic['dict_id_grain'][ij_gg[0]]
+        grain_j = dict_ic['dict_id_grain'][ij_gg[1]]
+        if ij_gg not in dict_ic['contact_registry'] :
+            #creation of contact
+            dict_ic['contact_registry'].add(ij_gg, self.Contact_Tempo(dict_ic['id_contact'], grain_i, grain_j, self.dict_material))
+            dict_ic['id_contact'] = dict_ic['id_contact'] + 1
+            #transmit data
+            dict_ic['contact_registry'].get(ij_gg).convert_gimage_in_gg(dict_ic['contact_registry'].get(ij_gimage))
+            #update neighborhood
+            grain_i.neighborhood.append(grain_j)
+        #delete previous contact gimage
+        dict_ic['contact_registry'].remove(ij_gimage)
+
+#-------------------------------------------------------------------------------
+
+  def convert_gg_into_gimage(self, grain):
+    """
+    Convert the contacts grain - grain of a grain in contacts grain - image.
+
+    A contact is converted on each side, if the image exists.
+
+        Input :
+            itself (a boundary)
+            a grain (a grain_tempo)
+        Output :
+            Nothing, but the initial condition dictionnary is updated
+    """
+    dict_ic = self.dict_ic
+    for ij_gg in dict_ic['contact_registry'].L_key_grain(grain.id, 'gg') :
+        for ij_gimage in [(ij_gg[0], ij_gg[1], 'gimage'), (ij_gg[1], ij_gg[0], 'gimage')] :
+            if ij_gimage[1] in dict_ic['dict_id_image'] :
+                grain_i = dict_ic['dict_id_grain'][ij_gimage[0]]
+                image = dict_ic['dict_id_image'][ij_gimage[1]]
+                #creation of contact
+                dict_ic['contact_registry'].add(ij_gimage, self.Contact_Image(dict_ic['id_contact'], grain_i, image, self.dict_material))
+                dict_ic['id_contact'] = dict_ic['id_contact'] + 1
+                #transmit data
+                dict_ic['contact_registry'].get(ij_gimage).convert_gimage_in_gg(dict_ic['contact_registry'].get(ij_gg))
+                #update neighborhood
+                grain_i.neighborhood_image.append(image)
+        #delete previous contact gg
+        dict_ic['contact_registry'].remove(ij_gg)
+
+#-------------------------------------------------------------------------------
+
+class Walls_Tempo(Boundary):
+  """
+  The walls of the box, lower and upper along the y axis.
+
+  The contacts grain - wall are detected in a neighborhood rebuilt with the neighborhoods of the grains. The grains out of the box are deleted.
+  The contact module (disks or polygons) is given at the creation.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_ic, dict_material, dict_sample, y_min, module_gw, simulation_report):
+    """
+    Defining the walls.
+
+        Input :
+            itself (a boundary)
+            an initial condition dictionnary (a dict)
+            a material dictionnary (a dict)
+            a sample dictionnary (a dict)
+            the coordinate of the lower wall (a float)
+            the module of the contacts grain - wall (a module)
+            a simultion report (a report)
+        Output :
+            Nothing, but the boundary is generated (a boundary)
+    """
+    self.dict_ic = dict_ic
+    self.dict_material = dict_material
+    self.dict_sample = dict_sample
+    self.y_min = y_min
+    self.module_gw = module_gw
+    self.simulation_report = simulation_report
+    self.wall_neighborhood = []
+    #position of the upper wall when the neighborhood was built
+    self.y_max_neighborhood = None
+
+#-------------------------------------------------------------------------------
+
+  def detection(self, engine):
+    """
+    Detect the contacts between grains and walls.
+
+    The neighborhood of the walls is rebuilt with the neighborhoods of the grains or when the upper wall has moved more than the half of the skin distance.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the contacts grain - wall are updated
+    """
+    dict_sample = self.dict_sample
+    if engine.neighborhoods_updated or self.y_max_neighborhood == None or abs(dict_sample['y_box_max'] - self.y_max_neighborhood) > self.dict_ic['skin_neighborhood_IC']/2 :
+        self.wall_neighborhood = self.module_gw.Update_wall_Neighborhoods(self.dict_ic['L_g_tempo'],self.dict_ic['factor_neighborhood_IC'],self.dict_ic['skin_neighborhood_IC'],dict_sample['x_box_min'],dict_sample['x_box_max'],self.y_min,dict_sample['y_box_max'])
+        self.y_max_neighborhood = dict_sample['y_box_max']
+    self.module_gw.Grains_Polyhedral_Wall_contact_Neighborhood(self.wall_neighborhood,dict_sample['x_box_min'],dict_sample['x_box_max'],self.y_min,dict_sample['y_box_max'], self.dict_ic, self.dict_material)
+
+#-------------------------------------------------------------------------------
+
+  def after_motion(self, engine):
+    """
+    Delete the grains outside of the box.
+
+        Input :
+            itself (a boundary)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the initial condition dictionnary is updated
+    """
+    dict_ic = self.dict_ic
+    L_ig_to_delete = []
+    for id_grain in range(len(dict_ic['L_g_tempo'])):
+        if dict_ic['L_g_tempo'][id_grain].center[1] < self.y_min :
+            L_ig_to_delete.append(id_grain)
+        elif dict_ic['L_g_tempo'][id_grain].center[1] > self.dict_sample['y_box_max'] :
+            L_ig_to_delete.append(id_grain)
+    L_ig_to_delete.reverse()
+    for id_grain in L_ig_to_delete:
+        self.simulation_report.write_and_print('Grain '+str(dict_ic['L_g_tempo'][id_grain].id)+' has been deleted because it is out of the box\n','Grain '+str(dict_ic['L_g_tempo'][id_grain].id)+' has been deleted because it is out of the box')
+        dict_ic['dict_id_grain'].pop(dict_ic['L_g_tempo'][id_grain].id)
+        dict_ic['L_g_tempo'].pop(id_grain)
+
+#-------------------------------------------------------------------------------
+#Loading controllers and tracker (temporary grains)
+#-------------------------------------------------------------------------------
+
+class Control_Upper_Wall(Controller):
+  """
+  Control the upper wall to apply the confinement force (see Control_y_max_NR()).
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_ic, dict_sample, Force_target):
+    """
+    Defining the controller.
+
+        Input :
+            itself (a controller)
+            an initial condition dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a confinement value (a float)
+        Output :
+            Nothing, but the controller is generated (a controller)
+    """
+    self.dict_ic = dict_ic
+    self.dict_sample = dict_sample
+    self.Force_target = Force_target
+    self.Fv = 0
+    self.dy_top = 0
+
+#-------------------------------------------------------------------------------
+
+  def control(self, engine):
+    """
+    Move the upper wall.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the sample dictionnary is updated
+    """
+    y_max = self.dict_sample['y_box_max']
+    self.dict_sample['y_box_max'], self.Fv = Control_y_max_NR(self.dict_sample['y_box_max'],self.Force_target,self.dict_ic['contact_registry'].L_contact('gw'),self.dict_ic['L_g_tempo'])
+    self.dy_top = self.dict_sample['y_box_max'] - y_max
+
+#-------------------------------------------------------------------------------
+
+class Control_Top_Group(Controller):
+  """
+  Control the top group of temporary grains to apply the confinement force (see Control_PID()).
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, dict_ic, dict_sample, Force_target):
+    """
+    Defining the controller.
+
+        Input :
+            itself (a controller)
+            an algorithm dictionnary (a dict)
+            an initial condition dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a confinement value (a float)
+        Output :
+            Nothing, but the controller is generated (a controller)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.dict_ic = dict_ic
+    self.dict_sample = dict_sample
+    self.Force_target = Force_target
+    self.Fv = 0
+    self.dy_top = 0
+
+#-------------------------------------------------------------------------------
+
+  def control(self, engine):
+    """
+    Move the top group.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the top group and the sample dictionnary are updated
+    """
+    #compute vertical force applied on top group
+    self.Fv = 0
+    for grain in self.dict_ic['L_g_tempo'] :
+        if grain.group == 'Top':
+            self.Fv = self.Fv + grain.fy
+    self.dy_top = Control_PID(self.dict_algorithm, self.Force_target, self.Fv, engine.dt_DEM)
+
+    #Apply confinement force
+    for grain in self.dict_ic['L_g_tempo'] :
+        if grain.group == 'Top':
+            grain.move_as_a_group(np.array([0, self.dy_top]), engine.dt_DEM)
+    self.dict_sample['y_box_max'] = self.dict_sample['y_box_max'] + self.dy_top
+
+#-------------------------------------------------------------------------------
+
+class Adaptive_Time_Step_Tempo(Controller):
+  """
+  Estimate the time step of the next iteration for the temporary grains (see Grain.GrainStore.adaptive_dt()).
+
+  It must be the last controller, the other ones use the time step of the iteration.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, L_g):
+    """
+    Defining the controller.
+
+        Input :
+            itself (a controller)
+            an algorithm dictionnary (a dict)
+            a list of the moving temporary grains (a list)
+        Output :
+            Nothing, but the controller is generated (a controller)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.L_g = L_g
+
+#-------------------------------------------------------------------------------
+
+  def control(self, engine):
+    """
+    Update the time step of the engine.
+
+        Input :
+            itself (a controller)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the time step of the engine is updated
+    """
+    dt = min(self.dict_algorithm['factor_dt_contact']*engine.dt_contact, 1.1*engine.dt_DEM)
+    v_max = 0
+    for grain in self.L_g :
+        v_max = max(v_max, np.linalg.norm(grain.v) + grain.radius*abs(grain.w))
+    if v_max > 0 :
+        dt = min(dt, self.dict_algorithm['dx_DEM_max']/v_max)
+    engine.dt_DEM = min(max(dt, self.dict_algorithm['dt_DEM_min']), self.dict_algorithm['dt_DEM_max'])
+
+#-------------------------------------------------------------------------------
+
+class Tracker_IC:
+  """
+  The trackers of the loading of the temporary grains, called at the end of each iteration of the DEM engine.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_ic, dict_sample, dict_sollicitations, controller, Plot_Config, y_min):
+    """
+    Defining the tracker.
+
+    The stop values of the kinetic energy and of the force are computed from the grains at the creation. The stop value of the kinetic energy is updated with the time step (see track()).
+
+        Input :
+            itself (a tracker)
+            an initial condition dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a sollicitations dictionnary (a dict)
+            the controller of the upper limit (a controller)
+            the function plotting the configuration (a function)
+            the coordinate of the lower wall, for the plot (a float)
+        Output :
+            Nothing, but the tracker is generated (a tracker)
+    """
+    self.dict_ic = dict_ic
+    self.dict_sample = dict_sample
+    self.dict_sollicitations = dict_sollicitations
+    self.controller = controller
+    self.Plot_Config = Plot_Config
+    self.y_min = y_min
+    #trackers and stop conditions
+    self.Force_L = []
+    self.Force_stop = 0
+    self.Ecin_L = []
+    self.Ecin_stop = 0
+    #stop value of the kinetic energy multiplied by the square of the time step
+    self.Ecin_stop_dt = 0
+    self.Ymax_L = []
+    self.Fv_L = []
+    self.dy_top_L = []
+    for grain in dict_ic['L_g_tempo']:
+        self.Force_stop = self.Force_stop + 0.5*grain.mass*dict_sollicitations['gravity']
+        self.Ecin_stop_dt = self.Ecin_stop_dt + 0.5*grain.mass*(dict_ic['Ecin_ratio_IC']*grain.radius)**2
+    self.Ecin_stop = self.Ecin_stop_dt/dict_ic['dt_DEM_IC']**2
+    self.F = 0
+    self.Ecin = 0
+
+#-------------------------------------------------------------------------------
+
+  def track(self, engine):
+    """
+    Update the trackers, print and plot.
+
+        Input :
+            itself (a tracker)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the tracker is updated
+    """
+    #Tracker
+    self.F = F_total(self.dict_ic['L_g_tempo'])
+    self.Ecin = E_cin_total(self.dict_ic['L_g_tempo'])
+    self.Ecin_stop = self.Ecin_stop_dt/engine.dt_DEM**2
+    self.Force_L.append(self.F)
+    self.Ecin_L.append(self.Ecin)
+    self.Ymax_L.append(self.dict_sample['y_box_max'])
+    self.Fv_L.append(self.controller.Fv)
+    self.dy_top_L.append(self.controller.dy_top)
+
+    if engine.i_DEM % self.dict_ic['i_print_plot_IC'] ==0:
+        if self.dict_sollicitations['gravity'] > 0 :
+            print('i_DEM',engine.i_DEM,'and Ecin',int(100*self.Ecin/self.Ecin_stop),'% and Force',int(100*self.F/self.Force_stop),'% and Confinement',int(100*self.controller.Fv/self.dict_sollicitations['Vertical_Confinement_Force']),'%')
+        else :
+            print('i_DEM',engine.i_DEM,'and Ecin',int(100*self.Ecin/self.Ecin_stop),'% and Confinement',int(100*self.controller.Fv/self.dict_sollicitations['Vertical_Confinement_Force']),'%')
+        if self.dict_ic['Debug_DEM'] :
+            self.Plot_Config(self.dict_ic,self.dict_sample['x_box_min'],self.dict_sample['x_box_max'],self.y_min,self.dict_sample['y_box_max'],engine.i_DEM)
+
+#-------------------------------------------------------------------------------
+#Stop criteria
+#-------------------------------------------------------------------------------
+
+class Stop_Max_Iteration:
+  """
+  Stop the loop after a number of iterations.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, i_DEM_stop):
+    """
+    Defining the stop criterion.
+
+        Input :
+            itself (a stop criterion)
+            the last iteration (an int)
+        Output :
+            Nothing, but the stop criterion is generated (a stop criterion)
+    """
+    self.i_DEM_stop = i_DEM_stop
+
+#-------------------------------------------------------------------------------
+
+  def stop(self, engine):
+    """
+    Check the stop criterion.
+
+        Input :
+            itself (a stop criterion)
+            the DEM engine (a DEM engine)
+        Output :
+            a Boolean, True if the loop must stop (a Boolean)
+    """
+    return engine.i_DEM >= self.i_DEM_stop
+
+#-------------------------------------------------------------------------------
+
+class Stop_No_Grain:
+  """
+  Stop the loop if there is no more grain.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, L_g):
+    """
+    Defining the stop criterion.
+
+        Input :
+            itself (a stop criterion)
+            the list of grains, grains can be removed during the loop (a list)
+        Output :
+            Nothing, but the stop criterion is generated (a stop criterion)
+    """
+    self.L_g = L_g
+
+#-------------------------------------------------------------------------------
+
+  def stop(self, engine):
+    """
+    Check the stop criterion.
+
+        Input :
+            itself (a stop criterion)
+            the DEM engine (a DEM engine)
+        Output :
+            a Boolean, True if the loop must stop (a Boolean)
+    """
+    return self.L_g == []
+
+#-------------------------------------------------------------------------------
+
+class Stop_Shear_Strain:
+  """
+  Stop the loop once the shear strain target is reached.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, controller, Shear_strain_target):
+    """
+    Defining the stop criterion.
+
+        Input :
+            itself (a stop criterion)
+            the controller shearing the sample (a controller)
+            the shear strain target (a float)
+        Output :
+            Nothing, but the stop criterion is generated (a stop criterion)
+    """
+    self.controller = controller
+    self.Shear_strain_target = Shear_strain_target
+
+#-------------------------------------------------------------------------------
+
+  def stop(self, engine):
+    """
+    Check the stop criterion.
+
+        Input :
+            itself (a stop criterion)
+            the DEM engine (a DEM engine)
+        Output :
+            a Boolean, True if the loop must stop (a Boolean)
+    """
+    return self.controller.Shear_strain >= self.Shear_strain_target
+
+#-------------------------------------------------------------------------------
+
+class Stop_Steady_State:
+  """
+  Stop the loading of the temporary grains once a steady-state is detected.
+
+  The kinetic energy (and the force if there is gravity) must be under the stop values and the confinement must be reached at 5 %. Without gravity, 10 % of the maximum number of iterations must be done.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_ic, dict_sollicitations, tracker, i_DEM_0):
+    """
+    Defining the stop criterion.
+
+        Input :
+            itself (a stop criterion)
+            an initial condition dictionnary (a dict)
+            a sollicitations dictionnary (a dict)
+            the tracker of the loading (a tracker)
+            the iteration at the start (an int)
+        Output :
+            Nothing, but the stop criterion is generated (a stop criterion)
+    """
+    self.dict_ic = dict_ic
+    self.dict_sollicitations = dict_sollicitations
+    self.tracker = tracker
+    self.i_DEM_0 = i_DEM_0
+
+#-------------------------------------------------------------------------------
+
+  def stop(self, engine):
+    """
+    Check the stop criterion.
+
+        Input :
+            itself (a stop criterion)
+            the DEM engine (a DEM engine)
+        Output :
+            a Boolean, True if the loop must stop (a Boolean)
+    """
+    Force_target = self.dict_sollicitations['Vertical_Confinement_Force']
+    Fv = self.tracker.controller.Fv
+    if self.dict_sollicitations['gravity'] > 0:
+        return self.tracker.Ecin < self.tracker.Ecin_stop and self.tracker.F < self.tracker.Force_stop and (0.95*Force_target<Fv and Fv<1.05*Force_target)
+    else:
+        return self.tracker.Ecin < self.tracker.Ecin_stop and engine.i_DEM >= self.dict_ic['i_DEM_stop_IC']*0.1 + self.i_DEM_0 and (0.95*Force_target<Fv and Fv<1.05*Force_target)
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def Control_PID(dict_algorithm, Force_target, F, dt_DEM):
+    """
+    Compute the displacement of the upper limit of the sample to apply force.
+
+    A PID corrector is applied.
+    The gain and the maximum displacement are given for the time step dt_PID, the displacement is scaled by dt_DEM/dt_PID. The upper limit moves at the same velocity whatever the time step.
+        Input :
+            an algorithm dictionnary (a dict)
+            a confinement value (a float)
+            the vertical force applied on the upper limit (a float)
+            the time step (a float)
+        Output :
+            the displacement of the upper limit (a float)
+    """
+    #compare with the target value
+    error = F - Force_target #to have dy_top < 0 is F < Force_target
+    #corrector
+    ki = 0
+    kd = 0
+    dy_top = error * dict_algorithm['kp'] * dt_DEM/dict_algorithm['dt_PID']
+    #compare with maximum value
+    dy_top_max = dict_algorithm['dy_top_max'] * dt_DEM/dict_algorithm['dt_PID']
+    if abs(dy_top) > dy_top_max :
+        dy_top = np.sign(dy_top)*dy_top_max
+
+    return dy_top
+
+#-------------------------------------------------------------------------------
+
+def Lees_Edwards_force(L_contact, dict_sample):
+    """
+    Compute the forces applied on the periodic cell of a Lees-Edwards shear.
+
+    The stress tensor is computed with the Love formula, sigma = 1/V * sum(f_c x l_c), l_c being the branch vector between the centers of the grains in contact (the grain 2 being at its image).
+    The forces are the stresses sigma_yy and sigma_xy multiplied by the width of the cell, to be compared with the forces applied on a Top group.
+
+        Input :
+            a list of contacts, the reactions being computed (a list)
+            a sample dictionnary (a dict)
+        Output :
+            the vertical force (a float)
+            the horizontal force (a float)
+    """
+    Fv = 0
+    Fh = 0
+    for contact in L_contact:
+        #force applied by the grain 1 on the grain 2
+        F_2 = -((contact.F_2_1_n + contact.F_2_1_damp)*contact.pc_normal + (contact.ft + contact.ft_damp)*contact.pc_tangential)
+        l = contact.g2.center + contact.offset - contact.g1.center
+        Fv = Fv + F_2[1]*l[1]
+        Fh = Fh + F_2[0]*l[1]
+    H = dict_sample['y_box_max'] - dict_sample['y_box_min']
+    return Fv/H, Fh/H
+
+#-------------------------------------------------------------------------------
+
+def E_cin_total(L_g):
+    """
+    Compute total kinetic energy.
+
+        Input :
+            a list of temporary grains (a list)
+        Output :
+            the total kinetic energy (a float)
+    """
+    Ecin = 0
+    for grain in L_g:
+        Ecin = Ecin + 1/2*grain.mass*np.dot(grain.v,grain.v)
+    return Ecin
+
+#-------------------------------------------------------------------------------
+
+def F_total(L_g):
+    """
+    Compute total force applied on grains in the sample.
+
+        Input :
+            a list of temporary grains (a list)
+        Output :
+            the total force applied (a float)
+    """
+    F = 0
+    for grain in L_g:
+        F = F + np.linalg.norm([grain.fx, grain.fy])
+    return F
+
+#-------------------------------------------------------------------------------
+
+def Control_y_max_NR(y_max,Force_target,L_contact_gw,L_g):
+    """
+    Control the upper wall to apply force.
+
+    A Newton-Raphson method is applied to verify the confinement.
+        Input :
+            a coordinate of the upper wall (a float)
+            a confinement value (a float)
+            a list of contact grain - wall (a list)
+            a list of temporary grain (a list)
+        Output :
+            the coordinate of the upper wall (a float)
+            a force applied on the upper wall before control (a float)
+    """
+    F = 0
+    overlap_L = []
+    k_L = []
+    for contact in L_contact_gw:
+        if contact.nature == 'gwy_max':
+            F = F + contact.Fwg_n
+            overlap_L.append(contact.overlap)
+            k_L.append(contact.k)
+            #compute force applied, save contact overlap and spring
+
+    if overlap_L != []:
+        i_NR = 0
+        dy = 0
+        ite_criteria = True
+        #control the upper wall
+        if -0.01*Force_target<error_on_ymax_f(dy,overlap_L,k_L,Force_target) and error_on_ymax_f(dy,overlap_L,k_L,Force_target)<0.01*Force_target:
+            ite_criteria = False
+        while ite_criteria :
+            i_NR = i_NR + 1
+            dy = dy - error_on_ymax_f(dy,overlap_L,k_L,Force_target)/error_on_ymax_df(dy,overlap_L,k_L)
+            if i_NR > 100: #Maximum try
+                ite_criteria = False
+            if -0.01*Force_target<error_on_ymax_f(dy,overlap_L,k_L,Force_target) and error_on_ymax_f(dy,overlap_L,k_L,Force_target)<0.01*Force_target:
+                ite_criteria = False
+        y_max = y_max + dy
+
+    else :
+        #if there is no contact with the upper wall, the wall is reset
+        y_max = Reset_y_max(L_g,Force_target)
+
+    for contact in L_contact_gw:
+        if contact.nature == 'gwy_max':
+            #reactualisation
+            contact.limit = y_max
+
+    return y_max, F
+
+#-------------------------------------------------------------------------------
+
+def error_on_ymax_f(dy,overlap_L,k_L,Force_target) :
+    """
+    Compute the function f to control the upper wall. It is the difference between the force applied and the target value.
+
+        Input :
+            an increment of the upper wall position (a float)
+            a list of overlap for contact between temporary grain and upper wall (a list)
+            a list of spring for contact between temporary grain and upper wall (a list)
+            a confinement force (a float)
+        Output :
+            the difference between the force applied and the confinement (a float)
+    """
+    f = Force_target
+    for i in range(len(overlap_L)):
+        f = f - k_L[i]*(max(overlap_L[i]-dy,0))**(3/2)
+    return f
+
+#-------------------------------------------------------------------------------
+
+def error_on_ymax_df(dy,overlap_L,k_L) :
+    """
+    Compute the derivative function df to control the upper wall (error_on_ymax_f()).
+
+        Input :
+            an increment of the upper wall position (a float)
+            a list of overlap for contact between temporary grain and upper wall (a list)
+            a list of spring for contact between temporary grain and upper wall (a list)
+        Output :
+            the derivative of error_on_ymax_f() (a float)
+    """
+    df = 0
+    for i in range(len(overlap_L)):
+        df = df + 3/2*k_L[i]*(max(overlap_L[i]-dy,0))**(1/2)
+    return df
+
+#-------------------------------------------------------------------------------
+
+def Reset_y_max(L_g,Force):
+    """
+    The upper wall is located as a single contact verify the target value.
+
+        Input :
+            the list of temporary grains (a list)
+            the confinement force (a float)
+        Output :
+            the upper wall position (a float)
+    """
+    y_max = None
+    id_grain_max = None
+    for id_grain in range(len(L_g)):
+        grain = L_g[id_grain]
+        y_max_grain = grain.center[1] + grain.radius
+
+        if y_max != None and y_max_grain > y_max:
+            y_max = y_max_grain
+            id_grain_max = id_grain
+        elif y_max == None:
+            y_max = y_max_grain
+            id_grain_max = id_grain
+
+    factor = 5
+    k = factor*4/3*L_g[id_grain_max].y/(1-L_g[id_grain_max].nu*L_g[id_grain_max].nu)*math.sqrt(L_g[id_grain_max].radius)
+    y_max = y_max - (Force/k)**(2/3)
+
+    return y_max
@@ -56,9 +56,9 @@ class Etai:
             Output :
                 Nothing, but the phase field attribute is updated (a nx x ny numpy array)
         '''
-        self.etai_M = np.array(L_g[self.l_ig[0]].etai_M.copy())
-        for i in range(1,len(self.l_ig)):
-            self.etai_M = self.etai_M + np.array(L_g[self.l_ig[i]].etai_M.copy())
+        self.etai_M = np.array(np.zeros(L_g[self.l_ig[0]].etai_shape))
+        for i_grain in self.l_ig:
+            L_g[i_grain].add_etai_M(self.etai_M)
 
 #-------------------------------------------------------------------------------
 #Function
@@ -261,17 +261,11 @@ def PFtoDEM_Multi(FileToRead,dict_algorithm,dict_material,dict_sample):
                     L_Work[0].append(XYZ_temp[0])
                     L_Work[1].append(XYZ_temp[1])
 
-        #Adaptating data and update of etai_M
-        for i in range(len(L_Work[0])):
-            #Interpolation method
-            L_dy = []
-            for y_i in dict_sample['y_L'] :
-                L_dy.append(abs(y_i - L_Work[1][i]))
-            L_dx = []
-            for x_i in dict_sample['x_L'] :
-                L_dx.append(abs(x_i - L_Work[0][i]))
-            for j in range(2,len(L_Work)):
-                L_etai_M[j-2][-1-list(L_dy).index(min(L_dy))][list(L_dx).index(min(L_dx))] = L_Work[j][i]
+        #Adaptating data and update of etai_M, on the nearest nodes
+        L_row = dict_sample['grid'].row(dict_sample['grid'].i_y_nearest(np.array(L_Work[1])))
+        L_col = dict_sample['grid'].i_x_nearest(np.array(L_Work[0]))
+        for j in range(2,len(L_Work)):
+            L_etai_M[j-2][L_row, L_col] = L_Work[j]
 
     #---------------------------------------------------------------------------
     #Transmit data to grains
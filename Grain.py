@@ -11,6 +11,7 @@ This file contains functions used in the simulation to define grains.
 #-------------------------------------------------------------------------------
 
 import math
+import bisect
 import numpy as np
 
 #Own
@@ -20,11 +21,402 @@ import Owntools
 #Class
 #-------------------------------------------------------------------------------
 
+def store_field(name, doc):
+  """
+  Define an attribute of the grain which is a row of its grain store.
+
+    Input :
+        the name of the array in the store (a string)
+        a description (a string)
+    Output :
+        an attribute of the grain (a property)
+  """
+  def get_field(grain):
+      return getattr(grain.store, name)[grain.i_store]
+  def set_field(grain, value):
+      getattr(grain.store, name)[grain.i_store] = value
+  return property(get_field, set_field, doc = doc)
+
+#-------------------------------------------------------------------------------
+
+class GrainStore:
+  """
+  A structure of arrays gathering the kinematics, the forces and the material properties of grains.
+
+  Each grain is a thin view over one row of the store. Hence, operations on all the grains (force initialization, integration, group motion) are done as whole-array operations.
+  The vertices are not moved by the store, they are computed from the center and the rotation when needed (see Grain.l_border).
+  """
+
+  #arrays of the store, (n_grain,2) or (n_grain,)
+  L_field_2 = ['center', 'v', 'total_u', 'u_pf_interpolation']
+  L_field_1 = ['theta', 'w', 'fx', 'fy', 'mz', 'mass', 'inertia', 'radius', 'y', 'nu', 'g', 'dtheta_pf_interpolation']
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, L_g):
+    """
+    Defining the store.
+
+    The state of the grains is copied into the store and the grains become views over it.
+
+        Input :
+            itself (a grain store)
+            a list of grains (a list)
+        Output :
+            Nothing, but the grain store is generated (a grain store)
+    """
+    n_grain = len(L_g)
+    for name in self.L_field_2:
+        setattr(self, name, np.zeros((n_grain,2)))
+    for name in self.L_field_1:
+        setattr(self, name, np.zeros(n_grain))
+    self.l_g = list(L_g)
+    for i_grain in range(n_grain):
+        grain = L_g[i_grain]
+        #copy the data from the previous store
+        if 'store' in grain.__dict__ :
+            for name in self.L_field_2 + self.L_field_1:
+                getattr(self, name)[i_grain] = getattr(grain.store, name)[grain.i_store]
+        grain.store = self
+        grain.i_store = i_grain
+
+#-------------------------------------------------------------------------------
+
+  def init_F_control(self, g):
+      """
+      Initialize the force applied to all the grains.
+
+      A gravity is assumed.
+
+        Input :
+            itself (a grain store)
+            a gravity value (a float)
+        Output :
+            Nothing, but arrays concerning the force applied are initialized (three (n_grain,) numpy arrays)
+      """
+      self.fx[:] = 0
+      self.fy[:] = -g*self.mass
+      self.mz[:] = 0
+
+#-------------------------------------------------------------------------------
+
+  def euler_semi_implicite(self, L_i_grain, dt_DEM):
+    """
+    Move grains following a semi implicit euler scheme.
+
+        Input :
+            itself (a grain store)
+            a list of indices of the grains to move in the store (a list)
+            a time step (a float)
+        Output :
+            Nothing, but the grains are moved
+    """
+    L_i_grain = np.array(L_i_grain, dtype = int)
+    #translation
+    a_i = np.column_stack((self.fx[L_i_grain], self.fy[L_i_grain]))/self.mass[L_i_grain][:,None]
+    self.v[L_i_grain] = self.v[L_i_grain] + a_i*dt_DEM
+    U = self.v[L_i_grain]*dt_DEM
+    self.center[L_i_grain] = self.center[L_i_grain] + U
+    #track total displacement of grains (plot)
+    self.total_u[L_i_grain] = self.total_u[L_i_grain] + U
+
+    #rotation
+    dw_i = self.mz[L_i_grain]/self.inertia[L_i_grain]
+    self.w[L_i_grain] = self.w[L_i_grain] + dw_i*dt_DEM
+    dtheta = self.w[L_i_grain]*dt_DEM
+    self.theta[L_i_grain] = self.theta[L_i_grain] + dtheta
+
+    #track rigid body motion to move pf
+    self.u_pf_interpolation[L_i_grain] = self.u_pf_interpolation[L_i_grain] + U
+    self.dtheta_pf_interpolation[L_i_grain] = self.dtheta_pf_interpolation[L_i_grain] + dtheta
+
+#-------------------------------------------------------------------------------
+
+  def move_as_a_group(self, L_i_grain, U, dt_DEM):
+    """
+    Move grains in a group defined.
+
+        Input :
+            itself (a grain store)
+            a list of indices of the grains in the store (a list)
+            a displacement (a 2 x 1 numpy array)
+            a time step (a float)
+        Output :
+            Nothing, but the grains are moved
+    """
+    L_i_grain = np.array(L_i_grain, dtype = int)
+    #translation
+    self.v[L_i_grain] = np.array([U[0]/dt_DEM, U[1]/dt_DEM])
+    self.center[L_i_grain] = self.center[L_i_grain] + U
+    #track total displacement of grains (plot)
+    self.total_u[L_i_grain] = self.total_u[L_i_grain] + U
+
+    #rotation
+    self.w[L_i_grain] = 0
+
+    #track rigid body motion to move pf
+    self.u_pf_interpolation[L_i_grain] = self.u_pf_interpolation[L_i_grain] + U
+
+#-------------------------------------------------------------------------------
+
+  def stretch_y(self, L_i_grain, y_0, ratio):
+    """
+    Move grains with an affine stretch along the y axis.
+
+    The distance between the center and y_0 is multiplied by the ratio.
+
+        Input :
+            itself (a grain store)
+            a list of indices of the grains in the store (a list)
+            the fixed coordinate (a float)
+            the stretch ratio (a float)
+        Output :
+            Nothing, but the grains are moved
+    """
+    L_i_grain = np.array(L_i_grain, dtype = int)
+    U = np.zeros((len(L_i_grain), 2))
+    U[:,1] = (self.center[L_i_grain,1]-y_0)*(ratio-1)
+    self.center[L_i_grain] = self.center[L_i_grain] + U
+    #track total displacement of grains (plot)
+    self.total_u[L_i_grain] = self.total_u[L_i_grain] + U
+    #track rigid body motion to move pf
+    self.u_pf_interpolation[L_i_grain] = self.u_pf_interpolation[L_i_grain] + U
+
+#-------------------------------------------------------------------------------
+
+  def adaptive_dt(self, L_i_grain, dt_contact, dt_DEM, dict_algorithm):
+    """
+    Estimate the time step of the next iteration.
+
+    The time step is the minimum of :
+        - a fraction of the stable time step of the contacts (see Contact_batch.Compute_reactions())
+        - the time needed by the fastest grain to move of a maximum displacement (the rotation is counted at the radius)
+        - the current time step increased by 10%, the time step can decrease at once but it grows slowly after a collision
+    Then, it is bounded by a minimum and a maximum time step. The minimum time step avoids a stalled simulation, the stability of the contacts is not checked under it.
+
+        Input :
+            itself (a grain store)
+            a list of indices of the moving grains in the store (a list)
+            the stable time step of the contacts (a float)
+            the current time step (a float)
+            an algorithm dictionnary (a dict)
+        Output :
+            the time step of the next iteration (a float)
+    """
+    dt = min(dict_algorithm['factor_dt_contact']*dt_contact, 1.1*dt_DEM)
+    L_i_grain = np.array(L_i_grain, dtype = int)
+    if len(L_i_grain) > 0 :
+        v_max = np.max(np.linalg.norm(self.v[L_i_grain], axis = 1) + self.radius[L_i_grain]*np.abs(self.w[L_i_grain]))
+        if v_max > 0 :
+            dt = min(dt, dict_algorithm['dx_DEM_max']/v_max)
+    return min(max(dt, dict_algorithm['dt_DEM_min']), dict_algorithm['dt_DEM_max'])
+
+#-------------------------------------------------------------------------------
+
+  def L_i_group(self, name_group):
+    """
+    Extract the indices of the grains in a group.
+
+        Input :
+            itself (a grain store)
+            a name of group (a string)
+        Output :
+            a list of indices in the store (a list)
+    """
+    L_i_grain = []
+    for grain in self.l_g:
+        if grain.group == name_group:
+            L_i_grain.append(grain.i_store)
+    return L_i_grain
+
+#-------------------------------------------------------------------------------
+
+class Clump:
+  """
+  A group of grains of a grain store handled as one rigid body.
+
+  The members (their indices in the store and a mask over the store) are computed once. A static clump (Bottom) never moves, a mobile clump (Top) is moved by one vectorized translation.
+  There is no contact between two members of the same clump (see Neighborhood.Update_Neighborhoods()).
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, grain_store, name_group, static):
+    """
+    Defining the clump.
+
+        Input :
+            itself (a clump)
+            a grain store (a grain store)
+            a name of group (a string)
+            a Boolean, True if the clump does not move (a Boolean)
+        Output :
+            Nothing, but the clump is generated (a clump)
+    """
+    self.store = grain_store
+    self.name = name_group
+    self.static = static
+    self.L_i_grain = np.array(grain_store.L_i_group(name_group), dtype = int)
+    self.mask = np.zeros(len(grain_store.l_g), dtype = bool)
+    self.mask[self.L_i_grain] = True
+
+#-------------------------------------------------------------------------------
+
+  def sum_force(self):
+    """
+    Compute the force applied on the clump.
+
+        Input :
+            itself (a clump)
+        Output :
+            the force applied along the x and the y axis (two floats)
+    """
+    return np.sum(self.store.fx, where = self.mask), np.sum(self.store.fy, where = self.mask)
+
+#-------------------------------------------------------------------------------
+
+  def move(self, U, dt_DEM):
+    """
+    Move the clump.
+
+        Input :
+            itself (a clump)
+            a displacement (a 2 x 1 numpy array)
+            a time step (a float)
+        Output :
+            Nothing, but the grains of the clump are moved
+    """
+    if not self.static :
+        self.store.move_as_a_group(self.L_i_grain, U, dt_DEM)
+
+#-------------------------------------------------------------------------------
+
+
 class Grain:
   """
   A polygonal used to simulate the grain.
+
+  The kinematics, the forces and the material properties are not attributes of the grain but a row of a grain store (see GrainStore).
+  The vertices are stored once in the body frame, the grain being rigid during a DEM step. The border in the world frame is a (n_vertices+1) x 2 numpy array, the last vertex closing the polygon.
   """
 
+  center = store_field('center', 'the center of the grain (a 1 x 2 numpy array)')
+  v = store_field('v', 'the velocity of the grain (a 1 x 2 numpy array)')
+  theta = store_field('theta', 'the rotation of the grain (a float)')
+  w = store_field('w', 'the angular velocity of the grain (a float)')
+  fx = store_field('fx', 'the force applied on the grain along the x axis (a float)')
+  fy = store_field('fy', 'the force applied on the grain along the y axis (a float)')
+  mz = store_field('mz', 'the moment applied on the grain (a float)')
+  mass = store_field('mass', 'the mass of the grain (a float)')
+  inertia = store_field('inertia', 'the inertia of the grain (a float)')
+  radius = store_field('radius', 'the radius of the grain (a float)')
+  y = store_field('y', 'the Young modulus of the grain (a float)')
+  nu = store_field('nu', 'the Poisson ratio of the grain (a float)')
+  g = store_field('g', 'the shear modulus of the grain (a float)')
+  total_u = store_field('total_u', 'the total displacement tracked (a 1 x 2 numpy array)')
+  u_pf_interpolation = store_field('u_pf_interpolation', 'the displacement since the last phase field update (a 1 x 2 numpy array)')
+  dtheta_pf_interpolation = store_field('dtheta_pf_interpolation', 'the rotation since the last phase field update (a float)')
+
+  @property
+  def l_border(self):
+    """
+    The vertices in the world frame (a (n_vertices+1) x 2 numpy array).
+
+    They are computed from the vertices in the body frame, the center and the rotation only when needed, and kept until the grain moves.
+    """
+    key = (self.center[0], self.center[1], self.theta)
+    if self.key_l_border != key :
+        Rot_Matrix = np.array([[math.cos(self.theta), -math.sin(self.theta)],
+                               [math.sin(self.theta),  math.cos(self.theta)]])
+        self.l_border_world = np.matmul(self.l_border_body, Rot_Matrix.T) + self.center
+        self.key_l_border = key
+    return self.l_border_world
+
+  @l_border.setter
+  def l_border(self, l_border):
+    #the vertices are brought back in the body frame
+    Rot_Matrix = np.array([[math.cos(self.theta), -math.sin(self.theta)],
+                           [math.sin(self.theta),  math.cos(self.theta)]])
+    self.l_border_body = np.matmul(np.array(l_border, dtype = float) - self.center, Rot_Matrix)
+    self.key_l_border = None
+    self.key_sdf = None
+
+  @property
+  def l_theta_r(self):
+    """
+    The angles of the vertices in the world frame (a list).
+
+    They are computed from the angles in the body frame and the rotation only when needed, and kept until the grain rotates.
+    """
+    if self.key_l_theta_r != self.theta :
+        self.l_theta_r_world = list(np.mod(self.l_theta_r_body + self.theta, 2*math.pi))
+        self.key_l_theta_r = self.theta
+    return self.l_theta_r_world
+
+  @l_theta_r.setter
+  def l_theta_r(self, l_theta_r):
+    #the angles are brought back in the body frame
+    self.l_theta_r_body = np.mod(np.array(l_theta_r, dtype = float) - self.theta, 2*math.pi)
+    self.key_l_theta_r = None
+    self.key_theta_r_sort = None
+
+  @property
+  def l_border_x(self):
+    """
+    The x coordinates of the vertices, a view over the border (a n_vertices+1 numpy array).
+    """
+    return self.l_border[:,0]
+
+  @property
+  def l_border_y(self):
+    """
+    The y coordinates of the vertices, a view over the border (a n_vertices+1 numpy array).
+    """
+    return self.l_border[:,1]
+
+  @property
+  def total_ux(self):
+    return self.total_u[0]
+
+  @property
+  def total_uy(self):
+    return self.total_u[1]
+
+  @property
+  def etai_M(self):
+    """
+    The phase field of the grain on the whole mesh (a n_y x n_x numpy array).
+
+    Only a patch around the grain is stored (see add_etai_M()), the whole field is generated when needed.
+    """
+    etai_M = np.zeros(self.etai_shape)
+    self.add_etai_M(etai_M)
+    return etai_M
+
+  @etai_M.setter
+  def etai_M(self, etai_M):
+    #only the patch of the non zero values is kept, it can cross the periodic limits
+    etai_M = np.array(etai_M, dtype = float)
+    self.etai_shape = etai_M.shape
+    n_period = etai_M.shape[1] - 1
+    #the last column is the periodic image of the first one
+    L_nz_row = np.flatnonzero(np.any(etai_M[:,:n_period] != 0, axis = 1))
+    L_nz_col = np.flatnonzero(np.any(etai_M[:,:n_period] != 0, axis = 0))
+    if len(L_nz_col) == 0 :
+        self.etai_patch = np.zeros((0,0))
+        self.i_etai_row = 0
+        self.i_etai_col = 0
+        return
+    #the patch starts after the largest gap of zero columns (periodic)
+    L_next_col = np.roll(L_nz_col, -1)
+    L_gap = np.mod(L_next_col - L_nz_col, n_period)
+    L_gap[L_gap == 0] = n_period
+    i_gap = int(np.argmax(L_gap))
+    self.i_etai_row = int(L_nz_row[0])
+    self.i_etai_col = int(L_next_col[i_gap])
+    L_c = np.mod(self.i_etai_col + np.arange(n_period - L_gap[i_gap] + 1), n_period)
+    self.etai_patch = etai_M[self.i_etai_row:L_nz_row[-1]+1][:,L_c].copy()
+
 #-------------------------------------------------------------------------------
 
   def __init__(self, grain_tempo):
@@ -36,6 +428,8 @@ class Grain:
         Output :
             a real grain (a grain)
     """
+    #the grain is alone in its store until it is gathered with others
+    GrainStore([self])
     self.group = grain_tempo.group
     self.image = None
     self.radius = grain_tempo.radius
@@ -48,9 +442,8 @@ class Grain:
     self.inertia = grain_tempo.inertia
     self.id = grain_tempo.id
     self.center = grain_tempo.center.copy()
-    self.l_border = grain_tempo.l_border.copy()
-    self.l_border_x = grain_tempo.l_border_x.copy()
-    self.l_border_y = grain_tempo.l_border_y.copy()
+    #center and theta must be defined before the vertices
+    self.l_border = np.array(grain_tempo.l_border, dtype = float)
     self.l_r = grain_tempo.l_r.copy()
     self.l_theta_r = grain_tempo.l_theta_r.copy()
     self.y = grain_tempo.y
@@ -61,8 +454,11 @@ class Grain:
     self.v = np.array([0,0])
     self.mz = 0
     self.w = 0
-    self.track_u = False
-    self.track_rbm_pf_interpolation = False
+    #the grain is awake (see Sleep.Sleep_Manager)
+    self.asleep = False
+    self.n_quiet = 0
+    #no rest shape of the phase field (see cache_etai_rest())
+    self.etai_rest_patch = None
 
 #-------------------------------------------------------------------------------
 
@@ -107,52 +503,15 @@ class Grain:
     """
     Move the grain following a semi implicit euler scheme.
 
+    The integration is done by the store of the grain.
+
         Input :
             itself (a grain)
             a time step (a float)
         Output :
             Nothing, but the grain is moved
     """
-    #translation
-    a_i = np.array([self.fx,self.fy])/self.mass
-    self.v = self.v + a_i*dt_DEM
-    for i in range(len(self.l_border)):
-        self.l_border[i] = self.l_border[i] + self.v*dt_DEM
-        self.l_border_x[i] = self.l_border_x[i] + self.v[0]*dt_DEM
-        self.l_border_y[i] = self.l_border_y[i] + self.v[1]*dt_DEM
-    self.center = self.center + self.v*dt_DEM
-    #track total displacement of grains (plot)
-    if self.track_u :
-        self.total_ux = self.total_ux + self.v[0]*dt_DEM
-        self.total_uy = self.total_uy + self.v[1]*dt_DEM
-
-    #rotation
-    dw_i = self.mz/self.inertia
-    self.w = self.w + dw_i*dt_DEM
-    self.theta = self.theta + self.w*dt_DEM
-
-    for i_theta_r in range(len(self.l_theta_r)) :
-        theta_r = self.l_theta_r[i_theta_r]
-        theta_r = theta_r + self.w*dt_DEM
-        while theta_r >= 2*math.pi:
-            theta_r = theta_r - 2*math.pi
-        while theta_r < 0 :
-            theta_r = theta_r + 2*math.pi
-        self.l_theta_r[i_theta_r] = theta_r
-
-    for i in range(len(self.l_border)):
-        p = self.l_border[i] - self.center
-        Rot_Matrix = np.array([[math.cos(self.w*dt_DEM), -math.sin(self.w*dt_DEM)],
-                               [math.sin(self.w*dt_DEM),  math.cos(self.w*dt_DEM)]])
-        p = np.dot(Rot_Matrix,p)
-        self.l_border[i] = p + self.center
-        self.l_border_x[i] = p[0] + self.center[0]
-        self.l_border_y[i] = p[1] + self.center[1]
-
-    #track rigid body motion to move pf
-    if self.track_rbm_pf_interpolation :
-        self.u_pf_interpolation = self.u_pf_interpolation + self.v*dt_DEM
-        self.dtheta_pf_interpolation = self.dtheta_pf_interpolation + self.w*dt_DEM
+    self.store.euler_semi_implicite([self.i_store], dt_DEM)
 
 #-------------------------------------------------------------------------------
 
@@ -160,31 +519,16 @@ class Grain:
     """
     Move the grain in a group defined.
 
+    The displacement is done by the store of the grain.
+
         Input :
             itself (a grain)
             a displacement (a 2 x 1 numpy array)
+            a time step (a float)
         Output :
             Nothing, but the grain is moved
     """
-    #translation
-    self.v = np.array([U[0]/dt_DEM, U[1]/dt_DEM])
-    for i in range(len(self.l_border)):
-        self.l_border[i] = self.l_border[i] + U
-        self.l_border_x[i] = self.l_border_x[i] + U[0]
-        self.l_border_y[i] = self.l_border_y[i] + U[1]
-    self.center = self.center + U
-    #track total displacement of grains (plot)
-    if self.track_u :
-        self.total_ux = self.total_ux + U[0]
-        self.total_uy = self.total_uy + U[1]
-
-    #rotation
-    self.w = 0
-
-    #track rigid body motion to move pf
-    if self.track_rbm_pf_interpolation :
-        self.u_pf_interpolation = self.u_pf_interpolation + U
-        self.dtheta_pf_interpolation = self.dtheta_pf_interpolation + self.w*dt_DEM
+    self.store.move_as_a_group([self.i_store], U, dt_DEM)
 
 #-------------------------------------------------------------------------------
 
@@ -209,6 +553,167 @@ class Grain:
       else :
           return False
 
+#-------------------------------------------------------------------------------
+
+  def i_nearest_theta_r(self, angle):
+    """
+    Find the vertex with the nearest angle (in the world frame) from a target.
+
+    The angles in the body frame are sorted once, the target is brought in the body frame and located by bisection. Then, only the vertices around are compared.
+    It is the same as looking for the minimum of abs(l_theta_r - angle).
+
+        Input :
+            itself (a grain)
+            an angle in the world frame, between 0 and 2 pi (a float)
+        Output :
+            an index of vertex (an int)
+    """
+    #sort the angles in the body frame, kept until the vertices change
+    if self.key_theta_r_sort is not self.l_theta_r_body :
+        self.L_i_theta_r_sort = [int(i) for i in np.argsort(self.l_theta_r_body)]
+        self.l_theta_r_body_sort = [float(self.l_theta_r_body[i]) for i in self.L_i_theta_r_sort]
+        self.key_theta_r_sort = self.l_theta_r_body
+    n_vertices = len(self.L_i_theta_r_sort)
+    i_sort = bisect.bisect_left(self.l_theta_r_body_sort, (angle - self.theta) % (2*math.pi))
+    #the nearest angle is one of the neighbors (the mod 2 pi can swap the order near 0)
+    i_nearest = None
+    for j_sort in range(i_sort-2, i_sort+2):
+        i = self.L_i_theta_r_sort[j_sort % n_vertices]
+        d = abs((self.l_theta_r_body_sort[j_sort % n_vertices] + self.theta) % (2*math.pi) - angle)
+        if i_nearest is None or d < d_nearest or (d == d_nearest and i < i_nearest):
+            i_nearest = i
+            d_nearest = d
+    return i_nearest
+
+#-------------------------------------------------------------------------------
+
+  def sdf_grid(self):
+    """
+    Get the signed distance grid of the grain in the body frame.
+
+    The grid is built only when the vertices change. The spacing is half of the mean edge length, the grid covers the grain with a margin of two cells.
+    The signed distance is positive outside the grain and negative inside. Its gradient is computed on the same grid.
+
+        Input :
+            itself (a grain)
+        Output :
+            a signed distance dictionnary with the origin, the spacing and the distances stacked with their gradient (a dict)
+    """
+    if self.key_sdf is not self.l_border_body :
+        L_a = self.l_border_body[:-1]
+        L_ab = self.l_border_body[1:] - L_a
+        L_ab_2 = np.sum(L_ab*L_ab, axis = 1)
+        L_ab_2[L_ab_2 == 0] = 1 #the zero length edges are reduced to their first vertex
+        h = np.mean(np.sqrt(L_ab_2))/2
+        r_max = np.max(np.linalg.norm(L_a, axis = 1)) + 2*h
+        n_node = int(math.ceil(2*r_max/h)) + 1
+        L_x = -r_max + h*np.arange(n_node)
+        M_x, M_y = np.meshgrid(L_x, L_x, indexing = 'ij')
+        L_p = np.column_stack((M_x.ravel(), M_y.ravel()))
+
+        #distance to the edges
+        L_ap = L_p[:,np.newaxis,:] - L_a[np.newaxis,:,:]
+        L_t = np.clip(np.sum(L_ap*L_ab[np.newaxis,:,:], axis = 2)/L_ab_2, 0, 1)
+        L_d = np.min(np.linalg.norm(L_ap - L_t[:,:,np.newaxis]*L_ab[np.newaxis,:,:], axis = 2), axis = 1)
+
+        #inside the polygon, from the number of edges crossed by a ray along x
+        L_b = self.l_border_body[1:]
+        L_cross = (L_a[:,1] > L_p[:,1,np.newaxis]) != (L_b[:,1] > L_p[:,1,np.newaxis])
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            L_x_cross = L_a[:,0] + (L_p[:,1,np.newaxis] - L_a[:,1])*(L_b[:,0] - L_a[:,0])/(L_b[:,1] - L_a[:,1])
+        inside = np.sum(L_cross & (L_p[:,0,np.newaxis] < L_x_cross), axis = 1) % 2 == 1
+        L_d[inside] = -L_d[inside]
+
+        M_sdf = L_d.reshape(n_node, n_node)
+        M_grad_x, M_grad_y = np.gradient(M_sdf, h, h)
+        #the distance and its gradient are stacked to be interpolated at once
+        self.dict_sdf = {'x_min' : -r_max, 'h' : h, 'n_node' : n_node,
+                         'sdf_grad' : np.stack((M_sdf, M_grad_x, M_grad_y), axis = 2)}
+        self.key_sdf = self.l_border_body
+    return self.dict_sdf
+
+#-------------------------------------------------------------------------------
+
+  def signed_distance(self, l_point):
+    """
+    Compute the signed distance from the grain and the outward normal at points.
+
+    The points are brought in the body frame, the distance and its gradient are interpolated (bilinear) on the signed distance grid (see sdf_grid()).
+    The points outside the grid are far from the grain, their distance is infinite.
+
+        Input :
+            itself (a grain)
+            a list of points in the world frame (a n x 2 numpy array)
+        Output :
+            the signed distances, negative inside the grain (a n numpy array)
+            the outward normals in the world frame (a n x 2 numpy array)
+    """
+    dict_sdf = self.sdf_grid()
+    Rot_Matrix = np.array([[math.cos(self.theta), -math.sin(self.theta)],
+                           [math.sin(self.theta),  math.cos(self.theta)]])
+    L_u = (np.matmul(l_point - self.center, Rot_Matrix) - dict_sdf['x_min'])/dict_sdf['h']
+    in_grid = np.all((0 <= L_u) & (L_u <= dict_sdf['n_node'] - 1), axis = 1)
+    L_i = np.clip(np.floor(L_u).astype(int), 0, dict_sdf['n_node'] - 2)
+    L_f = L_u - L_i
+    M = dict_sdf['sdf_grad']
+    L_sdf_grad = ((1-L_f[:,0])*(1-L_f[:,1]))[:,np.newaxis]*M[L_i[:,0], L_i[:,1]] + (L_f[:,0]*(1-L_f[:,1]))[:,np.newaxis]*M[L_i[:,0]+1, L_i[:,1]] +\
+                 ((1-L_f[:,0])*L_f[:,1])[:,np.newaxis]*M[L_i[:,0], L_i[:,1]+1] + (L_f[:,0]*L_f[:,1])[:,np.newaxis]*M[L_i[:,0]+1, L_i[:,1]+1]
+    L_d = L_sdf_grad[:,0]
+    #back in the world frame
+    L_normal = np.matmul(L_sdf_grad[:,1:], Rot_Matrix.T)
+    L_norm = np.linalg.norm(L_normal, axis = 1)
+    L_norm[L_norm == 0] = 1
+    L_d[~in_grid] = math.inf
+    return L_d, L_normal/L_norm[:,np.newaxis]
+
+#---------------------------------------------------------------------------
+
+  def add_etai_M(self, etai_M):
+    """
+    Add the phase field of the grain to a field on the whole mesh.
+
+    The patch is scattered on its rows and columns, the columns crossing the periodic limits are wrapped.
+
+        Input :
+            itself (a grain)
+            a field on the whole mesh (a n_y x n_x numpy array)
+        Output :
+            Nothing, but the field is updated (a n_y x n_x numpy array)
+    """
+    n_row, n_col = self.etai_patch.shape
+    if n_row*n_col == 0 :
+        return
+    L_c = np.mod(self.i_etai_col + np.arange(n_col), etai_M.shape[1] - 1)
+    etai_M[self.i_etai_row:self.i_etai_row+n_row, L_c] = etai_M[self.i_etai_row:self.i_etai_row+n_row, L_c] + self.etai_patch
+    #the last column is the periodic image of the first one
+    etai_M[:,-1] = etai_M[:,0]
+
+#---------------------------------------------------------------------------
+
+  def get_etai_M(self, L_row, L_col, rest = False):
+    """
+    Get the phase field of the grain at some nodes of the mesh, without generating the whole field.
+
+        Input :
+            itself (a grain)
+            the rows of the nodes in the field, from the top (a numpy array of int)
+            the columns of the nodes in the field, broadcastable with the rows (a numpy array of int)
+            a boolean to read the patch of the rest shape instead of the current one (see cache_etai_rest()) (a bool)
+        Output :
+            the phase field at the nodes, 0 out of the patch (a numpy array)
+    """
+    if rest :
+        etai_patch, i_etai_row, i_etai_col = self.etai_rest_patch, self.i_etai_rest_row, self.i_etai_rest_col
+    else :
+        etai_patch, i_etai_row, i_etai_col = self.etai_patch, self.i_etai_row, self.i_etai_col
+    n_period = self.etai_shape[1] - 1
+    n_row, n_col = etai_patch.shape
+    L_i, L_j = np.broadcast_arrays(np.asarray(L_row) - i_etai_row, np.mod(np.mod(L_col, n_period) - i_etai_col, n_period))
+    in_patch = (0 <= L_i) & (L_i < n_row) & (L_j < n_col)
+    L_etai = np.zeros(L_i.shape)
+    L_etai[in_patch] = etai_patch[L_i[in_patch], L_j[in_patch]]
+    return L_etai
+
 #---------------------------------------------------------------------------
 
   def build_etai_M(self, dict_algorithm, dict_material, dict_sample):
@@ -223,403 +728,168 @@ class Grain:
                 a material dictionnary (a dictionnary)
                 a sample dictionnary (a dictionnary)
             Output :
-                Nothing but the grain gets a new attribute (a n_y x n_x numpy array)
+                Nothing but the grain gets a new patch of phase field (see add_etai_M())
         '''
         #initilization
-        self.etai_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-        bc_left = False
-        bc_right = False
-
-        #extract a spatial zone
-        x_min = min(self.l_border_x)-dict_material['w']
-        if x_min < dict_sample['x_box_min']:
-            bc_left = True
-            x_min = dict_sample['x_box_max'] - (dict_sample['x_box_min']-x_min)
-        x_max = max(self.l_border_x)+dict_material['w']
-        if dict_sample['x_box_max'] < x_max :
-            bc_right = True
-            x_max = dict_sample['x_box_min'] + (x_max-dict_sample['x_box_max'])
-        y_min = min(self.l_border_y)-dict_material['w']
-        y_max = max(self.l_border_y)+dict_material['w']
-
-        #look for this part inside the global mesh
-        #create search list
-        x_L_search_min = abs(np.array(dict_sample['x_L'])-x_min)
-        x_L_search_max = abs(np.array(dict_sample['x_L'])-x_max)
-        y_L_search_min = abs(np.array(dict_sample['y_L'])-y_min)
-        y_L_search_max = abs(np.array(dict_sample['y_L'])-y_max)
-
-        #get index
-        i_x_min = list(x_L_search_min).index(min(x_L_search_min))
-        i_x_max = list(x_L_search_max).index(min(x_L_search_max))
-        i_y_min = list(y_L_search_min).index(min(y_L_search_min))
-        i_y_max = list(y_L_search_max).index(min(y_L_search_max))
-
-        #no bc
-        if not bc_left and not bc_right :
-            for l in range(i_y_min,i_y_max+1):
-                for c in range(i_x_min,i_x_max+1):
-                    y = dict_sample['y_L'][l]
-                    x = dict_sample['x_L'][c]
-                    p = np.array([x,y])
-                    r = np.linalg.norm(self.center - p)
-                    #look for the radius on this direction
-                    if p[1]>self.center[1]:
-                        theta = math.acos((p[0]-self.center[0])/np.linalg.norm(self.center-p))
-                    else :
-                        theta= 2*math.pi - math.acos((p[0]-self.center[0])/np.linalg.norm(self.center-p))
-                    L_theta_R_i = list(abs(np.array(self.l_theta_r)-theta))
-                    R = self.l_r[L_theta_R_i.index(min(L_theta_R_i))]
-                    #build etai_M
-                    self.etai_M[-1-l][c] = Owntools.Cosine_Profile(R,r,dict_material['w'])
-                    #bc
-                    if c == 0:
-                        self.etai_M[-1-l][-1] = self.etai_M[-1-l][0]
-                    elif c == len(dict_sample['x_L'])-1:
-                        self.etai_M[-1-l][0] = self.etai_M[-1-l][-1]
-        #bc left
-        elif bc_left and not bc_right :
-            for l in range(i_y_min,i_y_max+1):
-                for c in list(range(0,i_x_max+1))+list(range(i_x_min,len(dict_sample['x_L']))):
-                    y = dict_sample['y_L'][l]
-                    x = dict_sample['x_L'][c]
-                    if c in list(range(i_x_min,len(dict_sample['x_L']))):
-                        x = x - (dict_sample['x_box_max']-dict_sample['x_box_min'])
-                    p = np.array([x,y])
-                    r = np.linalg.norm(self.center - p)
-                    #look for the radius on this direction
-                    if p[1]>self.center[1]:
-                        theta = math.acos((p[0]-self.center[0])/np.linalg.norm(self.center-p))
-                    else :
-                        theta= 2*math.pi - math.acos((p[0]-self.center[0])/np.linalg.norm(self.center-p))
-                    L_theta_R_i = list(abs(np.array(self.l_theta_r)-theta))
-                    R = self.l_r[L_theta_R_i.index(min(L_theta_R_i))]
-                    #build etai_M
-                    self.etai_M[-1-l][c] = Owntools.Cosine_Profile(R,r,dict_material['w'])
-        #bc right
-        elif not bc_left and bc_right :
-            for l in range(i_y_min,i_y_max+1):
-                for c in list(range(0,i_x_max+1))+list(range(i_x_min,len(dict_sample['x_L']))):
-                    y = dict_sample['y_L'][l]
-                    x = dict_sample['x_L'][c]
-                    if c in list(range(0,i_x_max+1)):
-                        x = x + (dict_sample['x_box_max']-dict_sample['x_box_min'])
-                    p = np.array([x,y])
-                    r = np.linalg.norm(self.center - p)
-                    #look for the radius on this direction
-                    if p[1]>self.center[1]:
-                        theta = math.acos((p[0]-self.center[0])/np.linalg.norm(self.center-p))
-                    else :
-                        theta= 2*math.pi - math.acos((p[0]-self.center[0])/np.linalg.norm(self.center-p))
-                    L_theta_R_i = list(abs(np.array(self.l_theta_r)-theta))
-                    R = self.l_r[L_theta_R_i.index(min(L_theta_R_i))]
-                    #build etai_M
-                    self.etai_M[-1-l][c] = Owntools.Cosine_Profile(R,r,dict_material['w'])
+        grid = dict_sample['grid']
+        self.etai_shape = (grid.n_y, grid.n_x)
+
+        #extract a spatial zone, the columns crossing the periodic limits are unwrapped
+        i_x_min = grid.i_x_nearest_periodic(min(self.l_border_x)-dict_material['w'])
+        i_x_max = grid.i_x_nearest_periodic(max(self.l_border_x)+dict_material['w'])
+        i_y_min = grid.i_y_nearest(min(self.l_border_y)-dict_material['w'])
+        i_y_max = grid.i_y_nearest(max(self.l_border_y)+dict_material['w'])
+        L_c, L_x = grid.columns_periodic(i_x_min, i_x_max)
+        L_l = np.arange(i_y_min, i_y_max+1)
+
+        #distance and angle of the nodes from the center
+        dx_M = L_x[np.newaxis,:] - self.center[0]
+        dy_M = grid.y_L[L_l][:,np.newaxis] - self.center[1]
+        r_M = np.sqrt(dx_M**2 + dy_M**2)
+        theta_M = np.arctan2(dy_M, dx_M)
+        #same range as the acos definition, ]0,2pi] for the points under the center
+        theta_M = np.where(dy_M > 0, theta_M, 2*math.pi - abs(theta_M))
+
+        #look for the radius on this direction (nearest angle, the lowest index if equality)
+        L_theta_r = np.array(self.l_theta_r)
+        L_i_sort = np.argsort(L_theta_r, kind = 'stable')
+        L_theta_r_sort = L_theta_r[L_i_sort]
+        i_high_M = np.clip(np.searchsorted(L_theta_r_sort, theta_M), 0, len(L_theta_r)-1)
+        i_low_M = np.searchsorted(L_theta_r_sort, L_theta_r_sort[np.clip(i_high_M-1, 0, None)])
+        d_high_M = abs(L_theta_r_sort[i_high_M] - theta_M)
+        d_low_M = abs(L_theta_r_sort[i_low_M] - theta_M)
+        i_nearest_M = np.where((d_high_M < d_low_M) | ((d_high_M == d_low_M) & (L_i_sort[i_high_M] < L_i_sort[i_low_M])), L_i_sort[i_high_M], L_i_sort[i_low_M])
+        R_M = np.array(self.l_r)[i_nearest_M]
+
+        #build the patch, the rows are from the top
+        self.etai_patch = Owntools.Cosine_Profile(R_M,r_M,dict_material['w'])[::-1].copy()
+        self.i_etai_row = grid.row(i_y_max)
+        self.i_etai_col = int(L_c[0])
+
+        #the rest shape is the reference of the next updates
+        if dict_algorithm['method_pf_update'] == 'rest_shape' :
+            self.cache_etai_rest()
 
 #---------------------------------------------------------------------------
 
-  def move_grain_interpolation(self, dict_algorithm, dict_material, dict_sample):
-    '''
-    Move the grain by updating the phase field of the grain.
+  def cache_etai_rest(self):
+    """
+    Save the patch of phase field of the grain as its rest shape.
 
-    A bilinear interpolation on the phase field is done. See https://en.wikipedia.org/wiki/Bilinear_interpolation
+    The patch must describe the grain at its current position. The next updates are computed from it (see move_grain_rest_shape()).
+    It must be called again when the shape of the grain changes (after a phase field simulation for example).
+
+        Input :
+            itself (a grain)
+        Output :
+            Nothing but the grain gets a rest shape (a numpy array, two ints, a 1 x 2 numpy array and a float)
+    """
+    self.etai_rest_patch = self.etai_patch.copy()
+    self.i_etai_rest_row = self.i_etai_row
+    self.i_etai_rest_col = self.i_etai_col
+    self.center_rest = np.array(self.center, dtype = float)
+    self.theta_rest = self.theta
+
+#---------------------------------------------------------------------------
+
+  def remap_etai_M(self, dict_material, dict_sample, center_source, dtheta, rest = False):
+    """
+    Compute the patch of phase field of the grain at its current position from a previous patch.
+
+    The motion from the previous patch is one rigid body motion. The patch of the new phase field is computed at once : the source of each node is found by the inverse motion and a bilinear interpolation is done on the previous patch. See https://en.wikipedia.org/wiki/Bilinear_interpolation
+    The periodic condition is applied on the x axis, the source is 0 out of the mesh on the y axis.
 
         Input :
             itself (a grain)
-            an algorithm dictionnary (a dict)
             a material dictionnary (a dict)
             a sample dictionnary (a dictionnary)
+            the center of the grain in the previous patch (a 1 x 2 numpy array)
+            the rotation since the previous patch (a float)
+            a boolean to use the patch of the rest shape as the previous patch (see cache_etai_rest()) (a bool)
         Output :
-            Nothing but the grain gets an updated attribute (a n_y x n_x numpy array)
-    '''
-    #create an extended etai_M = etai_M + BC areas
-    i_bc_left = len(dict_sample['x_L']) - 1
-    while (dict_sample['x_box_max'] - dict_sample['x_L'][i_bc_left]) < dict_algorithm['d_to_image'] :
-        i_bc_left = i_bc_left - 1
-    i_bc_right = 0
-    while (dict_sample['x_L'][i_bc_right] - dict_sample['x_box_min']) < dict_algorithm['d_to_image'] :
-        i_bc_right = i_bc_right + 1
-    etai_M_copy = self.etai_M.copy()
-    etai_M_extended = np.array(np.zeros((len(dict_sample['y_L']),(len(dict_sample['x_L'])-i_bc_left-1) + len(dict_sample['x_L']) + i_bc_right)))
-    etai_M_extended[:,:len(dict_sample['x_L'])-i_bc_left-1] = etai_M_copy[:,i_bc_left:-1]
-    etai_M_extended[:,len(dict_sample['x_L'])-i_bc_left-1:2*len(dict_sample['x_L'])-i_bc_left-1] = etai_M_copy
-    etai_M_extended[:,-i_bc_right:] = etai_M_copy[:,1:i_bc_right+1]
-    etai_M_extended_copy = etai_M_extended.copy()
-
-    #create an extended x_L = x_L + BC areas
-    x_L_extended = []
-    for i_x in range(i_bc_left, len(dict_sample['x_L'])-1): #bc left
-        x_L_extended.append(dict_sample['x_L'][i_x]-(dict_sample['x_box_max']-dict_sample['x_box_min']))
-    for i_x in range(0, len(dict_sample['x_L'])): #x_L
-        x_L_extended.append(dict_sample['x_L'][i_x])
-    for i_x in range(1, i_bc_right+1): #bc right
-        x_L_extended.append(dict_sample['x_L'][i_x]+(dict_sample['x_box_max']-dict_sample['x_box_min']))
-
-    #extract zone
-    if self.u_pf_interpolation[0] >= 0 :
-        x_min = min(self.l_border_x)-dict_material['w'] - self.u_pf_interpolation[0]
-        x_max = max(self.l_border_x)+dict_material['w']
-    else :
-        x_min = min(self.l_border_x)-dict_material['w']
-        x_max = max(self.l_border_x)+dict_material['w'] - self.u_pf_interpolation[0]
-    if self.u_pf_interpolation[1] >= 0:
-        y_min = min(self.l_border_y)-dict_material['w'] - self.u_pf_interpolation[1]
-        y_max = max(self.l_border_y)+dict_material['w']
-    else:
-        y_min = min(self.l_border_y)-dict_material['w']
-        y_max = max(self.l_border_y)+dict_material['w'] - self.u_pf_interpolation[1]
-
-    #look for this part inside the global mesh
-    #create search list
-    x_L_search_min = abs(np.array(x_L_extended)-x_min)
-    x_L_search_max = abs(np.array(x_L_extended)-x_max)
-    y_L_search_min = abs(np.array(dict_sample['y_L'])-y_min)
-    y_L_search_max = abs(np.array(dict_sample['y_L'])-y_max)
-    #get index
-    i_x_min = list(x_L_search_min).index(min(x_L_search_min))
-    i_x_max = list(x_L_search_max).index(min(x_L_search_max))
-    i_y_min = list(y_L_search_min).index(min(y_L_search_min))
-    i_y_max = list(y_L_search_max).index(min(y_L_search_max))
-
-    #iteration on the mesh
-    for l in range(i_y_min, i_y_max+1):
-        for c in range(i_x_min, i_x_max+1):
-
-            #Interpolation of the rotation
-            p = np.array([x_L_extended[c], dict_sample['y_L'][l]])
-            pp = p - (self.center - self.u_pf_interpolation) #take center before the rigib body motion
-            M_rot = np.array([[math.cos(self.dtheta_pf_interpolation), -math.sin(self.dtheta_pf_interpolation)],
-                              [math.sin(self.dtheta_pf_interpolation),  math.cos(self.dtheta_pf_interpolation)]])
-            pp = np.dot(M_rot, pp)
-            p = pp + self.center - self.u_pf_interpolation #take center before the rigib body motion
-            #check the new position in the mesh
-            if p[0] <= min(x_L_extended) or max(x_L_extended) <= p[0] or p[1] <= min(dict_sample['y_L']) or max(dict_sample['y_L']) <= p[1] :
-                etai_M_extended[-1-l][c] = 0 #no information because out of the mesh, it is 0
-            else : #look for the nearest nodes
-                #look on x axis
-                i_x = 1
-                while not (x_L_extended[i_x-1] <= p[0] and p[0] < x_L_extended[i_x])  :
-                    i_x = i_x + 1
-                #look on y axis
-                i_y = 1
-                while not (dict_sample['y_L'][i_y-1] <= p[1] and p[1] < dict_sample['y_L'][i_y])  :
-                    i_y = i_y + 1
-                #definition of the nearest nodes
-                p1  = np.array([x_L_extended[i_x-1], dict_sample['y_L'][i_y-1]])
-                p2  = np.array([x_L_extended[i_x]  , dict_sample['y_L'][i_y-1]])
-                p12 = np.array([p[0]                     , dict_sample['y_L'][i_y-1]])
-                p3  = np.array([x_L_extended[i_x-1], dict_sample['y_L'][i_y]  ])
-                p4  = np.array([x_L_extended[i_x]  , dict_sample['y_L'][i_y]  ])
-                p34 = np.array([p[0]                     , dict_sample['y_L'][i_y]  ])
-                #definition of value at those nearest nodes
-                q1  = etai_M_extended_copy[-(i_y-1)-1][i_x-1]
-                q2  = etai_M_extended_copy[-(i_y-1)-1][i_x]
-                q3  = etai_M_extended_copy[-i_y-1][i_x-1]
-                q4  = etai_M_extended_copy[-i_y-1][i_x]
-                #first interpolations, compute intermediate nodes
-                q12 = (q1*(p2[0]-p[0]) + q2*(p[0]-p1[0]))/(p2[0]-p1[0])
-                q34 = (q3*(p4[0]-p[0]) + q4*(p[0]-p3[0]))/(p4[0]-p1[0])
-                #interpolation of p
-                q = (q12*(p[1]-p34[1]) + q34*(p12[1]-p[1]))/(p12[1]-p34[1])
-                #update etai_M
-                if c <= len(dict_sample['x_L'])-i_bc_left-1:
-                    etai_M_extended[-1-l][c] = q
-                    etai_M_extended[-1-l][c+len(dict_sample['x_L'])-1] = q
-                elif 2*len(dict_sample['x_L'])-i_bc_left-1 <= c:
-                    etai_M_extended[-1-l][c] = q
-                    etai_M_extended[-1-l][c-len(dict_sample['x_L'])+1] = q
-                else :
-                    etai_M_extended[-1-l][c] = q
-
-    #reinitialization
-    etai_M_extended_copy = etai_M_extended.copy()
-
-    #extract a spatial zone (consider the rotation ?)
-    if self.u_pf_interpolation[0] >= 0 :
-        x_min = min(self.l_border_x)-dict_material['w'] - self.u_pf_interpolation[0]
-        x_max = max(self.l_border_x)+dict_material['w']
-    else :
-        x_min = min(self.l_border_x)-dict_material['w']
-        x_max = max(self.l_border_x)+dict_material['w'] - self.u_pf_interpolation[0]
-    if self.u_pf_interpolation[1] >= 0:
-        y_min = min(self.l_border_y)-dict_material['w'] - self.u_pf_interpolation[1]
-        y_max = max(self.l_border_y)+dict_material['w']
-    else:
-        y_min = min(self.l_border_y)-dict_material['w']
-        y_max = max(self.l_border_y)+dict_material['w'] - self.u_pf_interpolation[1]
-
-    #look for this part inside the global mesh
-    #create search list
-    x_L_search_min = abs(np.array(x_L_extended)-x_min)
-    x_L_search_max = abs(np.array(x_L_extended)-x_max)
-    y_L_search_min = abs(np.array(dict_sample['y_L'])-y_min)
-    y_L_search_max = abs(np.array(dict_sample['y_L'])-y_max)
-    #get index
-    i_x_min = list(x_L_search_min).index(min(x_L_search_min))
-    i_x_max = list(x_L_search_max).index(min(x_L_search_max))
-    i_y_min = list(y_L_search_min).index(min(y_L_search_min))
-    i_y_max = list(y_L_search_max).index(min(y_L_search_max))
-
-    #iteration on the mesh
-    for l in range(i_y_min, i_y_max+1):
-        for c in range(i_x_min, i_x_max+1):
-            #Interpolation of the translation
-            p = np.array([x_L_extended[c], dict_sample['y_L'][l]])
-            p = p - self.u_pf_interpolation
-            #check the new position in the mesh
-            if p[0] <= min(x_L_extended) or max(x_L_extended) <= p[0] or p[1] <= min(dict_sample['y_L']) or max(dict_sample['y_L']) <= p[1] :
-                etai_M_extended[-1-l][c] = 0 #no information because out of the mesh, it is 0
-            else : #look for the nearest nodes
-                #look on x axis
-                i_x = 1
-                while not (x_L_extended[i_x-1] <= p[0] and p[0] < x_L_extended[i_x])  :
-                    i_x = i_x + 1
-                #look on y axis
-                i_y = 1
-                while not (dict_sample['y_L'][i_y-1] <= p[1] and p[1] < dict_sample['y_L'][i_y])  :
-                    i_y = i_y + 1
-                #definition of the nearest nodes
-                p1  = np.array([x_L_extended[i_x-1], dict_sample['y_L'][i_y-1]])
-                p2  = np.array([x_L_extended[i_x]  , dict_sample['y_L'][i_y-1]])
-                p12 = np.array([p[0]                     , dict_sample['y_L'][i_y-1]])
-                p3  = np.array([x_L_extended[i_x-1], dict_sample['y_L'][i_y]  ])
-                p4  = np.array([x_L_extended[i_x]  , dict_sample['y_L'][i_y]  ])
-                p34 = np.array([p[0]                     , dict_sample['y_L'][i_y]  ])
-                #definition of value at those nearest nodes
-                q1  = etai_M_extended_copy[-(i_y-1)-1][i_x-1]
-                q2  = etai_M_extended_copy[-(i_y-1)-1][i_x]
-                q3  = etai_M_extended_copy[-i_y-1][i_x-1]
-                q4  = etai_M_extended_copy[-i_y-1][i_x]
-                #first interpolations, compute intermediate nodes
-                q12 = (q1*(p2[0]-p[0]) + q2*(p[0]-p1[0]))/(p2[0]-p1[0])
-                q34 = (q3*(p4[0]-p[0]) + q4*(p[0]-p3[0]))/(p4[0]-p1[0])
-                #interpolation of p
-                q = (q12*(p[1]-p34[1]) + q34*(p12[1]-p[1]))/(p12[1]-p34[1])
-                #update etai_M
-                if c <= len(dict_sample['x_L'])-i_bc_left-1:
-                    etai_M_extended[-1-l][c] = q
-                    etai_M_extended[-1-l][c+len(dict_sample['x_L'])-1] = q
-                elif 2*len(dict_sample['x_L'])-i_bc_left-1 <= c:
-                    etai_M_extended[-1-l][c] = q
-                    etai_M_extended[-1-l][c-len(dict_sample['x_L'])+1] = q
-                else :
-                    etai_M_extended[-1-l][c] = q
-
-    self.etai_M = etai_M_extended[:,len(dict_sample['x_L'])-i_bc_left-1:2*len(dict_sample['x_L'])-i_bc_left-1].copy()
+            Nothing but the grain gets an updated patch of phase field (see add_etai_M())
+    """
+    grid = dict_sample['grid']
+
+    #extract the zone of the grain at its new position, the columns crossing the periodic limits are unwrapped
+    i_x_min = grid.i_x_nearest_periodic(min(self.l_border_x)-dict_material['w'])
+    i_x_max = grid.i_x_nearest_periodic(max(self.l_border_x)+dict_material['w'])
+    i_y_min = grid.i_y_nearest(min(self.l_border_y)-dict_material['w'])
+    i_y_max = grid.i_y_nearest(max(self.l_border_y)+dict_material['w'])
+    L_c, L_x = grid.columns_periodic(i_x_min, i_x_max)
+    L_l = np.arange(i_y_min, i_y_max+1)
+
+    #source of the nodes, by the inverse of the motion (rotation of -dtheta around the center and translation)
+    M_rot = np.array([[ math.cos(dtheta), math.sin(dtheta)],
+                      [-math.sin(dtheta), math.cos(dtheta)]])
+    dx_M = L_x[np.newaxis,:] - self.center[0]
+    dy_M = grid.y_L[L_l][:,np.newaxis] - self.center[1]
+    x_M = M_rot[0,0]*dx_M + M_rot[0,1]*dy_M + center_source[0]
+    y_M = M_rot[1,0]*dx_M + M_rot[1,1]*dy_M + center_source[1]
+    #periodic condition
+    x_M = grid.wrap_x(x_M)
+    in_mesh = (grid.y_min < y_M) & (y_M < grid.y_max)
+
+    #look for the nearest nodes
+    i_x_M = grid.i_x_cell(x_M)
+    i_y_M = grid.i_y_cell(y_M)
+    f_x_M = (x_M - grid.x_L[i_x_M-1])/grid.dx
+    f_y_M = (y_M - grid.y_L[i_y_M-1])/grid.dy
+    #definition of value at those nearest nodes, the rows are from the top
+    q1_M = self.get_etai_M(grid.row(i_y_M-1), i_x_M-1, rest)
+    q2_M = self.get_etai_M(grid.row(i_y_M-1), i_x_M, rest)
+    q3_M = self.get_etai_M(grid.row(i_y_M), i_x_M-1, rest)
+    q4_M = self.get_etai_M(grid.row(i_y_M), i_x_M, rest)
+    #bilinear interpolation
+    etai_M = (1-f_y_M)*((1-f_x_M)*q1_M + f_x_M*q2_M) + f_y_M*((1-f_x_M)*q3_M + f_x_M*q4_M)
+    #no information because out of the mesh, it is 0
+    etai_M[~in_mesh] = 0
+
+    #update the patch, the rows are from the top
+    self.etai_patch = etai_M[::-1].copy()
+    self.i_etai_row = grid.row(i_y_max)
+    self.i_etai_col = int(L_c[0])
 
 #---------------------------------------------------------------------------
 
-  def move_grain_isophase(self, dict_algorithm, dict_material, dict_sample):
+  def move_grain_interpolation(self, dict_algorithm, dict_material, dict_sample):
     '''
     Move the grain by updating the phase field of the grain.
 
+    The rotation and the translation since the last update are composed in one rigid body motion, applied on the previous patch (see remap_etai_M()).
+
         Input :
             itself (a grain)
             an algorithm dictionnary (a dict)
             a material dictionnary (a dict)
             a sample dictionnary (a dictionnary)
         Output :
-            Nothing but the grain gets an updated attribute (a n_y x n_x numpy array)
+            Nothing but the grain gets an updated patch of phase field (see add_etai_M())
     '''
-    #prepare
-    self.etai_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-
-    #extract zone
-    x_min = min(self.l_eta_0_01_x)
-    x_max = max(self.l_eta_0_01_x)
-    y_min = min(self.l_eta_0_01_y)
-    y_max = max(self.l_eta_0_01_y)
-    #bc ?
-
-
-    #look for this part inside the global mesh
-    #create search list
-    x_L_search_min = abs(np.array(dict_sample['x_L'])-x_min)
-    x_L_search_max = abs(np.array(dict_sample['x_L'])-x_max)
-    y_L_search_min = abs(np.array(dict_sample['y_L'])-y_min)
-    y_L_search_max = abs(np.array(dict_sample['y_L'])-y_max)
-    #get index
-    i_x_min = list(x_L_search_min).index(min(x_L_search_min))
-    i_x_max = list(x_L_search_max).index(min(x_L_search_max))
-    i_y_min = list(y_L_search_min).index(min(y_L_search_min))
-    i_y_max = list(y_L_search_max).index(min(y_L_search_max))
-
-    #iteration on the mesh
-    for l in range(i_y_min, i_y_max+1):
-        for c in range(i_x_min, i_x_max+1):
+    self.remap_etai_M(dict_material, dict_sample, self.center - self.u_pf_interpolation, self.dtheta_pf_interpolation)
 
+#---------------------------------------------------------------------------
 
+  def move_grain_rest_shape(self, dict_algorithm, dict_material, dict_sample):
+    '''
+    Move the grain by updating the phase field of the grain.
 
-
-
-#-------------------------------------------------------------------------------
-
-class Grain_Image(Grain):
-  """
-  An image grain used to onsider the periodic boundary conditions.
-  """
-
-#-------------------------------------------------------------------------------
-
-  def __init__(self, real_grain, position):
-    """
-    Defining the image of a real grain.
+    The phase field is computed from the rest shape of the grain (see cache_etai_rest()) with the rigid body motion since it was saved.
+    The errors of the interpolation are not accumulated over the updates, contrary to move_grain_interpolation().
 
         Input :
-            itself (a grain_image)
-            a real grain (a grain)
+            itself (a grain)
+            an algorithm dictionnary (a dict)
+            a material dictionnary (a dict)
+            a sample dictionnary (a dictionnary)
         Output :
-            Nothing, but an image grain is generated (a grain_image)
-    """
-    real_grain.image = self
-    self.real = real_grain
-    self.position = position
-    self.group = real_grain.group
-    self.radius = real_grain.radius
-    self.r_min = real_grain.radius
-    self.r_max = real_grain.radius
-    self.theta = real_grain.theta
-    self.rho_surf = real_grain.rho_surf
-    self.surface = real_grain.surface
-    self.mass = real_grain.mass
-    self.inertia = real_grain.inertia
-    self.id = real_grain.id
-    self.center = np.array(real_grain.center.copy())
-    self.l_border = real_grain.l_border.copy()
-    self.l_border_x = real_grain.l_border_x.copy()
-    self.l_border_y = real_grain.l_border_y.copy()
-    self.l_r = real_grain.l_r.copy()
-    self.l_theta_r = real_grain.l_theta_r.copy()
-    self.y = real_grain.y
-    self.nu = real_grain.nu
-    self.g = real_grain.g
-    self.fx = real_grain.fx
-    self.fy = real_grain.fy
-    self.v = real_grain.v.copy()
-    self.w = real_grain.w
+            Nothing but the grain gets an updated patch of phase field (see add_etai_M())
+    '''
+    #the current patch is the rest shape if there is not one yet, it describes the grain at the last update
+    if self.etai_rest_patch is None :
+        self.cache_etai_rest()
+        self.center_rest = self.center_rest - self.u_pf_interpolation
+        self.theta_rest = self.theta_rest - self.dtheta_pf_interpolation
+    self.remap_etai_M(dict_material, dict_sample, self.center_rest, self.theta - self.theta_rest, rest = True)
 
 #-------------------------------------------------------------------------------
-
-  def translation(self, U):
-    """Translate an image grain depending on the tempo grain.
-
-        Input :
-            itself (a grain_image)
-            a real grain (a grain)
-        Output :
-            Nothing, but an image grain is generated (a grain_image)
-    """
-    self.center = self.real.center.copy() + U
-    self.l_border = []
-    self.l_border_x = []
-    self.l_border_y = []
-    for i in range(len(self.real.l_border)):
-        self.l_border.append(self.real.l_border[i].copy() + U)
-        self.l_border_x.append(self.real.l_border[i][0] + U[0])
-        self.l_border_y.append(self.real.l_border[i][1] + U[1])
-    #update data
-    self.v = self.real.v.copy()
-    self.w = self.real.w
-    self.theta = self.real.theta
-    self.l_r = self.real.l_r.copy()
-    self.l_theta_r = self.real.l_theta_r.copy()
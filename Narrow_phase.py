@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the narrow phase engines used in the simulation to compute the geometry of a contact between two polygons.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+
+#Own
+import Contact_gg
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def Polygons_SAT(g1, g2, offset):
+  """
+  Compute the overlap between two grains with the separating axis theorem.
+
+  The grains are considered as convex polygons. The candidate axes are the outward normals of the edges of the grain 1 and the inward normals of the edges of the grain 2, the other axes can not give a smaller overlap.
+  Along an axis n, the overlap is the maximum projection of the grain 1 minus the minimum projection of the grain 2. The axis with the minimum overlap is the contact normal (from g1 to g2). If this overlap is negative, the axis separates the grains.
+  The vertices supporting an axis are found by hill-climbing (see Contact_gg.hill_climbing_vertices()), with a large virtual offset along the axis.
+  The axes are sorted by a lower bound of their overlap, computed with the edge and the inscribed radius of the other grain around its center. The search stops when this bound is larger than the minimum overlap found. Each search starts from the vertices supporting the previous axis, the first one from the vertices supporting the line between the centers.
+  The grain 2 is translated by an offset (see Neighborhood.Minimum_image_offset()).
+
+    Input :
+        two grains (two grains)
+        the offset of the grain 2 (a 1 x 2 numpy array)
+    Output :
+        a narrow phase dictionnary with the supporting vertices, the overlap (positive if overlap) and the contact normal (a dict)
+  """
+  l_border_1 = g1.l_border[:-1]
+  l_border_2 = g2.l_border[:-1] + offset
+  center_2 = g2.center + offset
+
+  #outward normals of the edges and inscribed radius around the center
+  L_normal_g = []
+  L_r_in_g = []
+  for l_border, center in [(g1.l_border, g1.center), (g2.l_border + offset, center_2)] :
+      L_edge = np.diff(l_border, axis = 0)
+      L_norm = np.sqrt(L_edge[:,0]**2 + L_edge[:,1]**2)
+      L_cross = (l_border[:-1,0]-center[0])*L_edge[:,1] - (l_border[:-1,1]-center[1])*L_edge[:,0]
+      #counterclockwise or clockwise polygon
+      sign = np.sign(np.sum(L_cross))
+      L_normal = np.column_stack((L_edge[:,1], -L_edge[:,0]))*sign/np.where(L_norm > 0, L_norm, 1)[:,None]
+      L_normal_g.append(L_normal)
+      L_r_in_g.append(np.min(np.abs(L_cross[L_norm > 0])/L_norm[L_norm > 0]))
+
+  #candidate axes and lower bounds of their overlap
+  L_axis = np.concatenate((L_normal_g[0], -L_normal_g[1]))
+  L_lower_bound = np.concatenate((np.sum((l_border_1 - center_2)*L_normal_g[0], axis = 1) + L_r_in_g[1],
+                                  np.sum((l_border_2 - g1.center)*L_normal_g[1], axis = 1) + L_r_in_g[0]))
+  #edges of null length are not axes
+  L_lower_bound[np.all(L_axis == 0, axis = 1)] = np.inf
+
+  #vertices supporting the line between the centers
+  u = (center_2 - g1.center)/np.linalg.norm(center_2 - g1.center)
+  ij = [int(np.argmax(l_border_1 @ u)), int(np.argmin(l_border_2 @ u))]
+  #the virtual offset is large compared to the grains, the nearest vertices are the supporting vertices
+  d_virtual = 1e6*(g1.r_max+g2.r_max)
+
+  d_ij_min = None
+  for i_axis in np.argsort(L_lower_bound):
+      if d_ij_min is not None and L_lower_bound[i_axis] >= d_ij_min :
+          break
+      ij = Contact_gg.hill_climbing_vertices(l_border_1, l_border_2, ij, d_virtual*L_axis[i_axis])
+      d_ij = np.dot(l_border_1[ij[0]]-l_border_2[ij[1]], L_axis[i_axis])
+      if d_ij_min is None or d_ij < d_ij_min :
+          d_ij_min = d_ij
+          ij_min = ij
+          pc_normal = L_axis[i_axis]
+  return {'ij_min' : ij_min, 'd_ij_min' : d_ij_min, 'pc_normal' : pc_normal}
+
+#-------------------------------------------------------------------------------
+
+def Polygons_SDF(g1, g2, offset):
+  """
+  Compute the overlap between two grains with their signed distance grids.
+
+  The vertices of each grain are located in the signed distance grid of the other one (see Grain.signed_distance()).
+  The deepest vertex gives the overlap and the contact normal (from g1 to g2), which is the outward normal of the grain penetrated.
+  The contact points are the deepest vertices of both grains.
+  The grain 2 is translated by an offset (see Neighborhood.Minimum_image_offset()), the vertices are translated back to be located in its grid.
+
+    Input :
+        two grains (two grains)
+        the offset of the grain 2 (a 1 x 2 numpy array)
+    Output :
+        a narrow phase dictionnary with the deepest vertices, the overlap (positive if overlap) and the contact normal (a dict)
+  """
+  L_d_1, L_normal_1 = g2.signed_distance(g1.l_border[:-1] - offset)
+  L_d_2, L_normal_2 = g1.signed_distance(g2.l_border[:-1] + offset)
+  i_min = int(np.argmin(L_d_1))
+  j_min = int(np.argmin(L_d_2))
+  if L_d_2[j_min] <= L_d_1[i_min] :
+      #a vertex of g2 inside g1
+      overlap = -L_d_2[j_min]
+      pc_normal = L_normal_2[j_min]
+  else :
+      #a vertex of g1 inside g2
+      overlap = -L_d_1[i_min]
+      pc_normal = -L_normal_1[i_min]
+  return {'ij_min' : [i_min, j_min], 'd_ij_min' : overlap, 'pc_normal' : pc_normal}
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains functions used in the simulation to determine the neighborhoods of the grains.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class Verlet_List:
+  """
+  The neighborhoods of the grains, rebuilt only when needed.
+
+  The neighborhoods are built with a skin distance (see Update_Neighborhoods()). As long as no grain has moved more than half of the skin since the last build, no contact can be missed.
+  The neighborhoods are also rebuilt if the images or the number of grains have changed.
+  The pairs of grains inside a same clump are not in the neighborhoods.
+  With the minimum image convention, there is no image : the periodic pairs are in the neighborhoods of grains and a grain crossing the periodic boundary does not trigger a rebuild.
+  With the Lees-Edwards conditions, the box is also periodic along the y axis and the images above and below slide along the x axis. The neighborhoods are rebuilt if the sliding or the height of the box have changed too much.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, factor_neighborhood, skin, x_box_min, x_box_max, L_clump, minimum_image, dict_lees_edwards):
+    """
+    Defining the Verlet list.
+
+        Input :
+            itself (a verlet list)
+            a factor to determine the neighborhood window (a float)
+            a skin distance added to the neighborhood window (a float)
+            the limits of the periodic box along the x axis (two floats)
+            a list of clumps (a list)
+            a Boolean, True if the minimum image convention is used instead of the images (a Boolean)
+            a Lees-Edwards dictionnary, None if not used (a dict)
+        Output :
+            Nothing, but the Verlet list is generated (a verlet list)
+    """
+    self.factor_neighborhood = factor_neighborhood
+    self.skin = skin
+    self.x_box_min = x_box_min
+    self.x_box_max = x_box_max
+    self.L_clump = L_clump
+    self.minimum_image = minimum_image
+    self.dict_lees_edwards = dict_lees_edwards
+    self.L_center_build = None
+    self.L_image_build = None
+    self.x_LE_build = None
+    self.H_build = None
+    self.n_build = 0
+
+#-------------------------------------------------------------------------------
+
+  def update(self, L_g, L_g_image):
+    """
+    Rebuild the neighborhoods of the grains if needed.
+
+    The displacement is computed from the center at the last build. A grain crossing the periodic boundary has a large displacement, then the neighborhoods are rebuilt.
+    With the minimum image convention, the displacement is the minimum image of this vector.
+
+        Input :
+            itself (a verlet list)
+            a list of grains (a list)
+            a list of images (a list)
+        Output :
+            a Boolean, True if the neighborhoods have been rebuilt (a Boolean)
+    """
+    L_center = np.array([grain.center for grain in L_g])
+    L_image = [(image.id, image.position) for image in L_g_image]
+    if self.L_center_build is None or len(L_center) != len(self.L_center_build) or L_image != self.L_image_build:
+        build = True
+    elif len(L_center) == 0 :
+        build = False
+    else :
+        L_u = L_center-self.L_center_build
+        if self.minimum_image :
+            L_u[:,0] = L_u[:,0] - (self.x_box_max-self.x_box_min)*np.round(L_u[:,0]/(self.x_box_max-self.x_box_min))
+        u_box = 0
+        if self.dict_lees_edwards is not None :
+            #the sliding and the height of the box move the images
+            dx_LE = self.dict_lees_edwards['x_LE'] - self.x_LE_build
+            dx_LE = dx_LE - (self.x_box_max-self.x_box_min)*np.round(dx_LE/(self.x_box_max-self.x_box_min))
+            H = self.dict_lees_edwards['y_box_max'] - self.dict_lees_edwards['y_box_min']
+            u_box = abs(dx_LE) + abs(H - self.H_build)
+        build = np.max(np.linalg.norm(L_u, axis = 1)) + u_box > self.skin/2
+    if build :
+        Update_Neighborhoods(L_g, L_g_image, self.factor_neighborhood, self.skin, self.x_box_min, self.x_box_max, self.L_clump, self.minimum_image, self.dict_lees_edwards)
+        self.L_center_build = L_center
+        self.L_image_build = L_image
+        if self.dict_lees_edwards is not None :
+            self.x_LE_build = self.dict_lees_edwards['x_LE']
+            self.H_build = self.dict_lees_edwards['y_box_max'] - self.dict_lees_edwards['y_box_min']
+        self.n_build = self.n_build + 1
+    return build
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def Update_Neighborhoods(L_g, L_g_image, factor_neighborhood, skin, x_box_min, x_box_max, L_clump, minimum_image, dict_lees_edwards):
+    """
+    Determine a neighborhood of grains and a neighborhood of images for each grain.
+
+    Two grains are neighbors if the distance between their centers is lower than factor_neighborhood*(r_max_i+r_max_j) + skin.
+    A cell list is used. The cells are larger than the largest neighborhood distance, then the neighbors of a grain are in its cell or in the 8 cells around.
+    The cells are periodic along the x axis. Then, an image is found from the cell of its real grain.
+    With the minimum image convention, the distance between two grains is computed with the nearest periodic copy of grain_j (see Minimum_image_offset()). The box must be larger than two neighborhood distances.
+    With the Lees-Edwards conditions, the cells are also periodic along the y axis. The rows seen across the y boundary are shifted by the sliding of the images and the distance is computed with the nearest image (see Lees_Edwards_offset()).
+    Notice that if there is a potential contact between grain_i and grain_j, grain_i is not in the neighborhood of grain_j.
+    Whereas grain_j is in the neighborhood of grain_i. With i_grain < j_grain.
+    Two grains (or a grain and an image) of a same clump are never neighbors.
+
+        Input :
+            a list of grains (a list)
+            a list of images (a list)
+            a factor to determine the neighborhood window (a float)
+            a skin distance added to the neighborhood window (a float)
+            the limits of the periodic box along the x axis (two floats)
+            a list of clumps (a list)
+            a Boolean, True if the minimum image convention is used instead of the images (a Boolean)
+            a Lees-Edwards dictionnary, None if not used (a dict)
+        Output :
+            Nothing, but the neighborhoods of the grains are updated (two lists)
+    """
+    n_grain = len(L_g)
+    if n_grain == 0 :
+        return
+    L_center = np.array([grain.center for grain in L_g])
+    L_r_max = np.array([grain.r_max for grain in L_g])
+    #clump of the grains, -1 if none
+    L_i_clump = -np.ones(n_grain, dtype = int)
+    for i_clump in range(len(L_clump)):
+        for i_grain in range(n_grain):
+            if L_g[i_grain].group == L_clump[i_clump].name :
+                L_i_clump[i_grain] = i_clump
+
+    #build the cells
+    size_cell = 2*factor_neighborhood*max(L_r_max) + skin
+    n_cell_x = max(1, int((x_box_max-x_box_min)/size_cell))
+    size_cell_x = (x_box_max-x_box_min)/n_cell_x
+    L_i_x = np.floor((L_center[:,0]-x_box_min)/size_cell_x).astype(int) % n_cell_x
+    if dict_lees_edwards is None :
+        L_i_y = np.floor((L_center[:,1]-min(L_center[:,1]))/size_cell).astype(int)
+    else :
+        n_cell_y = max(1, int((dict_lees_edwards['y_box_max']-dict_lees_edwards['y_box_min'])/size_cell))
+        size_cell_y = (dict_lees_edwards['y_box_max']-dict_lees_edwards['y_box_min'])/n_cell_y
+        L_i_y = np.floor((L_center[:,1]-dict_lees_edwards['y_box_min'])/size_cell_y).astype(int) % n_cell_y
+    dict_cell = {}
+    for i_grain in range(n_grain):
+        dict_cell.setdefault((L_i_x[i_grain], L_i_y[i_grain]), []).append(i_grain)
+
+    #images, sorted as in the list
+    dict_image = {}
+    for i_image in range(len(L_g_image)):
+        dict_image[L_g_image[i_image].id] = i_image
+
+    for i_grain in range(n_grain):
+        grain = L_g[i_grain]
+        #candidates from the cell of the grain and the cells around
+        L_j_grain = []
+        if dict_lees_edwards is None :
+            for di_x in range(-1, 2):
+                for di_y in range(-1, 2):
+                    L_j_grain.extend(dict_cell.get(((L_i_x[i_grain]+di_x) % n_cell_x, L_i_y[i_grain]+di_y), []))
+        else :
+            for di_y in range(-1, 2):
+                #the row across the y boundary is shifted by the sliding
+                n_wrap = (L_i_y[i_grain]+di_y) // n_cell_y
+                i_x_shifted = L_i_x[i_grain] - n_wrap*dict_lees_edwards['x_LE']/size_cell_x
+                for i_x in range(int(np.floor(i_x_shifted))-1, int(np.floor(i_x_shifted))+3):
+                    L_j_grain.extend(dict_cell.get((i_x % n_cell_x, (L_i_y[i_grain]+di_y) % n_cell_y), []))
+        L_j_grain = np.unique(np.array(L_j_grain, dtype = int))
+
+        #neighborhood of grains
+        L_j_after = L_j_grain[L_j_grain > i_grain]
+        if L_i_clump[i_grain] != -1 :
+            L_j_after = L_j_after[L_i_clump[L_j_after] != L_i_clump[i_grain]]
+        L_u = L_center[L_j_after]-L_center[i_grain]
+        if dict_lees_edwards is not None :
+            L_u = L_u + Lees_Edwards_offset(L_center[i_grain], L_center[L_j_after], x_box_min, x_box_max, dict_lees_edwards)[0]
+        elif minimum_image :
+            L_u[:,0] = L_u[:,0] - (x_box_max-x_box_min)*np.round(L_u[:,0]/(x_box_max-x_box_min))
+        L_d = np.linalg.norm(L_u, axis = 1)
+        neighborhood = []
+        for j in np.flatnonzero(L_d < factor_neighborhood*(L_r_max[i_grain]+L_r_max[L_j_after]) + skin):
+            neighborhood.append(L_g[L_j_after[j]])
+        grain.neighborhood = neighborhood
+
+        #neighborhood of images
+        L_i_image = []
+        for j_grain in L_j_grain:
+            if L_g[j_grain].id in dict_image and (L_i_clump[i_grain] == -1 or L_i_clump[j_grain] != L_i_clump[i_grain]) :
+                image = L_g_image[dict_image[L_g[j_grain].id]]
+                if np.linalg.norm(grain.center-image.center) < factor_neighborhood*(grain.r_max+image.r_max) + skin:
+                    L_i_image.append(dict_image[L_g[j_grain].id])
+        L_i_image.sort()
+        neighborhood_image = []
+        for i_image in L_i_image:
+            neighborhood_image.append(L_g_image[i_image])
+        grain.neighborhood_image = neighborhood_image
+
+#-------------------------------------------------------------------------------
+
+def Minimum_image_offset(center_1, center_2, x_box_min, x_box_max):
+    """
+    Compute the translation of the nearest periodic copy of a grain.
+
+    The box is periodic along the x axis. The copy of the grain 2 nearest to the grain 1 is at center_2 + offset, the offset being a multiple of the box width.
+
+        Input :
+            the center of the grain 1 (a 1 x 2 numpy array)
+            the center of the grain 2 (a 1 x 2 numpy array)
+            the limits of the periodic box along the x axis (two floats)
+        Output :
+            the offset of the grain 2 (a 1 x 2 numpy array)
+    """
+    return np.array([-(x_box_max-x_box_min)*round((center_2[0]-center_1[0])/(x_box_max-x_box_min)), 0])
+
+#-------------------------------------------------------------------------------
+
+def Lees_Edwards_offset(center_1, L_center_2, x_box_min, x_box_max, dict_lees_edwards):
+    """
+    Compute the translations and the velocities of the nearest Lees-Edwards images of grains.
+
+    The box is periodic along the x and the y axis. The images above (resp. below) the box are shifted by x_LE (resp. -x_LE) along the x axis and move at v_LE (resp. -v_LE).
+    The image of the grain 2 nearest to the grain 1 is at center_2 + offset and its velocity is v_2 + offset_v.
+    The nearest row of images is taken along the y axis first, then the image is the nearest one if it is closer than a half height of the box.
+
+        Input :
+            the center of the grain 1 (a 1 x 2 numpy array)
+            the centers of the grains 2 (a n x 2 numpy array)
+            the limits of the periodic box along the x axis (two floats)
+            a Lees-Edwards dictionnary (a dict)
+        Output :
+            the offsets of the grains 2 (a n x 2 numpy array)
+            the velocity offsets of the grains 2 (a n x 2 numpy array)
+    """
+    H = dict_lees_edwards['y_box_max']-dict_lees_edwards['y_box_min']
+    L_n_y = -np.round((L_center_2[:,1]-center_1[1])/H)
+    L_offset = np.zeros((len(L_center_2), 2))
+    L_offset[:,1] = L_n_y*H
+    L_offset[:,0] = L_n_y*dict_lees_edwards['x_LE']
+    L_offset[:,0] = L_offset[:,0] - (x_box_max-x_box_min)*np.round((L_center_2[:,0]+L_offset[:,0]-center_1[0])/(x_box_max-x_box_min))
+    L_offset_v = np.zeros((len(L_center_2), 2))
+    L_offset_v[:,0] = L_n_y*dict_lees_edwards['v_LE']
+    return L_offset, L_offset_v
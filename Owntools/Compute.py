@@ -34,38 +34,27 @@ def Compute_Emec(dict_material, dict_sample, dict_sollicitations):
     #Initialisation
     Emec_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
     #contact grain-grain part
-    for contact in dict_sample['L_contact']:
+    for contact in dict_sample['contact_registry'].L_contact('gg'):
         #extract a spatial zone
         x_min = min(min(contact.g1.l_border_x),min(contact.g2.l_border_x))-dict_material['w']
         x_max = max(max(contact.g1.l_border_x),max(contact.g2.l_border_x))+dict_material['w']
         y_min = min(min(contact.g1.l_border_y),min(contact.g2.l_border_y))-dict_material['w']
         y_max = max(max(contact.g1.l_border_y),max(contact.g2.l_border_y))+dict_material['w']
         #look for this part inside the global mesh
-        #create search list
-        x_L_search_min = abs(np.array(dict_sample['x_L'])-x_min)
-        x_L_search_max = abs(np.array(dict_sample['x_L'])-x_max)
-        y_L_search_min = abs(np.array(dict_sample['y_L'])-y_min)
-        y_L_search_max = abs(np.array(dict_sample['y_L'])-y_max)
-        #get index
-        i_x_min = list(x_L_search_min).index(min(x_L_search_min))
-        i_x_max = list(x_L_search_max).index(min(x_L_search_max))
-        i_y_min = list(y_L_search_min).index(min(y_L_search_min))
-        i_y_max = list(y_L_search_max).index(min(y_L_search_max))
-        #Initialisation
-        sum_min_etai = 0
+        i_x_min, i_x_max, i_y_min, i_y_max = dict_sample['grid'].i_box(x_min, x_max, y_min, y_max)
+        #minimum of etai on the zone, read in the patches of the grains
+        L_row = dict_sample['grid'].row(np.arange(i_y_min, i_y_max))
+        L_col = np.arange(i_x_min, i_x_max)
+        min_etai_M = np.minimum(contact.g1.get_etai_M(L_row[:,np.newaxis], L_col[np.newaxis,:]), contact.g2.get_etai_M(L_row[:,np.newaxis], L_col[np.newaxis,:]))
         #compute the sum over the sample of the minimum of etai
-        for l in range(i_y_min, i_y_max):
-            for c in range(i_x_min, i_x_max):
-                sum_min_etai = sum_min_etai + min(contact.g1.etai_M[-1-l][c],contact.g2.etai_M[-1-l][c])
+        sum_min_etai = np.sum(min_etai_M)
         if sum_min_etai != 0 :
             #compute the variable e_mec
             e_mec = dict_sollicitations['alpha']/sum_min_etai
         else :
             e_mec = 0
         #compute the distribution of the mechanical energy
-        for l in range(i_y_min, i_y_max):
-            for c in range(i_x_min, i_x_max):
-                Emec_M[-1-l][c] = Emec_M[-1-l][c] + e_mec*min(contact.g1.etai_M[-1-l][c],contact.g2.etai_M[-1-l][c])
+        Emec_M[np.ix_(L_row, L_col)] = Emec_M[np.ix_(L_row, L_col)] + e_mec*min_etai_M
 
     #Update element in dictionnary
     dict_sample['Emec_M'] = Emec_M
@@ -18,7 +18,6 @@ import imageio
 #Own
 import Grain
 import Contact_gg
-import Contact_gimage
 
 #-------------------------------------------------------------------------------
 #functions
@@ -131,10 +130,6 @@ def Plot_Config_Sheared(dict_sample,i):
             if grain.group == L_group[i_group] :
                 plt.plot(grain.l_border_x,grain.l_border_y,L_color_group[i_group])
                 plt.plot([grain.center[0], grain.l_border_x[0]],[grain.center[1], grain.l_border_y[0]],L_color_group[i_group])
-    for grain in dict_sample['L_g_image']:
-        for i_group in range(len(L_group)):
-            if grain.group == L_group[i_group]:
-                plt.plot(grain.l_border_x,grain.l_border_y,'-.', color = L_color_group[i_group])
     plt.title('Solute and grains')
     plt.axis('equal')
 
@@ -205,10 +200,6 @@ def Plot_Config_Confinement(dict_sample,i):
         for i_group in range(len(L_group)):
             if grain.group == L_group[i_group] :
                 plt.plot(grain.l_border_x,grain.l_border_y,L_color_group[i_group])
-    for grain in dict_sample['L_g_image']:
-        for i_group in range(len(L_group)):
-            if grain.group == L_group[i_group]:
-                plt.plot(grain.l_border_x,grain.l_border_y,'-.', color = L_color_group[i_group])
     plt.axis('equal')
     plt.savefig('Debug/Confinement/Config_'+str(i)+'.png')
     plt.close(1)
@@ -232,12 +223,9 @@ def Plot_Contact(dict_sample,i):
         for i_group in range(len(L_group)):
             if grain.group == L_group[i_group] :
                 plt.plot(grain.l_border_x,grain.l_border_y, L_color_group[i_group])
-    for grain in dict_sample['L_g_image']:
-        for i_group in range(len(L_group)):
-            if grain.group == L_group[i_group]:
-                plt.plot(grain.l_border_x,grain.l_border_y,'-.', color = L_color_group[i_group])
-    for contact in dict_sample['L_contact']+dict_sample['L_contact_gimage']:
-        plt.plot([contact.g1.center[0], contact.g2.center[0]], [contact.g1.center[1], contact.g2.center[1]],'k')
+    for contact in dict_sample['contact_registry'].L_contact('gg'):
+        #the grain 2 is at its nearest periodic copy
+        plt.plot([contact.g1.center[0], contact.g2.center[0]+contact.offset[0]], [contact.g1.center[1], contact.g2.center[1]+contact.offset[1]],'k')
     plt.axis('equal')
     plt.savefig('Debug/Shear/Contact_'+str(i)+'.png')
     plt.close(1)
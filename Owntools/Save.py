@@ -14,7 +14,6 @@ import pickle
 
 #Own
 import Contact_gg
-import Contact_gimage
 import Grain
 import Report
 
@@ -15,14 +15,116 @@ import random
 import math
 
 #Own
-from Grain import Grain, Grain_Image
-import Contact_gg
-import Contact_gimage
+from Grain import Grain, Clump
+import Contact_registry
+import Neighborhood
+import DEM_engine
 import Owntools
 import Owntools.Plot
 import PhaseField
 
 
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class Tracker_Shear:
+  """
+  The trackers of the shear, called at the end of each iteration of the DEM engine.
+
+  The phase fields are moved with the grains and the solute is moved out of the grains every i_update_pf_solute iterations.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm, dict_material, dict_sample, dict_sollicitations, dict_tracker, controller, L_id_crossed_y, simulation_report):
+    """
+    Defining the tracker.
+
+        Input :
+            itself (a tracker)
+            an algorithm dictionnary (a dict)
+            a material dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a sollicitations dictionnary (a dict)
+            a tracker dictionnary (a dict)
+            the controller shearing the sample (a controller)
+            a list of the grains crossing the y limits since the last phase field update, emptied by the tracker (a list)
+            a simultion report (a report)
+        Output :
+            Nothing, but the tracker is generated (a tracker)
+    """
+    self.dict_algorithm = dict_algorithm
+    self.dict_material = dict_material
+    self.dict_sample = dict_sample
+    self.dict_sollicitations = dict_sollicitations
+    self.dict_tracker = dict_tracker
+    self.controller = controller
+    self.L_id_crossed_y = L_id_crossed_y
+    self.simulation_report = simulation_report
+
+#-------------------------------------------------------------------------------
+
+  def track(self, engine):
+    """
+    Update the trackers and the phase fields, print and plot.
+
+        Input :
+            itself (a tracker)
+            the DEM engine (a DEM engine)
+        Output :
+            Nothing, but the tracker dictionnary and the phase fields are updated
+    """
+    dict_sample = self.dict_sample
+    dict_algorithm = self.dict_algorithm
+    #compute compacity
+    Surface_g = 0
+    for grain in dict_sample['L_g']:
+        Surface_g = Surface_g + grain.surface
+
+    #tracker
+    self.dict_tracker['shear_L'].append(self.controller.Shear_strain)
+    self.dict_tracker['compacity_L'].append(Surface_g/((dict_sample['y_box_max']-dict_sample['y_box_min'])*(dict_sample['x_box_max']-dict_sample['x_box_min'])))
+    self.dict_tracker['vertical_force_before_L'].append(self.controller.Fv)
+    self.dict_tracker['vertical_force_after_L'].append(self.controller.Fv)
+    self.dict_tracker['dy_top_L'].append(self.controller.dy_top)
+    self.dict_tracker['mu_sample_L'].append(self.controller.mu_sample)
+
+    #move solute out of grains
+    if engine.i_DEM % dict_algorithm['i_update_pf_solute'] == 0:
+        #move pf for each grain with rbm
+        self.simulation_report.tic_2nd_tempo()
+        for i_grain in range(len(dict_sample['L_g'])) :
+            if dict_sample['L_g'][i_grain].id in self.L_id_crossed_y :
+                #the mesh is not periodic along the y axis, the phase field is built again
+                dict_sample['L_g'][i_grain].build_etai_M(dict_algorithm, self.dict_material, dict_sample)
+                dict_sample['L_g'][i_grain].u_pf_interpolation = np.array([0,0])
+                dict_sample['L_g'][i_grain].dtheta_pf_interpolation = 0
+            elif dict_algorithm['method_pf_update'] == 'interpolation' :
+                dict_sample['L_g'][i_grain].move_grain_interpolation(dict_algorithm, self.dict_material, dict_sample)
+                dict_sample['L_g'][i_grain].u_pf_interpolation = np.array([0,0])
+                dict_sample['L_g'][i_grain].dtheta_pf_interpolation = 0
+            elif dict_algorithm['method_pf_update'] == 'rest_shape' :
+                #the motion is taken from the rest shape, not from the last update
+                dict_sample['L_g'][i_grain].move_grain_rest_shape(dict_algorithm, self.dict_material, dict_sample)
+                dict_sample['L_g'][i_grain].u_pf_interpolation = np.array([0,0])
+                dict_sample['L_g'][i_grain].dtheta_pf_interpolation = 0
+        self.L_id_crossed_y.clear()
+        #update etai
+        for etai in dict_sample['L_etai']:
+            etai.update_etai_M(dict_sample['L_g'])
+        self.simulation_report.tac_2nd_tempo('Update phase fields')
+        #move solute
+        Owntools.Interpolate_solute_out_grains(dict_algorithm, dict_sample)
+
+    #debug print and plot
+    if engine.i_DEM % dict_algorithm['i_print_plot'] == 0:
+        print('i_DEM',engine.i_DEM,': Confinement',int(100*self.controller.Fv/self.dict_sollicitations['Vertical_Confinement_Force']),'% Shear',round(self.controller.Shear_strain,4),'('+str(int(100*self.controller.Shear_strain/self.dict_sollicitations['Shear_strain_target']))+' %)')
+        if dict_algorithm['Debug_DEM'] :
+            Owntools.Plot.Plot_Config_Sheared(dict_sample, engine.i_DEM) #change function here
+            for etai in dict_sample['L_etai']:
+                Owntools.Plot.Plot_Config_Sheared_etai(dict_sample, engine.i_DEM, etai)
+
 #-------------------------------------------------------------------------------
 #Function
 #-------------------------------------------------------------------------------
@@ -31,6 +133,10 @@ def DEM_shear_load(dict_algorithm, dict_geometry, dict_material, dict_sample, di
     """
     Loading the granular system with vertical load and shear.
 
+    Two modes are available (see dict_algorithm['shear_mode']) :
+        - groups : the Top group is sheared over the Bottom group and the confinement is applied on the Top group
+        - lees_edwards : the grains are in a periodic cell, the images above and below the cell slide at the shear velocity (see Neighborhood.Lees_Edwards_offset()). There is no wall group and the confinement is applied on the height of the cell
+
         Input :
             an algorithm dictionnary (a dict)
             a geometry dictionnary (a dict)
@@ -42,9 +148,9 @@ def DEM_shear_load(dict_algorithm, dict_geometry, dict_material, dict_sample, di
         Output :
             Nothing, but sample dictionnary is updated
     """
+    if dict_algorithm['method_pf_update'] not in ['interpolation', 'rest_shape'] :
+        raise ValueError("method_pf_update must be 'interpolation' or 'rest_shape', not "+repr(dict_algorithm['method_pf_update']))
     dict_algorithm['i_DEM'] = 0
-    i_DEM_0 = dict_algorithm['i_DEM']
-    Shear_strain = 0
     #compute the sample height
     min_value = min(dict_sample['L_g'][0].l_border_y)
     max_value = max(dict_sample['L_g'][0].l_border_y)
@@ -56,29 +162,40 @@ def DEM_shear_load(dict_algorithm, dict_geometry, dict_material, dict_sample, di
     Sample_height = max_value - min_value
     #compute the inertial number
     dict_sample['I_number'] = dict_sollicitations['Shear_velocity']/Sample_height*2*dict_geometry['R_mean']*math.sqrt(dict_material['rho_surf']*dict_sollicitations['Vertical_Confinement_Linear_Force'])
+    if dict_algorithm['density_scaling'] :
+        Density_scaling(dict_algorithm, dict_material, dict_sample, simulation_report)
     simulation_report.write_and_print('Inertial number : '+str(dict_sample['I_number'])+'\n','Inertial number : '+str(dict_sample['I_number']))
     #must be under 10-3 to consider critical state
     simulation_report.write_and_print('Expected number of iterations : '+str(int(dict_sollicitations['Shear_strain_target']*Sample_height/(dict_sollicitations['Shear_velocity']*dict_algorithm['dt_DEM'])))+'\n\n','Expected number of iterations : '+str(int(dict_sollicitations['Shear_strain_target']*Sample_height/(dict_sollicitations['Shear_velocity']*dict_algorithm['dt_DEM'])))+'\n')
-    #Switch on tracks
-    for grain in dict_sample['L_g'] :
-        #track rigid body motion to move pf
-        if dict_algorithm['method_pf_update'] == 'interpolation' :
-            grain.track_rbm_pf_interpolation = True
-            grain.u_pf_interpolation = np.array([0,0])
-            grain.dtheta_pf_interpolation = 0
-        #track total displacement of grains (plot)
-        grain.track_u = True
-        grain.total_ux = 0
-        grain.total_uy = 0
-    DEM_loop_statut = True
+    #Reset tracks
+    grain_store = dict_sample['grain_store']
+    #track rigid body motion to move pf
+    grain_store.u_pf_interpolation[:] = 0
+    grain_store.dtheta_pf_interpolation[:] = 0
+    #track total displacement of grains (plot)
+    grain_store.total_u[:] = 0
+    #groups in the store
+    if dict_algorithm['shear_mode'] == 'lees_edwards' :
+        #homogeneous shear, there is no wall group
+        for grain in dict_sample['L_g']:
+            grain.group = 'Current'
+    L_i_current = grain_store.L_i_group('Current')
+    L_g_current = [grain for grain in dict_sample['L_g'] if grain.group == 'Current']
+    clump_top = Clump(grain_store, 'Top', False)
+    clump_bottom = Clump(grain_store, 'Bottom', True)
+    #the grains of the static clump never cross the periodic boundaries
+    L_g_mobile = [grain for grain in dict_sample['L_g'] if not clump_bottom.mask[grain.i_store]]
     #Initialisation
-    dict_sample['L_contact'] = []
-    dict_sample['L_contact_ij'] = []
-    dict_sample['L_contact_gimage'] = []
-    dict_sample['L_contact_ij_gimage'] = []
+    dict_sample['contact_registry'] = Contact_registry.ContactRegistry()
     dict_sample['id_contact'] = 0
-    dict_sample['L_g_image'] = []
-    dict_sample['L_i_image'] = []
+    if dict_algorithm['shear_mode'] == 'lees_edwards' :
+        dict_sample['dict_lees_edwards'] = {'y_box_min' : dict_sample['y_box_min'], 'y_box_max' : dict_sample['y_box_max'], 'x_LE' : 0, 'v_LE' : dict_sollicitations['Shear_velocity']}
+        #initial linear velocity profile
+        H = dict_sample['y_box_max'] - dict_sample['y_box_min']
+        grain_store.v[L_i_current,0] = grain_store.v[L_i_current,0] + dict_sollicitations['Shear_velocity']*((grain_store.center[L_i_current,1]-dict_sample['y_box_min'])/H - 1/2)
+    else :
+        dict_sample['dict_lees_edwards'] = None
+    verlet_list = Neighborhood.Verlet_List(dict_algorithm['factor_neighborhood'], dict_algorithm['skin_neighborhood'], dict_sample['x_box_min'], dict_sample['x_box_max'], [clump_top, clump_bottom], True, dict_sample['dict_lees_edwards'])
     #trackers
     dict_tracker['vertical_force_before_L'] = []
     dict_tracker['vertical_force_after_L'] = []
@@ -89,182 +206,33 @@ def DEM_shear_load(dict_algorithm, dict_geometry, dict_material, dict_sample, di
     dict_tracker['compacity_L'] = []
     dict_tracker['mu_sample_L'] = []
 
-    while DEM_loop_statut :
-
-        dict_algorithm['i_DEM'] = dict_algorithm['i_DEM'] + 1
-
-        #create image
-        for grain in dict_sample['L_g']:
-            #left wall
-            if (grain.center[0] - dict_sample['x_box_min']) < dict_algorithm['d_to_image'] :
-                if grain.id in dict_sample['L_i_image'] : #image exists
-                    image = dict_sample['L_g_image'][dict_sample['L_i_image'].index(grain.id)]
-                    if image.position == 'right' :
-                        image.position = 'left'
-                else : #image does not exist
-                    dict_sample['L_g_image'].append(Grain_Image(grain, 'left'))
-                    dict_sample['L_i_image'].append(grain.id)
-            #right wall
-            elif (dict_sample['x_box_max'] - grain.center[0]) < dict_algorithm['d_to_image'] :
-                if grain.id in dict_sample['L_i_image'] : #image exists
-                    image = dict_sample['L_g_image'][dict_sample['L_i_image'].index(grain.id)]
-                    if image.position == 'left' :
-                        image.position = 'right'
-                else : #image does not exist
-                    dict_sample['L_g_image'].append(Grain_Image(grain, 'right'))
-                    dict_sample['L_i_image'].append(grain.id)
-            #center
-            else :
-                if grain.id in dict_sample['L_i_image'] : #image exists
-                    i_toremove = dict_sample['L_i_image'].index(grain.id)
-                    dict_sample['L_g_image'].pop(i_toremove)
-                    dict_sample['L_i_image'].pop(i_toremove)
-                    L_i_toremove = []
-                    for ij_gimage in dict_sample['L_contact_ij_gimage'] :
-                        if grain.id == ij_gimage[1] :
-                            L_i_toremove.append(dict_sample['L_contact_ij_gimage'].index(ij_gimage))
-                    L_i_toremove.reverse()
-                    for i_toremove in L_i_toremove:
-                        dict_sample['L_contact_gimage'].pop(i_toremove)
-                        dict_sample['L_contact_ij_gimage'].pop(i_toremove)
-        #translate image
-        for image in dict_sample['L_g_image']:
-            if image.position == 'left' :
-                image.translation(np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0]))
-            elif image.position == 'right' :
-                image.translation(np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0]))
-
-        #Contact detection
-        if (dict_algorithm['i_DEM']-i_DEM_0-1) % dict_algorithm['i_update_neighborhoods']  == 0:
-            Contact_gg.Update_Neighborhoods(dict_algorithm, dict_sample)
-            Contact_gimage.Update_Neighborhoods(dict_algorithm, dict_sample)
-        Contact_gg.Grains_contact_Neighborhoods(dict_sample,dict_material)
-        Contact_gimage.Grains_contact_Neighborhoods(dict_sample,dict_material)
-
-        #Sollicitation computation
-        for grain in dict_sample['L_g']:
-             grain.init_F_control(dict_sollicitations['gravity'])
-        for contact in dict_sample['L_contact']+dict_sample['L_contact_gimage']:
-            #do not consider the contact inside top and bottom groups
-            if not (contact.g1.group == 'Top' and contact.g2.group =='Top') and not (contact.g1.group == 'Bottom' and contact.g2.group =='Bottom') :
-                contact.normal()
-                contact.tangential(dict_algorithm['dt_DEM'])
-
-        #Move grains (only Current)
-        for grain in dict_sample['L_g']:
-            if grain.group == 'Current' :
-                grain.euler_semi_implicite(dict_algorithm['dt_DEM'])
-
-        #periodic condition
-        for grain in dict_sample['L_g']:
-            #left wall
-            if grain.center[0] < dict_sample['x_box_min'] :
-                grain.center = grain.center.copy() + np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0])
-                for i in range(len(grain.l_border)):
-                    grain.l_border[i] = grain.l_border[i].copy() + np.array([dict_sample['x_box_max'] - dict_sample['x_box_min'], 0])
-                    grain.l_border_x[i] = grain.l_border_x[i].copy() + dict_sample['x_box_max'] - dict_sample['x_box_min']
-                #contact gimage needed to be convert into gg
-                Owntools.convert_gimage_into_gg(grain, dict_sample, dict_material)
-                #contact gg needed to be convert into gimage
-                Owntools.convert_gg_into_gimage(grain, dict_sample, dict_material)
-            #right wall
-            elif grain.center[0] > dict_sample['x_box_max'] :
-                grain.center = grain.center.copy() + np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0])
-                for i in range(len(grain.l_border)):
-                    grain.l_border[i] = grain.l_border[i].copy() + np.array([dict_sample['x_box_min'] - dict_sample['x_box_max'], 0])
-                    grain.l_border_x[i] = grain.l_border_x[i].copy() + dict_sample['x_box_min'] - dict_sample['x_box_max']
-                #contact gimage needed to be convert into gg
-                Owntools.convert_gimage_into_gg(grain, dict_sample, dict_material)
-                #contact gg needed to be convert into gimage
-                Owntools.convert_gg_into_gimage(grain, dict_sample, dict_material)
-
-        #Compute the sample friction coefficient
-        sum_fx_top = 0
-        sum_fy_top = 0
-        for grain in dict_sample['L_g']:
-            if grain.group == 'Top':
-                sum_fx_top = sum_fx_top + grain.fx
-                sum_fy_top = sum_fy_top + grain.fy
-        if sum_fy_top != 0 : #else keep same value
-            mu_sample = abs(sum_fx_top / sum_fy_top)
-
-        #Control the top group to have the pressure target
-        dy_top, Fv = Control_Top_PID(dict_algorithm, dict_sollicitations['Vertical_Confinement_Force'], dict_sample['L_g'])
+    #DEM engine
+    contact_law = DEM_engine.Contact_Law_Store(dict_algorithm, dict_material, dict_sample, dict_sollicitations, verlet_list)
+    #only Current grains are moved
+    integrator = DEM_engine.Integrator_Store(grain_store, L_g_current, None)
+    if dict_algorithm['shear_mode'] == 'lees_edwards' :
+        #periodic condition, the contacts are kept (minimum image convention)
+        periodic = DEM_engine.Lees_Edwards(dict_sample, L_g_mobile)
+        L_id_crossed_y = periodic.L_id_crossed_y
+        #Control the height of the cell to have the pressure target and slide the images
+        controller = DEM_engine.Control_Height_Lees_Edwards(dict_algorithm, dict_sample, dict_sollicitations['Vertical_Confinement_Force'], L_g_current, dict_sollicitations['Shear_velocity'], contact_law)
+    else :
+        #periodic condition, the contacts are kept (minimum image convention)
+        periodic = DEM_engine.Periodic_Minimum_Image(dict_sample, L_g_mobile)
+        L_id_crossed_y = []
+        #Control the top group to have the pressure target and shear it
+        controller = DEM_engine.Control_Top_Clump(dict_algorithm, dict_sample, dict_sollicitations['Vertical_Confinement_Force'], clump_top, dict_sollicitations['Shear_velocity'], Sample_height)
+    L_controller = [controller]
+    if dict_algorithm['adaptive_dt'] :
+        L_controller.append(DEM_engine.Adaptive_Time_Step(dict_algorithm, grain_store, L_i_current + list(clump_top.L_i_grain)))
+    tracker = Tracker_Shear(dict_algorithm, dict_material, dict_sample, dict_sollicitations, dict_tracker, controller, L_id_crossed_y, simulation_report)
+    L_stop = [DEM_engine.Stop_Shear_Strain(controller, dict_sollicitations['Shear_strain_target']), DEM_engine.Stop_No_Grain(dict_sample['L_g']), DEM_engine.Stop_Max_Iteration(dict_sollicitations['i_DEM_stop'])]
+    engine = DEM_engine.DEM_Engine(dict_algorithm['i_DEM'], dict_algorithm['dt_DEM'], contact_law, integrator, [periodic], L_controller, [tracker], L_stop)
+    engine.run()
+    dict_algorithm['i_DEM'] = engine.i_DEM
+    dict_algorithm['dt_DEM'] = engine.dt_DEM
 
-        #Shear the top group and apply confinement force
-        for grain in dict_sample['L_g'] :
-            if grain.group == 'Top':
-                grain.move_as_a_group(np.array([dict_sollicitations['Shear_velocity']*dict_algorithm['dt_DEM'], dy_top]), dict_algorithm['dt_DEM'])
-        dict_sample['y_box_max'] = dict_sample['y_box_max'] + dy_top
-        Shear_strain = Shear_strain + dict_sollicitations['Shear_velocity']*dict_algorithm['dt_DEM'] / Sample_height #Update shear strain
-
-        #compute compacity
-        Surface_g = 0
-        for grain in dict_sample['L_g']:
-            Surface_g = Surface_g + grain.surface
-
-        #tracker
-        dict_tracker['shear_L'].append(Shear_strain)
-        dict_tracker['compacity_L'].append(Surface_g/((dict_sample['y_box_max']-dict_sample['y_box_min'])*(dict_sample['x_box_max']-dict_sample['x_box_min'])))
-        dict_tracker['vertical_force_before_L'].append(sum_fy_top)
-        dict_tracker['vertical_force_after_L'].append(Fv)
-        dict_tracker['dy_top_L'].append(dy_top)
-        dict_tracker['mu_sample_L'].append(mu_sample)
-
-        #move solute out of grains
-        if dict_algorithm['i_DEM'] % dict_algorithm['i_update_pf_solute'] == 0:
-            #move pf for each grain with rbm
-            simulation_report.tic_2nd_tempo()
-            for i_grain in range(len(dict_sample['L_g'])) :
-                if dict_algorithm['method_pf_update'] == 'interpolation' :
-                    dict_sample['L_g'][i_grain].move_grain_interpolation(dict_algorithm, dict_material, dict_sample)
-                    dict_sample['L_g'][i_grain].u_pf_interpolation = np.array([0,0])
-                    dict_sample['L_g'][i_grain].dtheta_pf_interpolation = 0
-                elif dict_algorithm['method_pf_update'] == 'isophases' :
-                    dict_sample['L_g'][i_grain].move_grain_isophase(dict_algorithm, dict_material, dict_sample)
-            #update etai
-            for etai in dict_sample['L_etai']:
-                etai.update_etai_M(dict_sample['L_g'])
-            simulation_report.tac_2nd_tempo('Update phase fields')
-            #move solute
-            Owntools.Interpolate_solute_out_grains(dict_algorithm, dict_sample)
-
-        #pf simulation
-        #if dict_algorithm['i_DEM'] % dict_algorithm['i_pf_simulation'] == 0:
-        if False:
-            #move pf for each grain with rbm
-            simulation_report.tic_2nd_tempo()
-            for i_grain in range(len(dict_sample['L_g'])) :
-                #add bc
-                dict_sample['L_g'][i_grain].move_grain_interpolation(dict_algorithm, dict_material, dict_sample)
-                dict_sample['L_g'][i_grain].u_pf_interpolation = np.array([0,0])
-                dict_sample['L_g'][i_grain].dtheta_pf_interpolation = 0
-            #update etai
-            for etai in dict_sample['L_etai']:
-                etai.update_etai_M(dict_sample['L_g'])
-            simulation_report.tac_2nd_tempo('Update phase fields')
-            #move solute
-            Owntools.Interpolate_solute_out_grains(dict_algorithm, dict_sample)
-            #run pf simulation
-            simulation_report.tic_2nd_tempo()
-            pf_simulation()
-            simulation_report.tac_2nd_tempo('Run phase field simulation')
-
-        #debug print and plot
-        if dict_algorithm['i_DEM'] % dict_algorithm['i_print_plot'] == 0:
-            print('i_DEM',dict_algorithm['i_DEM'],': Confinement',int(100*Fv/dict_sollicitations['Vertical_Confinement_Force']),'% Shear',round(Shear_strain,4),'('+str(int(100*Shear_strain/dict_sollicitations['Shear_strain_target']))+' %)')
-            if dict_algorithm['Debug_DEM'] :
-                Owntools.Plot.Plot_Config_Sheared(dict_sample, dict_algorithm['i_DEM']) #change function here
-                for etai in dict_sample['L_etai']:
-                    Owntools.Plot.Plot_Config_Sheared_etai(dict_sample, dict_algorithm['i_DEM'], etai)
-
-        #Check stop conditions for DEM
-        if Shear_strain >= dict_sollicitations['Shear_strain_target'] : #strain target reached
-             DEM_loop_statut = False
-        if dict_sample['L_g'] == []: #no more grains
-            DEM_loop_statut = False
-        if dict_algorithm['i_DEM'] >= dict_sollicitations['i_DEM_stop'] : #too many iterations
-            DEM_loop_statut = False
+    simulation_report.write('Neighborhoods built '+str(verlet_list.n_build)+' times in '+str(dict_algorithm['i_DEM'])+' DEM steps\n')
 
     #plot total displacement field
     Owntools.Plot.Plot_total_U(dict_sample)
@@ -276,32 +244,38 @@ def DEM_shear_load(dict_algorithm, dict_geometry, dict_material, dict_sample, di
 
 #-------------------------------------------------------------------------------
 
-def Control_Top_PID(dict_algorithm, Force_target, L_g):
+def Density_scaling(dict_algorithm, dict_material, dict_sample, simulation_report):
     """
-    Control the upper wall to apply force.
+    Scale the density of the grains to reduce the number of iterations of a quasi-static shear.
+
+    The inertial number and the critical time step grow as the square root of the density.
+    The density is multiplied by the largest factor keeping the inertial number under its target (no scaling if it is already over). The time step and its maximum (see adaptive_dt) are scaled as the critical one.
 
-    A PID corrector is applied.
         Input :
             an algorithm dictionnary (a dict)
-            a confinement value (a float)
-            a list of grain (a list)
+            a material dictionnary (a dict)
+            a sample dictionnary (a dict)
+            a simultion report (a report)
         Output :
-            the displacement of the top group (a float)
-            a force applied on the top group before control (a float)
+            Nothing, but the dictionnaries and the grains are updated
     """
-    #compute vertical force applied on top group
-    F = 0
-    for grain in L_g :
-        if grain.group == 'Top':
-            F = F + grain.fy
-    #compare with the target value
-    error = F - Force_target #to have dy_top < 0 is F < Force_target
-    #corrector
-    ki = 0
-    kd = 0
-    dy_top = error * dict_algorithm['kp']
-    #compare with maximum value
-    if abs(dy_top) > dict_algorithm['dy_top_max'] :
-        dy_top = np.sign(dy_top)*dict_algorithm['dy_top_max']
-
-    return dy_top, F
+    factor = max(1, (dict_algorithm['I_number_target']/dict_sample['I_number'])**2)
+    dict_sample['density_factor'] = factor
+    if factor == 1 :
+        simulation_report.write_and_print('No density scaling, the inertial number '+str(dict_sample['I_number'])+' is already over the target '+str(dict_algorithm['I_number_target'])+'\n','No density scaling, the inertial number '+str(dict_sample['I_number'])+' is already over the target '+str(dict_algorithm['I_number_target']))
+        return
+    #grains
+    grain_store = dict_sample['grain_store']
+    grain_store.mass[:] = grain_store.mass*factor
+    grain_store.inertia[:] = grain_store.inertia*factor
+    for grain in dict_sample['L_g']:
+        grain.rho_surf = grain.rho_surf*factor
+    #material and algorithm
+    dict_material['rho'] = dict_material['rho']*factor
+    dict_material['rho_surf'] = dict_material['rho_surf']*factor
+    dict_algorithm['dt_DEM_crit'] = dict_algorithm['dt_DEM_crit']*math.sqrt(factor)
+    dict_algorithm['dt_DEM'] = dict_algorithm['dt_DEM']*math.sqrt(factor)
+    dict_algorithm['dt_DEM_min'] = dict_algorithm['dt_DEM_min']*math.sqrt(factor)
+    dict_algorithm['dt_DEM_max'] = dict_algorithm['dt_DEM_max']*math.sqrt(factor)
+    dict_sample['I_number'] = dict_sample['I_number']*math.sqrt(factor)
+    simulation_report.write_and_print('Density scaled by '+str(factor)+'\n','Density scaled by '+str(factor))
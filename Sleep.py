@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the sleeping grains deactivation used in the DEM loops.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class Sleep_Manager:
+  """
+  Put to sleep the quiescent grains and wake them up.
+
+  A grain is quiet if its velocity, its angular velocity and its net force are below thresholds.
+  After n_step_sleep quiet steps, the grain is put to sleep : its velocities are set to zero and its net force is saved. A sleeping grain is not moved and its contacts with other sleeping grains are not detected again.
+  A sleeping grain wakes up if its net force changes by more than a tolerance, i.e. if the contact force of a neighbor changes.
+  The state is saved in the attributes asleep and n_quiet of the grains.
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, dict_algorithm):
+    """
+    Defining the sleep manager.
+
+        Input :
+            an algorithm dictionnary (a dict)
+        Output :
+            a sleep manager (a sleep_manager)
+    """
+    self.v_sleep = dict_algorithm['v_sleep']
+    self.w_sleep = dict_algorithm['w_sleep']
+    self.F_sleep = dict_algorithm['F_sleep']
+    self.n_step_sleep = dict_algorithm['n_step_sleep']
+    self.dF_wake = dict_algorithm['dF_wake']
+    #statistics
+    self.n_fall_asleep = 0
+    self.n_wake_up = 0
+    self.n_asleep_L = []
+
+#-------------------------------------------------------------------------------
+
+  def update(self, L_g):
+    """
+    Update the state of the grains.
+
+    It must be called once the forces are computed and before the grains are moved.
+
+        Input :
+            itself (a sleep_manager)
+            a list of grains (a list)
+        Output :
+            Nothing, but the state of the grains and the statistics are updated
+    """
+    n_asleep = 0
+    for grain in L_g :
+        F = np.array([grain.fx, grain.fy])
+        if grain.asleep :
+            if np.linalg.norm(F - grain.F_asleep) > self.dF_wake :
+                #wake up
+                grain.asleep = False
+                grain.n_quiet = 0
+                self.n_wake_up = self.n_wake_up + 1
+        else :
+            if np.linalg.norm(grain.v) < self.v_sleep and abs(grain.w) < self.w_sleep and np.linalg.norm(F) < self.F_sleep :
+                grain.n_quiet = grain.n_quiet + 1
+            else :
+                grain.n_quiet = 0
+            if grain.n_quiet >= self.n_step_sleep :
+                #fall asleep
+                grain.asleep = True
+                grain.F_asleep = F
+                grain.v = np.array([0, 0])
+                grain.w = 0
+                self.n_fall_asleep = self.n_fall_asleep + 1
+        if grain.asleep :
+            n_asleep = n_asleep + 1
+    self.n_asleep_L.append(n_asleep)
+
+#-------------------------------------------------------------------------------
+
+  def report(self, n_grain, simulation_report):
+    """
+    Write the statistics of the sleeping grains in the report.
+
+        Input :
+            itself (a sleep_manager)
+            the number of grains considered (an int)
+            a simulation report (a report)
+        Output :
+            Nothing, but the report is updated
+    """
+    if self.n_asleep_L == [] or n_grain == 0 :
+        return
+    ratio_mean = np.mean(self.n_asleep_L)/n_grain
+    ratio_final = self.n_asleep_L[-1]/n_grain
+    simulation_report.write('Sleeping grains : '+str(self.n_fall_asleep)+' falls asleep, '+str(self.n_wake_up)+' wakes up, '+str(round(100*ratio_mean,1))+' % asleep on average, '+str(round(100*ratio_final,1))+' % asleep at the end\n')
+
+#-------------------------------------------------------------------------------
+
+  def wake_up_all(self, L_g):
+    """
+    Wake up all the grains.
+
+    It must be called at the end of the loop, the next loops start with awake grains.
+
+        Input :
+            itself (a sleep_manager)
+            a list of grains (a list)
+        Output :
+            Nothing, but the grains are awake
+    """
+    for grain in L_g :
+        grain.asleep = False
+        grain.n_quiet = 0
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the uniform grid used for the phase field in the simulation.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class UniformGrid:
+  """
+  The uniform grid of the phase field, periodic along the x axis.
+
+  The nodes are regularly spaced, so the index of a node is computed from a coordinate and not searched.
+  On an exact midpoint between two nodes, the nearest node is the lower one, as the first minimum of abs(x_L - x). Within the rounding error of a midpoint, the computed and the searched nodes can differ by one.
+  The last column is the periodic image of the first one. The fields are n_y x n_x numpy arrays, the rows are from the top (see row()).
+  """
+
+#-------------------------------------------------------------------------------
+
+  def __init__(self, x_min, x_max, n_x, y_min, y_max, n_y):
+    """
+    Defining the grid.
+
+        Input :
+            itself (a grid)
+            the limits of the grid along the x axis (two floats)
+            the number of nodes along the x axis (an int)
+            the limits of the grid along the y axis (two floats)
+            the number of nodes along the y axis (an int)
+        Output :
+            Nothing, but the grid is generated (a grid)
+    """
+    self.x_min = x_min
+    self.x_max = x_max
+    self.n_x = n_x
+    self.y_min = y_min
+    self.y_max = y_max
+    self.n_y = n_y
+    self.x_L = np.linspace(x_min, x_max, n_x)
+    self.y_L = np.linspace(y_min, y_max, n_y)
+    self.dx = self.x_L[1] - self.x_L[0]
+    self.dy = self.y_L[1] - self.y_L[0]
+    #number of columns in a period
+    self.n_period = n_x - 1
+
+#-------------------------------------------------------------------------------
+
+  def i_x_nearest(self, x):
+    """
+    Get the nearest node along the x axis, in the grid.
+
+        Input :
+            itself (a grid)
+            a coordinate (a float or a numpy array)
+        Output :
+            the index of the nearest node (an int or a numpy array)
+    """
+    return to_int(np.clip(np.ceil((np.asarray(x) - self.x_min)/self.dx - 0.5), 0, self.n_x - 1))
+
+#-------------------------------------------------------------------------------
+
+  def i_y_nearest(self, y):
+    """
+    Get the nearest node along the y axis, in the grid.
+
+        Input :
+            itself (a grid)
+            a coordinate (a float or a numpy array)
+        Output :
+            the index of the nearest node (an int or a numpy array)
+    """
+    return to_int(np.clip(np.ceil((np.asarray(y) - self.y_min)/self.dy - 0.5), 0, self.n_y - 1))
+
+#-------------------------------------------------------------------------------
+
+  def i_x_nearest_periodic(self, x):
+    """
+    Get the nearest node along the x axis, on the periodic extension of the grid.
+
+    The index is unwrapped, it can be negative or larger than the number of nodes (see columns_periodic()).
+
+        Input :
+            itself (a grid)
+            a coordinate (a float or a numpy array)
+        Output :
+            the unwrapped index of the nearest node (an int or a numpy array)
+    """
+    return to_int(np.ceil((np.asarray(x) - self.x_min)/self.dx - 0.5))
+
+#-------------------------------------------------------------------------------
+
+  def i_box(self, x_min, x_max, y_min, y_max):
+    """
+    Get the nearest nodes of a box, in the grid.
+
+        Input :
+            itself (a grid)
+            the limits of the box (four floats)
+        Output :
+            the index of the nearest nodes of x_min, x_max, y_min and y_max (four ints)
+    """
+    return self.i_x_nearest(x_min), self.i_x_nearest(x_max), self.i_y_nearest(y_min), self.i_y_nearest(y_max)
+
+#-------------------------------------------------------------------------------
+
+  def columns_periodic(self, i_x_min, i_x_max):
+    """
+    Get the columns between two unwrapped indices (see i_x_nearest_periodic()).
+
+    A column is not taken twice, the range is limited to one period.
+
+        Input :
+            itself (a grid)
+            the first and the last unwrapped indices (two ints)
+        Output :
+            the columns in the grid (a numpy array of int)
+            the coordinates of the nodes on the periodic extension (a numpy array)
+    """
+    L_i_x = np.arange(i_x_min, min(i_x_max, i_x_min + self.n_period - 1)+1)
+    L_c = np.mod(L_i_x, self.n_period)
+    L_x = self.x_L[L_c] + np.floor_divide(L_i_x, self.n_period)*(self.x_max - self.x_min)
+    return L_c, L_x
+
+#-------------------------------------------------------------------------------
+
+  def wrap_x(self, x):
+    """
+    Bring a coordinate in the grid with the periodic condition along the x axis.
+
+        Input :
+            itself (a grid)
+            a coordinate (a float or a numpy array)
+        Output :
+            the coordinate between x_min and x_max (a float or a numpy array)
+    """
+    return self.x_min + np.mod(x - self.x_min, self.x_max - self.x_min)
+
+#-------------------------------------------------------------------------------
+
+  def i_x_cell(self, x):
+    """
+    Get the cell of a coordinate along the x axis.
+
+        Input :
+            itself (a grid)
+            a coordinate in the grid (a float or a numpy array)
+        Output :
+            the index i of the cell, x_L[i-1] <= x < x_L[i] (an int or a numpy array)
+    """
+    return to_int(np.clip(np.floor((np.asarray(x) - self.x_min)/self.dx) + 1, 1, self.n_x - 1))
+
+#-------------------------------------------------------------------------------
+
+  def i_y_cell(self, y):
+    """
+    Get the cell of a coordinate along the y axis.
+
+        Input :
+            itself (a grid)
+            a coordinate in the grid (a float or a numpy array)
+        Output :
+            the index i of the cell, y_L[i-1] <= y < y_L[i] (an int or a numpy array)
+    """
+    return to_int(np.clip(np.floor((np.asarray(y) - self.y_min)/self.dy) + 1, 1, self.n_y - 1))
+
+#-------------------------------------------------------------------------------
+
+  def row(self, i_y):
+    """
+    Get the row in a field of a node along the y axis, the rows are from the top.
+
+        Input :
+            itself (a grid)
+            the index of the node along the y axis (an int or a numpy array)
+        Output :
+            the row in the field (an int or a numpy array)
+    """
+    return self.n_y - 1 - i_y
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def to_int(L_i):
+    """
+    Convert indices computed as floats.
+
+        Input :
+            the indices (a 0-d or a n-d numpy array)
+        Output :
+            the indices (an int or a numpy array of int)
+    """
+    if np.ndim(L_i) == 0 :
+        return int(L_i)
+    return L_i.astype(int)
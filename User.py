@@ -121,13 +121,28 @@ def All_parameters():
     i_update_pf_solute = 25
 
     #method to update pf
-    method_pf_update = 'interpolation' #interpolation or isophases
+    method_pf_update = 'interpolation' #interpolation or rest_shape
 
     #DEM parameters
     dt_DEM_crit = math.pi*min(L_R)/(0.16*nu+0.88)*math.sqrt(rho*(2+2*nu)/Y) #s critical time step from O'Sullivan 2011
     dt_DEM = dt_DEM_crit/6 #s time step during DEM simulation
+    adaptive_dt = False #the time step is estimated at each iteration from the contacts stiffness and the grains velocity (dt_DEM or dt_DEM_IC is the initial value)
+    factor_dt_contact = 0.2 #fraction of the stable time step min(sqrt(m_eq/k)) of the contacts
+    dt_DEM_min = dt_DEM_crit/100 #s minimum time step
+    dt_DEM_max = dt_DEM_crit #s maximum time step
+    dx_DEM_max = 0.005*R_mean #maximum displacement of a grain during one time step
     factor_neighborhood = 1 #margin to detect a grain into a neighborhood
-    i_update_neighborhoods = 1 #the frequency of the update of the neighborhood of the grains and the walls
+    skin_neighborhood = 0.2*R_mean #margin added to the neighborhood, it is rebuilt when a grain has moved more than the half of it
+    narrow_phase = 'vertices' #vertices (nearest vertices in an angular window) or SAT (separating axis theorem, convex grains) or SDF (signed distance grids of the grains)
+    density_scaling = False #scale the density during the shear to reduce the number of iterations
+    I_number_target = 10**(-3) #the density scaling keeps the inertial number under this value (no scaling if it is already over, it is written in the report)
+    shear_mode = 'groups' #groups (the Top group is sheared over the Bottom group) or lees_edwards (homogeneous shear of a periodic cell, no wall group)
+    sleep = False #the quiescent grains are put to sleep during the loading (IC and confinement)
+    v_sleep = 10**(-5)*R_mean/dt_DEM #µm/s a grain is quiet under this velocity
+    w_sleep = 10**(-5)/dt_DEM #rad/s a grain is quiet under this angular velocity
+    F_sleep = 10**(-5)*Y*R_mean**2 #µN a grain is quiet under this net force
+    n_step_sleep = 50 #number of quiet steps before a grain is put to sleep
+    dF_wake = 10**(-5)*Y*R_mean**2 #µN a sleeping grain wakes up if its net force changes more than this value
 
     #Groups definition
     bottom_height = 1.5*R_mean #bottom group
@@ -139,6 +154,7 @@ def All_parameters():
     #PID corrector to apply confinement force on Top group (used in IC generation)
     PID_kp = 10**(-7) #proportionnal to the error
     dy_top_max = R_mean*0.001 #limit the displacement of the top group
+    dt_PID = dt_DEM_crit/6 #s time step of the gain and of the displacement limit, they are scaled with the time step
 
     #Debug
     Debug = True #plot configuration before and after DEM simulation
@@ -163,13 +179,29 @@ def All_parameters():
     'method_pf_update' : method_pf_update,
     'dt_DEM_crit' : dt_DEM_crit,
     'dt_DEM' : dt_DEM,
+    'adaptive_dt' : adaptive_dt,
+    'factor_dt_contact' : factor_dt_contact,
+    'dt_DEM_min' : dt_DEM_min,
+    'dt_DEM_max' : dt_DEM_max,
+    'dx_DEM_max' : dx_DEM_max,
     'factor_neighborhood' : factor_neighborhood,
-    'i_update_neighborhoods': i_update_neighborhoods,
+    'skin_neighborhood': skin_neighborhood,
+    'narrow_phase' : narrow_phase,
+    'density_scaling' : density_scaling,
+    'I_number_target' : I_number_target,
+    'shear_mode' : shear_mode,
+    'sleep' : sleep,
+    'v_sleep' : v_sleep,
+    'w_sleep' : w_sleep,
+    'F_sleep' : F_sleep,
+    'n_step_sleep' : n_step_sleep,
+    'dF_wake' : dF_wake,
     'bottom_height' : bottom_height,
     'top_height' : top_height,
     'd_to_image' : d_to_image,
     'kp' : PID_kp,
     'dy_top_max' : dy_top_max,
+    'dt_PID' : dt_PID,
     'Debug' : Debug,
     'Debug_DEM' : Debug_DEM,
     'i_print_plot' : i_print_plot,
@@ -190,8 +222,7 @@ def All_parameters():
     #current dem step
     dt_DEM_IC = dt_DEM_crit/5 #s time step during IC
     factor_neighborhood_IC = 1.5 #margin to detect a grain into a neighborhood
-    i_update_neighborhoods_gen = 20 #the frequency of the update of the neighborhood of the grains and the walls during IC generations
-    i_update_neighborhoods_com = 100 #the frequency of the update of the neighborhood of the grains and the walls during IC combination
+    skin_neighborhood_IC = 0.5*R_mean #margin added to the neighborhood, it is rebuilt when a grain has moved more than the half of it
 
     #steady-state detection
     i_DEM_stop_IC = 4000 #stop criteria for DEM during IC
@@ -208,8 +239,7 @@ def All_parameters():
     'N_test_max' : N_test_max,
     'dt_DEM_IC' : dt_DEM_IC,
     'factor_neighborhood_IC' : factor_neighborhood_IC,
-    'i_update_neighborhoods_gen': i_update_neighborhoods_gen,
-    'i_update_neighborhoods_com': i_update_neighborhoods_com,
+    'skin_neighborhood_IC': skin_neighborhood_IC,
     'i_DEM_stop_IC' : i_DEM_stop_IC,
     'Ecin_ratio_IC' : Ecin_ratio_IC,
     'Debug_DEM' : Debug_DEM_IC,
@@ -307,22 +337,11 @@ def compute_alpha(dict_geometry, dict_material, dict_sample, dict_sollicitations
     y_min = center_1[1]-dict_geometry['R_mean']-dict_material['w']
     y_max = center_1[1]+dict_geometry['R_mean']+dict_material['w']
     #look for this part inside the global mesh
-    #create search list
-    x_L_search_min = abs(np.array(dict_sample['x_L'])-x_min)
-    x_L_search_max = abs(np.array(dict_sample['x_L'])-x_max)
-    y_L_search_min = abs(np.array(dict_sample['y_L'])-y_min)
-    y_L_search_max = abs(np.array(dict_sample['y_L'])-y_max)
-    #get index
-    i_x_min = list(x_L_search_min).index(min(x_L_search_min))
-    i_x_max = list(x_L_search_max).index(min(x_L_search_max))
-    i_y_min = list(y_L_search_min).index(min(y_L_search_min))
-    i_y_max = list(y_L_search_max).index(min(y_L_search_max))
-    #Initialisation
-    sum_min_etai = 0
-    #compute the sum over the sample of the minimum of etai
-    for l in range(i_y_min, i_y_max):
-        for c in range(i_x_min, i_x_max):
-            sum_min_etai = sum_min_etai + min(g1_tempo.etai_M[-1-l][c],g2_tempo.etai_M[-1-l][c])
+    i_x_min, i_x_max, i_y_min, i_y_max = dict_sample['grid'].i_box(x_min, x_max, y_min, y_max)
+    #compute the sum over the sample of the minimum of etai, read in the patches of the grains
+    L_row = dict_sample['grid'].row(np.arange(i_y_min, i_y_max))
+    L_col = np.arange(i_x_min, i_x_max)
+    sum_min_etai = np.sum(np.minimum(g1_tempo.get_etai_M(L_row[:,np.newaxis], L_col[np.newaxis,:]), g2_tempo.get_etai_M(L_row[:,np.newaxis], L_col[np.newaxis,:])))
     #Add element in dict
     dict_sollicitations['alpha'] = 0.06*sum_min_etai
 
@@ -19,7 +19,6 @@ import Create_IC
 import Create_IC_Polygonal
 import Confine_Polygonal
 import Contact_gg
-import Contact_gimage
 import Etai
 import Grain
 import Shear_Polygonal
@@ -149,8 +148,7 @@ def define_group(dict_algorithm, dict_ic, dict_sample, simulation_report):
     simulation_report.write_and_print(str(i_bottom)+' grains in Bottom group\n'+str(i_top)+' grains in Top group\n\n', str(i_bottom)+' grains in Bottom group\n'+str(i_top)+' grains in Top group\n')
 
     #delete contact gw
-    dict_ic['L_contact_gw'] = []
-    dict_ic['L_contact_gw_ij'] = []
+    dict_ic['contact_registry'].clear('gw')
 
     #plot group distribution
     if dict_algorithm['Debug']:
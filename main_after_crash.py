@@ -21,7 +21,6 @@ import Create_IC
 import Create_IC_Polygonal
 import Confine_Polygonal
 import Contact_gg
-import Contact_gimage
 import Grain
 import Shear_Polygonal
 import Report
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the configuration of the tests, run with pytest from the root of the repository.
+The builders of grains shared by the tests are given as fixtures.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import os
+import sys
+import numpy as np
+import pytest
+
+#the modules of the simulation are at the root of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#Own
+import Grain
+import Create_IC.Grain_ic
+import Create_IC_Polygonal.Grain_ic_polygonal
+
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class Grain_Fake:
+  """
+  A grain reduced to the attributes used by a test.
+  """
+
+  def __init__(self, **dict_attribute):
+    for key in dict_attribute :
+        setattr(self, key, dict_attribute[key])
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def Create_grain_tempo(ID, center, radius, n_border):
+    """
+    Create a temporary polygonal grain.
+
+        Input :
+            an id (an int)
+            a center (a 1 x 2 numpy array)
+            a radius (a float)
+            the number of vertices (an int)
+        Output :
+            a temporary polygonal grain (a grain_tempo_polygonal)
+    """
+    dict_material = {'rho_surf' : 2.5, 'Y' : 70*10**9, 'nu' : 0.2}
+    grain_sphere = Create_IC.Grain_ic.Grain_Tempo(ID, np.array(center, dtype = float), radius, dict_material)
+    return Create_IC_Polygonal.Grain_ic_polygonal.Grain_Tempo_Polygonal(grain_sphere, n_border)
+
+#-------------------------------------------------------------------------------
+
+@pytest.fixture
+def create_grain_fake():
+    """
+    Give the builder of the grains reduced to some attributes.
+    """
+    return Grain_Fake
+
+#-------------------------------------------------------------------------------
+
+@pytest.fixture
+def create_grain_tempo():
+    """
+    Give the builder of the temporary polygonal grains (see Create_grain_tempo()).
+    """
+    return Create_grain_tempo
+
+#-------------------------------------------------------------------------------
+
+@pytest.fixture
+def create_grain():
+    """
+    Give the builder of the polygonal grains, from a temporary polygonal grain (see Create_grain_tempo()).
+    """
+    def Create_grain(ID, center, radius, n_border):
+        return Grain.Grain(Create_grain_tempo(ID, center, radius, n_border))
+    return Create_grain
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the tests of the registry of the contacts (see Contact_registry.ContactRegistry).
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import pytest
+
+#Own
+from Contact_registry import ContactRegistry
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def test_add_get_remove():
+    registry = ContactRegistry()
+    registry.add((0, 1, 'gg'), 'c01')
+    registry.add((0, 1, 'gimage'), 'i01')
+    registry.add((2, 0, 'gw'), 'w20')
+    assert len(registry) == 3
+    assert (0, 1, 'gg') in registry and (1, 0, 'gg') not in registry and (0, 2, 'gg') not in registry
+    assert registry.get((0, 1, 'gimage')) == 'i01'
+    assert registry.remove((0, 1, 'gg')) == 'c01'
+    assert (0, 1, 'gg') not in registry and (0, 1, 'gimage') in registry
+    assert len(registry) == 2
+    with pytest.raises(KeyError):
+        registry.remove((0, 1, 'gg'))
+
+#-------------------------------------------------------------------------------
+
+def test_order_of_insertion():
+    registry = ContactRegistry()
+    for key in [(3, 4, 'gg'), (0, 5, 'gg'), (1, 2, 'gg')]:
+        registry.add(key, key)
+    registry.remove((0, 5, 'gg'))
+    registry.add((0, 5, 'gg'), (0, 5, 'gg'))
+    assert registry.L_key('gg') == [(3, 4, 'gg'), (1, 2, 'gg'), (0, 5, 'gg')]
+    assert registry.L_contact('gg') == registry.L_key('gg')
+    assert registry.L_key('gw') == []
+
+#-------------------------------------------------------------------------------
+
+def test_L_key_grain():
+    registry = ContactRegistry()
+    registry.add((0, 1, 'gg'), None)
+    registry.add((1, 2, 'gg'), None)
+    registry.add((2, 1, 'gimage'), None)
+    registry.add((1, 0, 'gw'), None)
+    assert registry.L_key_grain(1, 'gg') == [(0, 1, 'gg'), (1, 2, 'gg')]
+    assert registry.L_key_grain(1, 'gimage') == [(2, 1, 'gimage')]
+    assert registry.L_key_grain(1, 'gw') == [(1, 0, 'gw')]
+    #the id of a wall is not a grain
+    assert registry.L_key_grain(0, 'gw') == []
+    assert registry.L_key_grain(3, 'gg') == []
+    registry.remove((0, 1, 'gg'))
+    assert registry.L_key_grain(1, 'gg') == [(1, 2, 'gg')]
+    assert registry.L_key_grain(0, 'gg') == []
+    registry.clear('gg')
+    assert registry.L_key_grain(2, 'gg') == [] and registry.L_key_grain(2, 'gimage') == [(2, 1, 'gimage')]
+    assert len(registry) == 2
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the tests of the DEM engine (see DEM_engine.DEM_Engine).
+The components record their calls.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import math
+import numpy as np
+
+#Own
+import DEM_engine
+
+#-------------------------------------------------------------------------------
+#Class
+#-------------------------------------------------------------------------------
+
+class Contact_Law_Record:
+  """
+  A contact law recording its calls.
+  """
+
+  def __init__(self, L_call):
+    self.L_call = L_call
+
+  def detection(self, engine):
+    self.L_call.append('detection')
+    return engine.i_DEM == 1
+
+  def reactions(self, engine):
+    self.L_call.append('reactions')
+    return 0.5
+
+#-------------------------------------------------------------------------------
+
+class Integrator_Record:
+  """
+  An integrator recording its calls.
+  """
+
+  def __init__(self, L_call):
+    self.L_call = L_call
+
+  def move(self, engine):
+    self.L_call.append('move')
+
+#-------------------------------------------------------------------------------
+
+class Boundary_Record(DEM_engine.Boundary):
+  """
+  A boundary condition recording its calls.
+  """
+
+  def __init__(self, L_call):
+    self.L_call = L_call
+
+  def before_detection(self, engine):
+    self.L_call.append('before_detection')
+
+  def detection(self, engine):
+    self.L_call.append('boundary_detection')
+
+  def after_motion(self, engine):
+    self.L_call.append('after_motion')
+
+#-------------------------------------------------------------------------------
+
+class Controller_Record(DEM_engine.Controller):
+  """
+  A controller recording its calls, it doubles the time step.
+  """
+
+  def __init__(self, L_call):
+    self.L_call = L_call
+
+  def measure(self, engine):
+    self.L_call.append('measure')
+
+  def control(self, engine):
+    self.L_call.append('control')
+    engine.dt_DEM = 2*engine.dt_DEM
+
+#-------------------------------------------------------------------------------
+
+class Tracker_Record:
+  """
+  A tracker recording its calls and the state of the engine.
+  """
+
+  def __init__(self, L_call):
+    self.L_call = L_call
+    self.L_state = []
+
+  def track(self, engine):
+    self.L_call.append('track')
+    self.L_state.append((engine.i_DEM, engine.dt_DEM, engine.dt_contact, engine.neighborhoods_updated))
+
+#-------------------------------------------------------------------------------
+
+class Clump_Spring:
+  """
+  A top clump compressing the sample as a linear spring.
+  """
+
+  def __init__(self, y, y_free, k):
+    self.y = y
+    self.y_free = y_free
+    self.k = k
+
+  def sum_force(self):
+    return 0, self.k*max(self.y_free - self.y, 0)
+
+  def move(self, U, dt_DEM):
+    self.y = self.y + U[1]
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def test_step_order():
+    L_call = []
+    engine = DEM_engine.DEM_Engine(0, 1, Contact_Law_Record(L_call), Integrator_Record(L_call), [Boundary_Record(L_call)], [Controller_Record(L_call)], [Tracker_Record(L_call)], [])
+    engine.step()
+    assert L_call == ['before_detection', 'detection', 'boundary_detection', 'reactions', 'measure', 'move', 'after_motion', 'control', 'track']
+
+#-------------------------------------------------------------------------------
+
+def test_run_until_stop():
+    L_call = []
+    tracker = Tracker_Record(L_call)
+    engine = DEM_engine.DEM_Engine(10, 1, Contact_Law_Record(L_call), Integrator_Record(L_call), [], [Controller_Record(L_call)], [tracker], [DEM_engine.Stop_Max_Iteration(13), DEM_engine.Stop_No_Grain([1])])
+    engine.run()
+    assert engine.i_DEM == 13
+    #the time step is updated by the controller, the results of the contact law are in the engine
+    assert tracker.L_state == [(11, 2, 0.5, False), (12, 4, 0.5, False), (13, 8, 0.5, False)]
+
+#-------------------------------------------------------------------------------
+
+def test_stop_no_grain():
+    L_g = [1]
+    engine = DEM_engine.DEM_Engine(0, 1, Contact_Law_Record([]), Integrator_Record([]), [], [], [], [DEM_engine.Stop_No_Grain(L_g), DEM_engine.Stop_Max_Iteration(math.inf)])
+    assert not engine.L_stop[0].stop(engine)
+    L_g.pop()
+    engine.run()
+    assert engine.i_DEM == 1
+
+#-------------------------------------------------------------------------------
+
+def Top_trajectory(dt_DEM, t_end, n_track):
+    """
+    Load a linear spring with the top clump controller.
+
+        Input :
+            a time step (a float)
+            a simulated time (a float)
+            the number of positions tracked (an int)
+        Output :
+            the positions of the top clump at regular times (a list)
+    """
+    dict_algorithm = {'kp' : 0.1, 'dy_top_max' : 0.05, 'dt_PID' : 0.01}
+    dict_sample = {'y_box_max' : 12}
+    clump_top = Clump_Spring(12, 10, 1)
+    controller = DEM_engine.Control_Top_Clump(dict_algorithm, dict_sample, 1, clump_top, 0, 1)
+    engine = DEM_engine.DEM_Engine(0, dt_DEM, Contact_Law_Record([]), Integrator_Record([]), [], [controller], [], [])
+    L_y = []
+    n_step = int(round(t_end/dt_DEM))
+    for i_step in range(n_step):
+        controller.measure(engine)
+        controller.control(engine)
+        if (i_step+1) % (n_step//n_track) == 0 :
+            L_y.append(clump_top.y)
+    return L_y
+
+#-------------------------------------------------------------------------------
+
+def test_PID_time_step():
+    #the top clump goes down at the maximum velocity, then the force converges to the target
+    L_y = Top_trajectory(0.01, 2, 20)
+    L_y_half = Top_trajectory(0.005, 2, 20)
+    assert abs(L_y[1] - (12 - 0.05/0.01*0.2)) < 1e-9
+    assert abs(L_y[-1] - 9) < 0.01
+    assert np.max(np.abs(np.array(L_y) - np.array(L_y_half))) < 0.01
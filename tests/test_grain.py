@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the tests of the grains (see Grain).
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import math
+import numpy as np
+
+#Own
+import Grain
+from Uniform_grid import UniformGrid
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def test_i_nearest_theta_r_as_search(create_grain):
+    rng = np.random.RandomState(0)
+    for i_grain in range(50):
+        grain = create_grain(i_grain, [0, 0], 10, 60)
+        #random vertices, not uniformly distributed
+        grain.l_theta_r = list(np.sort(rng.uniform(0, 2*math.pi, 60)))
+        grain.theta = rng.uniform(-10, 10)
+        L_theta_r = np.array(grain.l_theta_r)
+        for angle in rng.uniform(0, 2*math.pi, 50):
+            assert grain.i_nearest_theta_r(angle) == int(np.argmin(abs(L_theta_r - angle)))
+
+#-------------------------------------------------------------------------------
+
+def test_i_nearest_theta_r_tempo_as_search(create_grain_tempo):
+    rng = np.random.RandomState(1)
+    for i_grain in range(20):
+        grain = create_grain_tempo(i_grain, [0, 0], 10, 60)
+        grain.theta = rng.uniform(-10, 10)
+        L_theta_r = np.array(grain.l_theta_r)
+        for angle in list(rng.uniform(0, 2*math.pi, 50)) + list(L_theta_r):
+            assert grain.i_nearest_theta_r(angle) == int(np.argmin(abs(L_theta_r - angle)))
+
+#-------------------------------------------------------------------------------
+
+def Create_dict_pf(method_pf_update):
+    """
+    Create the dictionnaries used to build the phase field of a grain.
+
+    The mesh is periodic along the x axis, its spacing is 1.
+
+        Input :
+            a method to update the phase field, 'interpolation' or 'rest_shape' (a string)
+        Output :
+            an algorithm dictionnary (a dict)
+            a material dictionnary (a dict)
+            a sample dictionnary (a dict)
+    """
+    dict_algorithm = {'method_pf_update' : method_pf_update}
+    dict_material = {'w' : 4*math.sqrt(2)}
+    dict_sample = {'grid' : UniformGrid(0, 100, 101, 0, 60, 61)}
+    return dict_algorithm, dict_material, dict_sample
+
+#-------------------------------------------------------------------------------
+
+def test_etai_M_patch_round_trip(create_grain):
+    grain = create_grain(0, [50, 30], 10, 60)
+    rng = np.random.RandomState(2)
+    #a field in the middle, a field crossing the periodic limit, an empty field
+    L_etai_M = [np.zeros((61, 101)), np.zeros((61, 101)), np.zeros((61, 101))]
+    L_etai_M[0][10:25, 40:62] = rng.uniform(0, 1, (15, 22))
+    L_etai_M[1][30:41, 95:] = rng.uniform(0, 1, (11, 6))
+    L_etai_M[1][30:41, :7] = rng.uniform(0, 1, (11, 7))
+    for etai_M in L_etai_M:
+        #the last column is the periodic image of the first one
+        etai_M[:,-1] = etai_M[:,0]
+        grain.etai_M = etai_M
+        assert np.array_equal(grain.etai_M, etai_M)
+        L_row = rng.randint(0, 61, 500)
+        L_col = rng.randint(0, 101, 500)
+        assert np.array_equal(grain.get_etai_M(L_row, L_col), etai_M[L_row, L_col])
+    #the patch crossing the periodic limit is kept small
+    assert grain.etai_patch.shape == (0, 0)
+    grain.etai_M = L_etai_M[1]
+    assert grain.etai_patch.shape == (11, 12) and grain.i_etai_col == 95
+
+#-------------------------------------------------------------------------------
+
+def test_build_etai_M_across_periodic_limit(create_grain):
+    dict_algorithm, dict_material, dict_sample = Create_dict_pf('interpolation')
+    grain = create_grain(0, [98, 30], 10, 60)
+    grain.build_etai_M(dict_algorithm, dict_material, dict_sample)
+    etai_M = grain.etai_M
+    #the grain is on both sides of the box
+    assert etai_M[30, 0] == 1 and etai_M[30, 95] == 1 and etai_M[30, 50] == 0
+    #same field as the grain translated by one box
+    grain_translated = create_grain(0, [-2, 30], 10, 60)
+    grain_translated.build_etai_M(dict_algorithm, dict_material, dict_sample)
+    assert np.allclose(grain_translated.etai_M, etai_M)
+    grain.etai_M = etai_M
+    assert np.array_equal(grain.etai_M, etai_M)
+
+#-------------------------------------------------------------------------------
+
+def test_move_grain_rest_shape_error(create_grain):
+    L_error = []
+    for method_pf_update in ['interpolation', 'rest_shape']:
+        dict_algorithm, dict_material, dict_sample = Create_dict_pf(method_pf_update)
+        grain = create_grain(0, [95, 30], 10, 60)
+        #a non circular shape, the rotations are seen in the phase field
+        grain.l_r = [10*(1-0.3*abs(math.cos(theta))) for theta in grain.l_theta_r]
+        grain.build_etai_M(dict_algorithm, dict_material, dict_sample)
+        rng = np.random.RandomState(3)
+        for i_update in range(20):
+            grain.u_pf_interpolation = rng.uniform(-0.5, 0.5, 2)
+            grain.dtheta_pf_interpolation = rng.uniform(-0.05, 0.05)
+            grain.center = grain.center + grain.u_pf_interpolation
+            grain.theta = grain.theta + grain.dtheta_pf_interpolation
+            if method_pf_update == 'interpolation' :
+                grain.move_grain_interpolation(dict_algorithm, dict_material, dict_sample)
+            else :
+                grain.move_grain_rest_shape(dict_algorithm, dict_material, dict_sample)
+        etai_M = grain.etai_M
+        #the phase field of the grain built at its final position
+        grain.build_etai_M(dict_algorithm, dict_material, dict_sample)
+        L_error.append(np.max(abs(etai_M - grain.etai_M)))
+    #the errors are not accumulated from the rest shape
+    assert L_error[1] < 0.1
+    assert L_error[1] < L_error[0]/2
+
+#-------------------------------------------------------------------------------
+
+def test_adaptive_dt_bounds(create_grain):
+    grain_store = Grain.GrainStore([create_grain(0, [0, 0], 10, 60), create_grain(1, [30, 0], 10, 60)])
+    dict_algorithm = {'factor_dt_contact' : 0.2, 'dx_DEM_max' : 0.05, 'dt_DEM_min' : 1e-3, 'dt_DEM_max' : 1}
+    #the time step grows of 10% at most
+    assert abs(grain_store.adaptive_dt([0, 1], math.inf, 0.1, dict_algorithm) - 0.11) < 1e-12
+    assert grain_store.adaptive_dt([0, 1], math.inf, 1, dict_algorithm) == 1
+    #a fast grain or a stiff contact reduce the time step, not under the minimum
+    grain_store.v[1] = [5, 0]
+    assert abs(grain_store.adaptive_dt([0, 1], math.inf, 0.1, dict_algorithm) - 0.01) < 1e-12
+    assert grain_store.adaptive_dt([0, 1], 1e-4, 0.1, dict_algorithm) == 1e-3
+    grain_store.v[1] = [5e3, 0]
+    assert grain_store.adaptive_dt([0, 1], math.inf, 0.1, dict_algorithm) == 1e-3
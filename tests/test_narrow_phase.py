@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the tests of the narrow phase engines (see Narrow_phase and Contact_gg.Grains_Polyhedral_narrow_phase()).
+The engines are compared with the nearest vertices engine on pairs of polygons.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import math
+import numpy as np
+
+#Own
+import Contact_gg
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def L_pair(create_grain, seed, n_pair):
+    """
+    Generate pairs of polygonal grains, overlapping or separated.
+
+    The same two grains are moved for each pair, then their signed distance grids are built once.
+    The grain 2 is translated back by an offset of one periodic box.
+
+        Input :
+            the builder of the grains (a function)
+            a seed (an int)
+            the number of pairs (an int)
+        Output :
+            the pairs of grains with the offset of the grain 2 and the direction from g1 to g2 (a generator)
+    """
+    rng = np.random.RandomState(seed)
+    offset = np.array([100, 0])
+    g1 = create_grain(0, [5, 3], 10, 60)
+    g2 = create_grain(1, [0, 0], 10, 60)
+    for i_pair in range(n_pair):
+        g1.theta = rng.uniform(0, 2*math.pi)
+        g2.theta = rng.uniform(0, 2*math.pi)
+        angle = rng.uniform(0, 2*math.pi)
+        u = np.array([math.cos(angle), math.sin(angle)])
+        g2.center = g1.center + rng.uniform(17, 23)*u - offset
+        yield g1, g2, offset, u
+
+#-------------------------------------------------------------------------------
+
+def check_narrow_phase(create_grain, narrow_phase, tol_overlap):
+    """
+    Compare a narrow phase engine with the nearest vertices engine.
+
+    On overlapping pairs, the overlaps are close and the normal is near the line between the centers.
+    On separated pairs, the overlap is negative.
+
+        Input :
+            the builder of the grains (a function)
+            a narrow phase engine, 'SAT' or 'SDF' (a string)
+            the tolerance on the overlap (a float)
+        Output :
+            the number of overlapping and separated pairs checked (two ints)
+    """
+    n_overlap = 0
+    n_separated = 0
+    for g1, g2, offset, u in L_pair(create_grain, 0, 200):
+        d_vertices = Contact_gg.Grains_Polyhedral_narrow_phase(g1, g2, offset, 'vertices', None)['d_ij_min']
+        dict_narrow_phase = Contact_gg.Grains_Polyhedral_narrow_phase(g1, g2, offset, narrow_phase, None)
+        if d_vertices > 0.5 :
+            n_overlap = n_overlap + 1
+            assert abs(dict_narrow_phase['d_ij_min'] - d_vertices) < tol_overlap
+            assert np.dot(dict_narrow_phase['pc_normal'], u) > math.cos(0.1)
+        elif d_vertices < -0.5 :
+            n_separated = n_separated + 1
+            assert dict_narrow_phase['d_ij_min'] < 0
+    return n_overlap, n_separated
+
+#-------------------------------------------------------------------------------
+
+def test_SAT_as_vertices(create_grain):
+    n_overlap, n_separated = check_narrow_phase(create_grain, 'SAT', 0.05)
+    assert n_overlap > 50 and n_separated > 50
+
+#-------------------------------------------------------------------------------
+
+def Polygons_SAT_projections(g1, g2, offset):
+    """
+    Compute the overlap between two grains with the separating axis theorem, all the vertices being projected on all the axes.
+
+    The axes are the normals of the edges of both grains, in both directions.
+
+        Input :
+            two grains (two grains)
+            the offset of the grain 2 (a 1 x 2 numpy array)
+        Output :
+            the overlap (a float)
+            the contact normal (a 1 x 2 numpy array)
+    """
+    L_edge = np.concatenate((np.diff(g1.l_border, axis = 0), np.diff(g2.l_border, axis = 0)))
+    L_edge = L_edge/np.linalg.norm(L_edge, axis = 1)[:,None]
+    L_axis = np.column_stack((L_edge[:,1], -L_edge[:,0]))
+    L_axis = np.concatenate((L_axis, -L_axis))
+    L_overlap = np.max(g1.l_border[:-1] @ L_axis.T, axis = 0) - np.min((g2.l_border[:-1] + offset) @ L_axis.T, axis = 0)
+    return np.min(L_overlap), L_axis[np.argmin(L_overlap)]
+
+#-------------------------------------------------------------------------------
+
+def test_SAT_as_projections(create_grain):
+    for g1, g2, offset, u in L_pair(create_grain, 1, 100):
+        overlap, pc_normal = Polygons_SAT_projections(g1, g2, offset)
+        dict_narrow_phase = Contact_gg.Grains_Polyhedral_narrow_phase(g1, g2, offset, 'SAT', None)
+        assert abs(dict_narrow_phase['d_ij_min'] - overlap) < 1e-9
+        assert np.linalg.norm(dict_narrow_phase['pc_normal'] - pc_normal) < 1e-9
+        #the contact points support the contact normal
+        assert abs(np.dot(g1.l_border[dict_narrow_phase['ij_min'][0]] - g2.l_border[dict_narrow_phase['ij_min'][1]] - offset, pc_normal) - overlap) < 1e-9
+
+#-------------------------------------------------------------------------------
+
+def test_SDF_as_vertices(create_grain):
+    n_overlap, n_separated = check_narrow_phase(create_grain, 'SDF', 0.05)
+    assert n_overlap > 50 and n_separated > 50
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the tests of the neighborhoods (see Neighborhood).
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+
+#Own
+import Neighborhood
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def test_verlet_rebuild_on_half_skin(create_grain_fake):
+    L_g = [create_grain_fake(id = i_grain, center = np.array(center, dtype = float), r_max = 1, group = 'Current') for i_grain, center in enumerate([[10, 10], [50, 10], [80, 20]])]
+    verlet = Neighborhood.Verlet_List(1, 2, 0, 100, [], False, None)
+    assert verlet.update(L_g, [])
+    assert not verlet.update(L_g, [])
+    #the displacement is computed from the last build
+    L_g[1].center = L_g[1].center + np.array([0.6, 0])
+    assert not verlet.update(L_g, [])
+    L_g[1].center = L_g[1].center + np.array([0, 0.6])
+    assert not verlet.update(L_g, [])
+    L_g[1].center = L_g[1].center + np.array([0.5, 0])
+    assert verlet.update(L_g, [])
+    assert verlet.n_build == 2
+    #a change in the number of grains
+    L_g.pop()
+    assert verlet.update(L_g, [])
+
+#-------------------------------------------------------------------------------
+
+def test_verlet_rebuild_on_periodic_crossing(create_grain_fake):
+    for minimum_image in [False, True]:
+        L_g = [create_grain_fake(id = i_grain, center = np.array(center, dtype = float), r_max = 1, group = 'Current') for i_grain, center in enumerate([[99.8, 10], [50, 10]])]
+        verlet = Neighborhood.Verlet_List(1, 2, 0, 100, [], minimum_image, None)
+        verlet.update(L_g, [])
+        #the grain crosses the periodic boundary, it moves of 0.4
+        L_g[0].center = np.array([0.2, 10])
+        #with the minimum image convention, the displacement is 0.4
+        assert verlet.update(L_g, []) != minimum_image
+
+#-------------------------------------------------------------------------------
+
+def test_verlet_no_missed_contact(create_grain_fake):
+    rng = np.random.RandomState(0)
+    L_g = []
+    for i_grain in range(200):
+        L_g.append(create_grain_fake(id = i_grain, center = np.array([rng.uniform(0, 100), rng.uniform(0, 50)]), r_max = rng.uniform(1, 2), group = 'Current'))
+    verlet = Neighborhood.Verlet_List(1, 1, 0, 100, [], True, None)
+    for i_step in range(100):
+        for grain in L_g:
+            grain.center = grain.center + rng.uniform(-0.05, 0.05, 2)
+            grain.center[0] = grain.center[0] % 100
+        verlet.update(L_g, [])
+        #the pairs in contact are in the neighborhoods
+        L_center = np.array([grain.center for grain in L_g])
+        L_r_max = np.array([grain.r_max for grain in L_g])
+        for i_grain in range(len(L_g)):
+            L_u = L_center[i_grain+1:] - L_center[i_grain]
+            L_u[:,0] = L_u[:,0] - 100*np.round(L_u[:,0]/100)
+            for j in np.flatnonzero(np.linalg.norm(L_u, axis = 1) < L_r_max[i_grain] + L_r_max[i_grain+1:]):
+                assert L_g[i_grain+1+j] in L_g[i_grain].neighborhood
+    #the neighborhoods are not rebuilt at each step
+    assert verlet.n_build < 50
+
+#-------------------------------------------------------------------------------
+
+def test_minimum_image_offset_at_box_edges():
+    #the grains are near the two limits of the box
+    assert np.allclose(Neighborhood.Minimum_image_offset(np.array([-9.9, 0]), np.array([9.9, 3]), -10, 10), [-20, 0])
+    assert np.allclose(Neighborhood.Minimum_image_offset(np.array([9.9, 0]), np.array([-9.9, 3]), -10, 10), [20, 0])
+    assert np.allclose(Neighborhood.Minimum_image_offset(np.array([-9.9, 0]), np.array([-9.8, 3]), -10, 10), [0, 0])
+    #a grain outside of the box, before the periodic update
+    assert np.allclose(Neighborhood.Minimum_image_offset(np.array([0, 0]), np.array([31, 0]), -10, 10), [-40, 0])
+    #on a half box, one of the two copies at the same distance
+    offset = Neighborhood.Minimum_image_offset(np.array([-5, 0]), np.array([5, 0]), -10, 10)
+    assert abs(5 + offset[0] - (-5)) == 10
+    #the nearest copy
+    rng = np.random.RandomState(0)
+    for i in range(1000):
+        center_1 = np.array([rng.uniform(-10, 10), 0])
+        center_2 = np.array([rng.uniform(-10, 10), 0])
+        offset = Neighborhood.Minimum_image_offset(center_1, center_2, -10, 10)
+        d_copy = min(abs(center_2[0] + n*20 - center_1[0]) for n in [-1, 0, 1])
+        assert np.isclose(abs(center_2[0] + offset[0] - center_1[0]), d_copy)
+
+#-------------------------------------------------------------------------------
+
+def test_lees_edwards_offset_at_box_edges():
+    dict_lees_edwards = {'y_box_min' : 0, 'y_box_max' : 10, 'x_LE' : 3, 'v_LE' : 0.5}
+    #the grain 1 is at the top, the grains 2 at the bottom, at the top and at the bottom near the x limit
+    L_center_2 = np.array([[4, 0.1], [2, 9.8], [9.9, 0.2]])
+    L_offset, L_offset_v = Neighborhood.Lees_Edwards_offset(np.array([1, 9.9]), L_center_2, 0, 10, dict_lees_edwards)
+    #the image above is shifted by x_LE and wrapped along the x axis
+    assert np.allclose(L_offset, [[3-10, 10], [0, 0], [3-10, 10]])
+    assert np.allclose(L_offset_v, [[0.5, 0], [0, 0], [0.5, 0]])
+    #the grain 1 is at the bottom, the image below is shifted by -x_LE
+    L_offset, L_offset_v = Neighborhood.Lees_Edwards_offset(np.array([9.9, 0.1]), np.array([[2, 9.9]]), 0, 10, dict_lees_edwards)
+    assert np.allclose(L_offset, [[-3+10, -10]])
+    assert np.allclose(L_offset_v, [[-0.5, 0]])
+    #the nearest image, the y axis is wrapped first then the image is exact for the distances lower than a half box
+    rng = np.random.RandomState(0)
+    n_near = 0
+    for i in range(4000):
+        dict_lees_edwards['x_LE'] = rng.uniform(0, 10)
+        center_1 = rng.uniform(0, 10, 2)
+        center_2 = rng.uniform(0, 10, 2)
+        L_offset, L_offset_v = Neighborhood.Lees_Edwards_offset(center_1, np.array([center_2]), 0, 10, dict_lees_edwards)
+        d_image = min(np.linalg.norm(center_2 + np.array([n_y*dict_lees_edwards['x_LE'] + n_x*10, n_y*10]) - center_1) for n_x in [-2, -1, 0, 1, 2] for n_y in [-1, 0, 1])
+        if d_image < 5 :
+            n_near = n_near + 1
+            assert np.isclose(np.linalg.norm(center_2 + L_offset[0] - center_1), d_image)
+        assert np.isclose(L_offset_v[0,0], L_offset[0,1]/10*dict_lees_edwards['v_LE'])
+    assert n_near > 1000
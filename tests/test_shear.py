@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the tests of the shear load (see Shear_Polygonal).
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import pytest
+
+#Own
+import Shear_Polygonal
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def test_unknown_method_pf_update_rejected():
+    for method_pf_update in ['isophases', 'Interpolation']:
+        dict_algorithm = {'method_pf_update' : method_pf_update}
+        with pytest.raises(ValueError):
+            Shear_Polygonal.DEM_shear_load(dict_algorithm, {}, {}, {}, {}, {}, None)
+        #nothing is done before the check
+        assert 'i_DEM' not in dict_algorithm
+
+#-------------------------------------------------------------------------------
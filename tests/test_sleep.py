@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the tests of the sleeping grains (see Sleep.Sleep_Manager).
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+
+#Own
+import Sleep
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def Create_grain_sleep(create_grain_fake, v, w, F):
+    """
+    Create a grain reduced to the attributes used by the sleep manager, awake.
+
+        Input :
+            the builder of the grains (a function)
+            a velocity (a 1 x 2 list)
+            an angular velocity (a float)
+            a net force (a 1 x 2 list)
+        Output :
+            a grain (a grain_fake)
+    """
+    return create_grain_fake(v = np.array(v, dtype = float), w = w, fx = F[0], fy = F[1], asleep = False, n_quiet = 0)
+
+#-------------------------------------------------------------------------------
+
+def Create_sleep_manager():
+    """
+    Create a sleep manager, a grain falls asleep after 3 quiet steps.
+
+        Input :
+            Nothing
+        Output :
+            a sleep manager (a sleep_manager)
+    """
+    dict_algorithm = {'v_sleep' : 1, 'w_sleep' : 0.1, 'F_sleep' : 10, 'n_step_sleep' : 3, 'dF_wake' : 5}
+    return Sleep.Sleep_Manager(dict_algorithm)
+
+#-------------------------------------------------------------------------------
+
+def test_sleep_thresholds(create_grain_fake):
+    sleep_manager = Create_sleep_manager()
+    #quiet, then over the thresholds of velocity, angular velocity and force
+    L_g = [Create_grain_sleep(create_grain_fake, [0.6, 0.7], 0.09, [6, 7]),
+           Create_grain_sleep(create_grain_fake, [0.8, 0.7], 0, [0, 0]),
+           Create_grain_sleep(create_grain_fake, [0, 0], -0.11, [0, 0]),
+           Create_grain_sleep(create_grain_fake, [0, 0], 0, [8, 7])]
+    for i_step in range(2):
+        sleep_manager.update(L_g)
+    assert [grain.asleep for grain in L_g] == [False]*4
+    assert [grain.n_quiet for grain in L_g] == [2, 0, 0, 0]
+    sleep_manager.update(L_g)
+    assert [grain.asleep for grain in L_g] == [True, False, False, False]
+    #the velocities are set to zero, the force is saved
+    assert np.array_equal(L_g[0].v, [0, 0]) and L_g[0].w == 0
+    assert np.array_equal(L_g[0].F_asleep, [6, 7])
+    assert sleep_manager.n_fall_asleep == 1 and sleep_manager.n_asleep_L == [0, 0, 1]
+
+#-------------------------------------------------------------------------------
+
+def test_quiet_steps_are_consecutive(create_grain_fake):
+    sleep_manager = Create_sleep_manager()
+    grain = Create_grain_sleep(create_grain_fake, [0, 0], 0, [0, 0])
+    sleep_manager.update([grain])
+    sleep_manager.update([grain])
+    #a step over the threshold resets the counter
+    grain.v = np.array([2, 0])
+    sleep_manager.update([grain])
+    grain.v = np.array([0, 0])
+    sleep_manager.update([grain])
+    sleep_manager.update([grain])
+    assert not grain.asleep
+    sleep_manager.update([grain])
+    assert grain.asleep
+
+#-------------------------------------------------------------------------------
+
+def test_wake_threshold(create_grain_fake):
+    sleep_manager = Create_sleep_manager()
+    grain = Create_grain_sleep(create_grain_fake, [0, 0], 0, [3, 0])
+    for i_step in range(3):
+        sleep_manager.update([grain])
+    assert grain.asleep
+    #the change of force is measured from the force when the grain falls asleep
+    grain.fx = 3 + 4.9
+    sleep_manager.update([grain])
+    assert grain.asleep
+    grain.fx = 3
+    grain.fy = -5.1
+    sleep_manager.update([grain])
+    assert not grain.asleep and grain.n_quiet == 0
+    assert sleep_manager.n_wake_up == 1
+    #the grain falls asleep again after quiet steps
+    grain.fy = 0
+    for i_step in range(3):
+        sleep_manager.update([grain])
+    assert grain.asleep
+    sleep_manager.wake_up_all([grain])
+    assert not grain.asleep and grain.n_quiet == 0
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the tests of the uniform grid (see Uniform_grid.UniformGrid).
+The lookups are compared with a search over the nodes.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+
+#Own
+from Uniform_grid import UniformGrid
+
+#-------------------------------------------------------------------------------
+#Function
+#-------------------------------------------------------------------------------
+
+def test_nearest_node_as_search():
+    grid = UniformGrid(-12.3, 47.1, 151, 3.2, 88.9, 97)
+    rng = np.random.RandomState(0)
+    L_x = rng.uniform(grid.x_min - 5, grid.x_max + 5, 20000)
+    L_y = rng.uniform(grid.y_min - 5, grid.y_max + 5, 20000)
+    L_i_x_search = np.argmin(abs(grid.x_L[np.newaxis,:] - L_x[:,np.newaxis]), axis = 1)
+    L_i_y_search = np.argmin(abs(grid.y_L[np.newaxis,:] - L_y[:,np.newaxis]), axis = 1)
+    assert np.array_equal(grid.i_x_nearest(L_x), L_i_x_search)
+    assert np.array_equal(grid.i_y_nearest(L_y), L_i_y_search)
+    #a float gives an int
+    assert grid.i_x_nearest(float(L_x[0])) == L_i_x_search[0]
+    assert isinstance(grid.i_x_nearest(float(L_x[0])), int)
+
+#-------------------------------------------------------------------------------
+
+def test_nearest_node_on_midpoint():
+    #the midpoints are exact with this spacing, the lower node is taken as the first minimum of the search
+    grid = UniformGrid(0, 8, 9, -4, 4, 17)
+    L_x = grid.x_L[:-1] + grid.dx/2
+    L_y = grid.y_L[:-1] + grid.dy/2
+    assert np.array_equal(grid.i_x_nearest(L_x), np.argmin(abs(grid.x_L[np.newaxis,:] - L_x[:,np.newaxis]), axis = 1))
+    assert np.array_equal(grid.i_x_nearest(L_x), np.arange(grid.n_x - 1))
+    assert np.array_equal(grid.i_y_nearest(L_y), np.arange(grid.n_y - 1))
+    assert np.array_equal(grid.i_x_nearest_periodic(L_x - 8), np.arange(grid.n_x - 1) - 8)
+
+#-------------------------------------------------------------------------------
+
+def test_nearest_node_periodic():
+    grid = UniformGrid(-12.3, 47.1, 151, 3.2, 88.9, 97)
+    rng = np.random.RandomState(1)
+    L_x = rng.uniform(grid.x_min - 100, grid.x_max + 100, 5000)
+    L_i_x = grid.i_x_nearest_periodic(L_x)
+    #the unwrapped node is the nearest one on the periodic extension
+    L_x_node = grid.x_min + L_i_x*grid.dx
+    assert np.all(abs(L_x_node - L_x) <= grid.dx/2 + 1e-9)
+    #the column wraps on one period
+    L_c, L_x_c = grid.columns_periodic(int(L_i_x.min()), int(L_i_x.max()))
+    assert len(L_c) == grid.n_period
+    assert np.all(L_c < grid.n_period)
+
+#-------------------------------------------------------------------------------
+
+def test_columns_periodic():
+    grid = UniformGrid(0, 10, 11, 0, 5, 6)
+    L_c, L_x = grid.columns_periodic(-2, 2)
+    assert np.array_equal(L_c, [8, 9, 0, 1, 2])
+    assert np.allclose(L_x, [-2, -1, 0, 1, 2])
+    L_c, L_x = grid.columns_periodic(8, 12)
+    assert np.array_equal(L_c, [8, 9, 0, 1, 2])
+    assert np.allclose(L_x, [8, 9, 10, 11, 12])
+
+#-------------------------------------------------------------------------------
+
+def test_cell_as_search():
+    grid = UniformGrid(-12.3, 47.1, 151, 3.2, 88.9, 97)
+    rng = np.random.RandomState(2)
+    L_x = rng.uniform(grid.x_min, grid.x_max, 20000)
+    L_y = rng.uniform(grid.y_min, grid.y_max, 20000)
+    #x_L[i-1] <= x < x_L[i]
+    L_i_x_search = np.searchsorted(grid.x_L, L_x, side = 'right')
+    L_i_y_search = np.searchsorted(grid.y_L, L_y, side = 'right')
+    assert np.array_equal(grid.i_x_cell(L_x), np.clip(L_i_x_search, 1, grid.n_x - 1))
+    assert np.array_equal(grid.i_y_cell(L_y), np.clip(L_i_y_search, 1, grid.n_y - 1))
+    #the limits are in the first and the last cells
+    assert grid.i_x_cell(grid.x_min) == 1 and grid.i_x_cell(grid.x_max) == grid.n_x - 1
+
+#-------------------------------------------------------------------------------
+
+def test_wrap_box_and_row():
+    grid = UniformGrid(0, 10, 11, 0, 5, 6)
+    assert np.allclose(grid.wrap_x(np.array([-1, 3, 12])), [9, 3, 2])
+    assert grid.i_box(0.4, 9.6, 0.6, 4.4) == (0, 10, 1, 4)
+    assert grid.row(0) == grid.n_y - 1 and grid.row(grid.n_y - 1) == 0